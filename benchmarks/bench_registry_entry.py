@@ -0,0 +1,99 @@
+"""Compare the memory and speed of RegistryEntry with a plain dataclass.
+
+PlainEntry is RegistryEntry as it was before it used slots, interned tags
+and a cached search key. For each, the benchmark loads a synthetic NDJSON
+registry and records the memory the entries retain, the load time and the
+time of a matches() sweep.
+
+Usage: python benchmarks/bench_registry_entry.py [--entries N] [--repeat N]
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from add_skills.models import RegistryEntry
+
+TAGS = (
+    "python rust go typescript react docker kubernetes terraform review test"
+).split()
+KEYWORD = "docker"
+
+
+@dataclass
+class PlainEntry:
+    name: str
+    repo: str
+    description: str
+    tags: list[str] = field(default_factory=list)
+
+    def matches(self, keyword: str) -> bool:
+        keyword = keyword.casefold()
+        return (
+            keyword in self.name.casefold()
+            or keyword in self.description.casefold()
+            or any(keyword in tag.casefold() for tag in self.tags)
+        )
+
+
+def make_lines(count: int, rng: random.Random) -> list[str]:
+    """NDJSON registry lines."""
+    return [
+        json.dumps(
+            {
+                "name": f"skill-{i}",
+                "repo": f"owner-{i % 997}/repo-{i % 7919}",
+                "description": f"Skill number {i} for " + " ".join(rng.sample(TAGS, 4)),
+                "tags": rng.sample(TAGS, 3),
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Return the fastest of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = make_lines(args.entries, random.Random(0))
+    print(f"{args.entries} entries, best of {args.repeat} runs")
+    print(f"{'class':<14} {'memory':>12} {'load':>10} {'matches()':>10}")
+    for cls in (PlainEntry, RegistryEntry):
+
+        def build(cls: type = cls) -> list[Any]:
+            return [cls(**json.loads(line)) for line in lines]
+
+        tracemalloc.start()
+        entries = build()
+        memory = tracemalloc.get_traced_memory()[0] / len(entries)
+        tracemalloc.stop()
+
+        load = best_of(args.repeat, build)
+        sweep = best_of(
+            args.repeat, lambda e=entries: [x for x in e if x.matches(KEYWORD)]
+        )
+        print(
+            f"{cls.__name__:<14} {memory:>8.0f} B/e {load * 1000:>7.0f} ms "
+            f"{sweep * 1000:>7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
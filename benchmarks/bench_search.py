@@ -0,0 +1,87 @@
+"""Compare registry search strategies on a synthetic registry.
+
+Times, for each query, a plain substring scan (the unranked search find
+used to do), a one-shot ranked search of a list as find does it, building
+a RegistryIndex, and searches of a prebuilt index.
+
+Usage: python benchmarks/bench_search.py [--entries N] [--repeat N]
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from add_skills.models import RegistryEntry
+from add_skills.services import search_registry
+from add_skills.services.registry_index import RegistryIndex
+
+QUERIES = ("python", "py", "docker react", "zz-no-match")
+SYLLABLES = "ka ro te mi su na do re lo ve xi ba gu fe jo wa ne ki pu ha".split()
+WORDS = (
+    "python rust go typescript react docker kubernetes terraform review test "
+    "lint format deploy security database migration api graphql cli docs"
+).split()
+
+
+def make_entries(count: int, rng: random.Random) -> list[RegistryEntry]:
+    """Entries mixing common words with random made-up ones."""
+
+    def word() -> str:
+        if rng.random() < 0.2:
+            return rng.choice(WORDS)
+        return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+
+    return [
+        RegistryEntry(
+            name=f"{word()}-{word()}-{i}",
+            repo=f"owner-{i % 997}/repo-{i % 7919}",
+            description=" ".join(word() for _ in range(8)),
+            tags=[word() for _ in range(3)],
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Return the fastest of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries, random.Random(0))
+    build = best_of(args.repeat, lambda: RegistryIndex(entries))
+    index = RegistryIndex(entries)
+    print(f"{args.entries} entries, best of {args.repeat} runs")
+    print(f"building the index: {build:.0f} ms\n")
+    print(f"{'query':<14} {'hits':>6} {'scan':>9} {'one-shot':>9} {'indexed':>9}")
+
+    for query in QUERIES:
+        hits = len(index.search(query))
+        scan = best_of(
+            args.repeat, lambda q=query: [e for e in entries if e.matches(q)]
+        )
+        one_shot = best_of(
+            args.repeat, lambda q=query: search_registry(iter(entries), q, limit=20)
+        )
+        indexed = best_of(
+            args.repeat, lambda q=query: search_registry(index, q, limit=20)
+        )
+        print(
+            f"{query:<14} {hits:>6} {scan:>7.1f}ms {one_shot:>7.1f}ms {indexed:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
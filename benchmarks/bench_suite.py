@@ -0,0 +1,368 @@
+"""Benchmark discovery, parsing, installing and the registry on synthetic data.
+
+Generates local repositories of increasing size (deep trees, large assets
+and noise directories that discovery must prune) and a synthetic registry,
+then records the duration, throughput and peak Python memory of each
+stage. Results are written as JSON so two commits can be compared.
+
+Usage: python benchmarks/bench_suite.py [--sizes N,N,...] [--registry-entries N]
+           [--repeat N] [--output PATH] [--compare BASELINE] [--max-slowdown X]
+
+--compare exits with status 1 if a stage present in both runs got slower
+than --max-slowdown times the baseline.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SIZES = "10,1000,10000"
+DEFAULT_REGISTRY_ENTRIES = 100_000
+MAX_DEPTH = 6
+ASSET_EVERY = 100  # One skill in this many ships a large asset
+ASSET_BYTES = 4 * 1024 * 1024
+INSTALL_SAMPLE = 200  # Skills installed per repetition
+QUERIES = ("python", "test review", "docker deploy", "zz-no-match")
+RESULTS_VERSION = 1
+
+WORDS = (
+    "python rust go typescript react docker kubernetes terraform review test "
+    "lint format deploy security database migration api graphql cli docs "
+    "refactor debug profile cache queue stream auth logging metrics"
+).split()
+
+
+def make_repo(root: Path, skills: int, rng: random.Random) -> Path:
+    """Create a repository of skills nested up to MAX_DEPTH levels deep."""
+    repo = root / f"repo-{skills}"
+    asset = os.urandom(ASSET_BYTES)
+    for i in range(skills):
+        levels = [f"level-{d}" for d in range(i % MAX_DEPTH)]
+        skill_dir = repo.joinpath(f"area-{i % 16}", *levels, f"skill-{i}")
+        (skill_dir / "references").mkdir(parents=True)
+        tags = ", ".join(rng.sample(WORDS, 3))
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: skill-{i}\n"
+            f"description: {' '.join(rng.sample(WORDS, 8))}\n"
+            f"globs: [{tags}]\n---\n\n# Skill {i}\n\n" + "Instructions.\n" * 40
+        )
+        for ref in range(3):
+            (skill_dir / "references" / f"ref-{ref}.md").write_text("Notes.\n" * 100)
+        if i % ASSET_EVERY == 0:
+            (skill_dir / "assets").mkdir()
+            (skill_dir / "assets" / "model.bin").write_bytes(asset)
+    make_noise(repo, max(10, skills // 10))
+    return repo
+
+
+def make_noise(repo: Path, dirs: int) -> None:
+    """Add directories discovery must skip, each with a decoy SKILL.md."""
+    (repo / ".gitignore").write_text("build/\n")
+    for parent in ("node_modules", ".git/objects", "build", "__pycache__"):
+        for d in range(dirs):
+            noise = repo / parent / f"pkg-{d}"
+            noise.mkdir(parents=True)
+            (noise / "SKILL.md").write_text("---\nname: decoy\n---\n")
+            for f in range(10):
+                (noise / f"file-{f}.js").write_text("module.exports = {};\n")
+
+
+def make_registry(root: Path, entries: int, rng: random.Random) -> dict[str, Path]:
+    """Write the same registry as a JSON array and as NDJSON."""
+    records = (
+        {
+            "name": f"skill-{i}",
+            "repo": f"owner-{i % 997}/repo-{i % 7919}",
+            "description": " ".join(rng.sample(WORDS, 10)),
+            "tags": rng.sample(WORDS, 4),
+        }
+        for i in range(entries)
+    )
+    array_path = root / "registry.json"
+    ndjson_path = root / "registry.ndjson"
+    with open(array_path, "w") as array, open(ndjson_path, "w") as ndjson:
+        array.write("[")
+        for i, record in enumerate(records):
+            line = json.dumps(record)
+            array.write(("," if i else "") + line)
+            ndjson.write(line + "\n")
+        array.write("]")
+    return {"json": array_path, "ndjson": ndjson_path}
+
+
+def measure(
+    stage: str,
+    size: int,
+    items: int,
+    func: Callable[[], Any],
+    repeat: int,
+    memory: bool,
+) -> dict[str, Any]:
+    """Time the best of ``repeat`` runs, then trace one run's peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    result = {
+        "stage": stage,
+        "size": size,
+        "items": items,
+        "seconds": best,
+        "items_per_second": items / best if best else None,
+        "peak_bytes": peak,
+    }
+    print(
+        f"{stage:>24} {size:>7}: {best * 1000:10.1f} ms "
+        f"{result['items_per_second'] or 0:12.0f}/s"
+        + (f" {peak / 1024**2:8.1f} MiB peak" if peak is not None else ""),
+        file=sys.stderr,
+    )
+    return result
+
+
+def bench_repo(
+    root: Path, size: int, repeat: int, memory: bool, rng: random.Random
+) -> list[dict[str, Any]]:
+    from add_skills.core import get_agent
+    from add_skills.models import InstallScope
+    from add_skills.repositories import discover_skills, parse_skill
+    from add_skills.services import install_skill
+
+    repo = make_repo(root, size, rng)
+    skills = discover_skills(repo)
+    if len(skills) != size:
+        raise RuntimeError(f"Discovered {len(skills)} of {size} skills in {repo}")
+
+    results = [
+        measure(
+            "discover_skills",
+            size,
+            size,
+            lambda: discover_skills(repo),
+            repeat,
+            memory,
+        ),
+        measure(
+            "discover_skills_serial",
+            size,
+            size,
+            lambda: discover_skills(repo, workers=1),
+            repeat,
+            memory,
+        ),
+    ]
+
+    discover_skills(repo, use_index=True)  # Warm the discovery index
+    results.append(
+        measure(
+            "discover_skills_indexed",
+            size,
+            size,
+            lambda: discover_skills(repo, use_index=True),
+            repeat,
+            memory,
+        )
+    )
+
+    skill_dirs = [skill.path for skill in skills]
+    results.append(
+        measure(
+            "parse_skill",
+            size,
+            size,
+            lambda: [parse_skill(skill_dir) for skill_dir in skill_dirs],
+            repeat,
+            memory,
+        )
+    )
+
+    # Skills sort by name, so the sample includes some with a large asset
+    sample = skills[:INSTALL_SAMPLE]
+    agent = get_agent("claude-code")
+    projects = itertools.count()
+
+    def install() -> None:
+        project = root / f"project-{size}-{next(projects)}"
+        for skill in sample:
+            install_skill(skill, agent, InstallScope.LOCAL, project_dir=project)
+
+    results.append(
+        measure("install_skill", size, len(sample), install, repeat, memory)
+    )
+    return results
+
+
+def bench_registry(
+    root: Path, entries: int, repeat: int, memory: bool, rng: random.Random
+) -> list[dict[str, Any]]:
+    from add_skills.repositories import fetch_registry, iter_registry
+    from add_skills.services import search_registry
+    from add_skills.services.registry_index import RegistryIndex
+
+    results = []
+    for fmt, path in make_registry(root, entries, rng).items():
+        url = path.as_uri()
+        results.append(
+            measure(
+                f"fetch_registry_{fmt}",
+                entries,
+                entries,
+                lambda url=url: fetch_registry(url, use_cache=False),
+                repeat,
+                memory,
+            )
+        )
+
+    url = (root / "registry.json").as_uri()
+    registry = fetch_registry(url, use_cache=False)
+    results.append(
+        measure(
+            "search_registry_streamed",
+            entries,
+            len(QUERIES),
+            lambda: [
+                search_registry(iter_registry(url, use_cache=False), query, limit=20)
+                for query in QUERIES
+            ],
+            repeat,
+            memory,
+        )
+    )
+    results.append(
+        measure(
+            "registry_index_build",
+            entries,
+            entries,
+            lambda: RegistryIndex(registry),
+            repeat,
+            memory,
+        )
+    )
+    index = RegistryIndex(registry)
+    results.append(
+        measure(
+            "search_registry_indexed",
+            entries,
+            len(QUERIES),
+            lambda: [search_registry(index, query, limit=20) for query in QUERIES],
+            repeat,
+            memory,
+        )
+    )
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(
+    results: list[dict[str, Any]], baseline_path: Path, max_slowdown: float
+) -> bool:
+    """Print each stage's time relative to a baseline; False on a regression."""
+    with open(baseline_path) as f:
+        baseline = {(r["stage"], r["size"]): r for r in json.load(f)["results"]}
+
+    ok = True
+    for result in results:
+        base = baseline.get((result["stage"], result["size"]))
+        if base is None:
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        regressed = ratio > max_slowdown
+        ok = ok and not regressed
+        print(
+            f"{result['stage']:>24} {result['size']:>7}: {ratio:6.2f}x"
+            + ("  REGRESSION" if regressed else ""),
+            file=sys.stderr,
+        )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Skills per repository")
+    parser.add_argument(
+        "--registry-entries", type=int, default=DEFAULT_REGISTRY_ENTRIES
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory")
+    parser.add_argument("--dir", default=None, help="Parent of the scratch directory")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline results to compare with")
+    parser.add_argument("--max-slowdown", type=float, default=1.25)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    rng = random.Random(0)
+    memory = not args.no_memory
+
+    with tempfile.TemporaryDirectory(prefix="add-skills-bench-", dir=args.dir) as tmp:
+        root = Path(tmp)
+        # Keep the discovery index and store out of the user's directories
+        os.environ["ADD_SKILLS_CACHE_DIR"] = str(root / "cache")
+        os.environ["ADD_SKILLS_DATA_DIR"] = str(root / "data")
+
+        results = []
+        for size in sizes:
+            results += bench_repo(root, size, args.repeat, memory, rng)
+        if args.registry_entries:
+            results += bench_registry(
+                root, args.registry_entries, args.repeat, memory, rng
+            )
+
+    report = {
+        "version": RESULTS_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare and not compare(results, args.compare, args.max_slowdown):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Check the CLI's cold-start import time against a budget.
+
+Imports add_skills.cli in fresh interpreters and fails (exit status 1) if
+the median import time exceeds the budget, or if modules that only some
+commands need are loaded at startup.
+
+Usage: python benchmarks/import_time.py [--budget-ms MS] [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Importing typer and rich alone takes about 100 ms on a developer laptop, so
+# this leaves room for slower CI machines; LAZY_MODULES catches regressions
+# that a timing budget would miss
+DEFAULT_BUDGET_MS = 400.0
+BUDGET_ENV = "ADD_SKILLS_IMPORT_BUDGET_MS"
+
+# Must not be imported just to start the CLI or print --help
+LAZY_MODULES = (
+    "git",
+    "frontmatter",
+    "yaml",
+    "http.client",
+    "urllib.request",
+    "tarfile",
+    "add_skills.daemon",
+    "add_skills.repositories.archive",
+    "add_skills.repositories.filesystem",
+    "add_skills.repositories.git",
+    "add_skills.repositories.manifest",
+    "add_skills.repositories.refs",
+    "add_skills.repositories.registry",
+    "add_skills.repositories.skill_index",
+    "add_skills.services.batch",
+    "add_skills.services.installer",
+)
+
+
+def import_time_ms() -> float:
+    """Return the cumulative import time of add_skills.cli in a new process."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import add_skills.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == "add_skills.cli":
+            return int(parts[1]) / 1000
+    raise RuntimeError("add_skills.cli missing from -X importtime output")
+
+
+def eagerly_loaded() -> list[str]:
+    """Return the LAZY_MODULES that importing add_skills.cli loads."""
+    code = (
+        "import sys, add_skills.cli; "
+        f"print('\\n'.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MS)),
+    )
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    import_time_ms()  # Warm the filesystem cache and bytecode
+    median = statistics.median(import_time_ms() for _ in range(args.runs))
+    loaded = eagerly_loaded()
+
+    print(f"import add_skills.cli: {median:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    failed = False
+    if median > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if loaded:
+        print(f"FAIL: loaded at startup: {', '.join(loaded)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
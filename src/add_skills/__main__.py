@@ -1,10 +1,22 @@
 """Entry point for add-skills CLI."""
 
-from add_skills.cli import run
+import sys
+
+from add_skills.daemon import forward
 
 
 def main() -> None:
-    """Main entry point."""
+    """Main entry point.
+
+    Invocations run in the daemon when one is running, and locally
+    otherwise.
+    """
+    status = forward(sys.argv[1:])
+    if status is not None:
+        sys.exit(status)
+
+    from add_skills.cli import run
+
     run()
 
 
@@ -1,11 +1,30 @@
 """CLI application for add-skills."""
 
 import sys
+from enum import Enum
+from pathlib import Path
 
 import typer
 from rich.console import Console
 
-from add_skills.commands import add_skills, find
+from add_skills.defaults import (
+    DEFAULT_IDLE_TIMEOUT_SECONDS,
+    DEFAULT_PER_HOST,
+    DEFAULT_REF_TTL_SECONDS,
+    DEFAULT_TTL_SECONDS,
+    MANIFEST_NAME,
+)
+from add_skills.models import InstallMode, InstallScope
+
+# Command implementations are imported inside each callback, so a command
+# only loads the dependencies it uses
+
+
+class Fetcher(str, Enum):
+    """Fetch backends selectable with --fetcher."""
+
+    GIT = "git"
+    ARCHIVE = "archive"
 
 
 def _create_console() -> Console:
@@ -17,14 +36,205 @@ def _create_console() -> Console:
 find_app = typer.Typer(add_completion=False)
 
 
-@find_app.callback(invoke_without_command=True)
+@find_app.command()
 def find_callback(
     ctx: typer.Context,
     keyword: str | None = typer.Argument(None),
+    offline: bool = typer.Option(False, "--offline", help="Use the cached registry only"),
+    max_age: float = typer.Option(
+        DEFAULT_TTL_SECONDS,
+        "--max-age",
+        min=0,
+        help="Seconds the cached registry stays fresh (0 always revalidates)",
+    ),
+    stale: bool = typer.Option(
+        False, "--stale", help="Serve an expired cached registry and refresh it afterwards"
+    ),
+    limit: int | None = typer.Option(
+        None, "--limit", "-n", min=1, help="Show at most this many results"
+    ),
 ) -> None:
     """Search for Skills in the curated registry."""
+    from add_skills.commands import find
+
+    ctx.obj = _create_console()
+    find(ctx, keyword, offline, max_age, stale, limit)
+
+
+# Separate app for the "daemon" subcommands
+daemon_app = typer.Typer(
+    add_completion=False,
+    help="Run invocations in a background process that keeps caches warm.",
+)
+
+
+@daemon_app.command("start")
+def daemon_start_callback(
+    ctx: typer.Context,
+    foreground: bool = typer.Option(
+        False, "--foreground", help="Serve in this process instead of the background"
+    ),
+    idle_timeout: float = typer.Option(
+        DEFAULT_IDLE_TIMEOUT_SECONDS,
+        "--idle-timeout",
+        min=0,
+        help="Exit after this many seconds without requests (0 never exits)",
+    ),
+) -> None:
+    """Start the daemon."""
+    from add_skills.commands import daemon_start
+
+    ctx.obj = _create_console()
+    daemon_start(ctx, foreground, idle_timeout)
+
+
+@daemon_app.command("stop")
+def daemon_stop_callback(ctx: typer.Context) -> None:
+    """Stop the daemon."""
+    from add_skills.commands import daemon_stop
+
+    ctx.obj = _create_console()
+    daemon_stop(ctx)
+
+
+@daemon_app.command("status")
+def daemon_status_callback(ctx: typer.Context) -> None:
+    """Show whether the daemon is running."""
+    from add_skills.commands import daemon_status
+
     ctx.obj = _create_console()
-    find(ctx, keyword)
+    daemon_status(ctx)
+
+
+# Separate app for the "gc" subcommand
+gc_app = typer.Typer(add_completion=False)
+
+
+@gc_app.command()
+def gc_callback(ctx: typer.Context) -> None:
+    """Remove store entries that no installed Skill links to."""
+    from add_skills.commands import gc
+
+    ctx.obj = _create_console()
+    gc(ctx)
+
+
+# Separate app for the "installed" subcommand
+installed_app = typer.Typer(add_completion=False)
+
+
+@installed_app.command()
+def installed_callback(
+    ctx: typer.Context,
+    agent: list[str] = typer.Option(
+        [], "--agent", "-a", help="Only these agents (repeat or comma-separate)"
+    ),
+    scope: InstallScope | None = typer.Option(
+        None, "--scope", help="Only project (local) or global installs"
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Print JSON"),
+) -> None:
+    """List the Skills installed for every agent."""
+    from add_skills.commands import installed
+
+    ctx.obj = _create_console()
+    installed(ctx, agent, scope, json_output)
+
+
+# Separate app for the "sync" subcommand
+sync_app = typer.Typer(add_completion=False)
+
+
+@sync_app.command()
+def sync_callback(
+    ctx: typer.Context,
+    global_install: bool = typer.Option(
+        False, "--global", "-g", help="Sync global installs"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Fetch directly instead of using the repository cache"
+    ),
+    fetch_timeout: float | None = typer.Option(
+        None, "--fetch-timeout", min=0, help="Seconds each git operation may take"
+    ),
+    git_config: list[str] = typer.Option(
+        [],
+        "--git-config",
+        help="KEY=VALUE passed to git as -c KEY=VALUE (repeatable)",
+    ),
+    timings: bool = typer.Option(
+        False, "--timings", help="Print how long each phase took"
+    ),
+    trace: Path | None = typer.Option(
+        None, "--trace", help="Write a Chrome trace-event JSON file of the run"
+    ),
+) -> None:
+    """Install exactly the Skills recorded in the lockfile."""
+    from add_skills.cli_utils import record_timings
+    from add_skills.commands import sync
+
+    ctx.obj = _create_console()
+    with record_timings(ctx.obj, "sync", timings, trace):
+        sync(ctx, global_install, not no_cache, fetch_timeout, git_config)
+
+
+# Separate app for the "install" subcommand
+install_app = typer.Typer(add_completion=False)
+
+
+@install_app.command()
+def install_callback(
+    ctx: typer.Context,
+    manifest: Path = typer.Argument(
+        Path(MANIFEST_NAME), help="Manifest listing sources, Skills and agents"
+    ),
+    global_install: bool = typer.Option(False, "--global", "-g", help="Install globally"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Clone directly instead of using the repository cache"
+    ),
+    jobs: int | None = typer.Option(
+        None, "--jobs", "-j", min=1, help="Repositories fetched at once"
+    ),
+    per_host: int = typer.Option(
+        DEFAULT_PER_HOST, "--per-host", min=1, help="Repositories fetched at once per host"
+    ),
+    install_mode: InstallMode = typer.Option(
+        InstallMode.COPY,
+        "--install-mode",
+        help="Copy Skills, or link them from the shared content-addressed store",
+    ),
+    fetch_timeout: float | None = typer.Option(
+        None, "--fetch-timeout", min=0, help="Seconds each git operation may take"
+    ),
+    git_config: list[str] = typer.Option(
+        [],
+        "--git-config",
+        help="KEY=VALUE passed to git as -c KEY=VALUE (repeatable)",
+    ),
+    timings: bool = typer.Option(
+        False, "--timings", help="Print how long each phase took"
+    ),
+    trace: Path | None = typer.Option(
+        None, "--trace", help="Write a Chrome trace-event JSON file of the run"
+    ),
+) -> None:
+    """Install every Skill listed in a manifest file."""
+    from add_skills.cli_utils import record_timings
+    from add_skills.commands import install_manifest
+
+    ctx.obj = _create_console()
+    with record_timings(ctx.obj, "install", timings, trace):
+        install_manifest(
+            ctx,
+            manifest,
+            global_install,
+            not no_cache,
+            jobs,
+            per_host,
+            install_mode,
+            fetch_timeout,
+            git_config,
+        )
 
 
 # Main app for adding skills
@@ -36,24 +246,123 @@ main_app = typer.Typer(add_completion=False)
     "Examples:\n"
     "  add-skills vercel-labs/skills\n"
     "  add-skills ./my-skills --list\n"
-    "  add-skills owner/repo -g -a cursor",
+    "  add-skills owner/repo -g -a cursor\n"
+    "  add-skills owner/repo -a claude-code,cursor\n"
+    "  add-skills owner/repo -a auto",
 )
 def add_command(
     ctx: typer.Context,
     source: str = typer.Argument(..., help="Source (local path, owner/repo, or URL)"),
     global_install: bool = typer.Option(False, "--global", "-g", help="Install globally"),
-    agent: str = typer.Option("claude-code", "--agent", "-a", help="Target agent"),
+    agent: list[str] = typer.Option(
+        ["claude-code"],
+        "--agent",
+        "-a",
+        help="Target agent; repeat or comma-separate for several, 'auto' to detect",
+    ),
     skill_name: str | None = typer.Option(None, "--skill", "-s", help="Install specific skill"),
     list_only: bool = typer.Option(False, "--list", "-l", help="List without installing"),
     yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Clone directly instead of using the repository cache"
+    ),
+    sparse: bool = typer.Option(
+        False,
+        "--sparse",
+        help="Download only the subpath or --skill directory (partial clone)",
+    ),
+    fetcher: Fetcher = typer.Option(
+        Fetcher.GIT,
+        "--fetcher",
+        help="How to fetch remote sources (archive falls back to git on failure)",
+    ),
+    sha256: str | None = typer.Option(
+        None,
+        "--sha256",
+        help="SHA-256 the downloaded archive must match (implies --fetcher archive)",
+    ),
+    max_depth: int | None = typer.Option(
+        None, "--max-depth", min=0, help="Deepest directory level searched for Skills"
+    ),
+    jobs: int | None = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Worker threads for parsing and installing (1 runs serially)",
+    ),
+    install_mode: InstallMode = typer.Option(
+        InstallMode.COPY,
+        "--install-mode",
+        help="Copy Skills, or link them from the shared content-addressed store",
+    ),
+    sync: bool = typer.Option(
+        False,
+        "--sync",
+        help="Update installed Skills in place, writing only changed files",
+    ),
+    ref_ttl: float = typer.Option(
+        DEFAULT_REF_TTL_SECONDS,
+        "--ref-max-age",
+        min=0,
+        help="Seconds a branch's resolved commit is reused (0 always asks the remote)",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="Keep copying changes of a local source into the installed Skills",
+    ),
+    fetch_timeout: float | None = typer.Option(
+        None, "--fetch-timeout", min=0, help="Seconds each git operation may take"
+    ),
+    git_config: list[str] = typer.Option(
+        [],
+        "--git-config",
+        help="KEY=VALUE passed to git as -c KEY=VALUE (repeatable)",
+    ),
+    timings: bool = typer.Option(
+        False, "--timings", help="Print how long each phase took"
+    ),
+    trace: Path | None = typer.Option(
+        None, "--trace", help="Write a Chrome trace-event JSON file of the run"
+    ),
 ) -> None:
+    from add_skills.cli_utils import record_timings
+    from add_skills.commands import add_skills
+
     ctx.obj = _create_console()
-    add_skills(ctx, source, global_install, agent, skill_name, list_only, yes)
+    with record_timings(ctx.obj, "add", timings, trace):
+        add_skills(
+            ctx,
+            source,
+            global_install,
+            agent,
+            skill_name,
+            list_only,
+            yes,
+            not no_cache,
+            sparse,
+            fetcher.value,
+            max_depth,
+            jobs,
+            install_mode,
+            sync,
+            fetch_timeout,
+            git_config,
+            ref_ttl,
+            watch,
+            sha256,
+        )
 
 
 # Subcommand registry - add new commands here
 SUBCOMMANDS: dict[str, typer.Typer] = {
+    "daemon": daemon_app,
     "find": find_app,
+    "gc": gc_app,
+    "install": install_app,
+    "installed": installed_app,
+    "sync": sync_app,
 }
 
 
@@ -1,12 +1,110 @@
 """CLI utility functions."""
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
 from typing import NoReturn
 
 import typer
 from rich.console import Console
+from rich.table import Table
+
+from add_skills import timings
+from add_skills.models import SyncResult
 
 
 def exit_with_error(console: Console, message: str) -> NoReturn:
     """Print error message and exit with code 1."""
     console.print(f"[red]Error:[/red] {message}")
     raise typer.Exit(code=1)
+
+
+def format_size(num_bytes: int) -> str:
+    """Format a byte count for display."""
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    size = num_bytes / 1024
+    for unit in ("KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_install_result(
+    console: Console, name: str, install_path: Path, changes: SyncResult | None
+) -> None:
+    """Print one install or update, listing changed files when updating."""
+    if changes is None:
+        console.print(f"[green]Installed:[/green] {name} -> {install_path}")
+    elif changes.up_to_date:
+        console.print(f"[dim]Up to date:[/dim] {name} -> {install_path}")
+    else:
+        console.print(
+            f"[green]Updated:[/green] {name} -> {install_path} "
+            f"({len(changes.added)} added, {len(changes.changed)} changed, "
+            f"{len(changes.removed)} removed)"
+        )
+        for prefix, paths in (
+            ("+", changes.added),
+            ("~", changes.changed),
+            ("-", changes.removed),
+        ):
+            for path in paths:
+                console.print(f"    {prefix} {path}", style="dim", highlight=False)
+
+
+@contextmanager
+def record_timings(
+    console: Console, command: str, show: bool, trace_path: Path | None
+) -> Iterator[None]:
+    """Record timing spans while running a command.
+
+    Afterwards, even if the command failed, a summary is printed if
+    ``show`` is set and a Chrome trace is written to ``trace_path``.
+    """
+    if not show and trace_path is None:
+        yield
+        return
+
+    recorder = timings.enable()
+    try:
+        with timings.span(command, "command"):
+            yield
+    finally:
+        timings.disable()
+        if show:
+            print_timings(console, recorder.summary())
+        if trace_path is not None:
+            try:
+                recorder.write_trace(trace_path)
+            except OSError as e:
+                console.print(f"[yellow]Trace not written: {e}[/yellow]")
+            else:
+                console.print(f"Trace written to {trace_path}")
+
+
+def print_timings(console: Console, stats: list[timings.SpanStats]) -> None:
+    """Print a table of aggregated timing spans."""
+    table = Table(title="Timings")
+    table.add_column("Phase", style="cyan")
+    table.add_column("Count", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Details", style="dim")
+
+    for entry in stats:
+        details = ", ".join(
+            format_size(value) if key == "bytes" else f"{value} {key}"
+            for key, value in entry.counters.items()
+        )
+        table.add_row(
+            entry.name,
+            str(entry.count),
+            f"{entry.total * 1000:.1f} ms",
+            f"{entry.longest * 1000:.1f} ms",
+            details or "-",
+        )
+
+    console.print()
+    console.print(table)
@@ -1,6 +1,49 @@
-"""CLI commands for add-skills."""
+"""CLI commands for add-skills.
 
-from add_skills.commands.add import add_skills
-from add_skills.commands.find import find
+Exports are imported on first use, so that running one command does not
+load the dependencies of the others.
+"""
 
-__all__ = ["add_skills", "find"]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from add_skills.commands.add import add_skills
+    from add_skills.commands.daemon import daemon_start, daemon_status, daemon_stop
+    from add_skills.commands.find import find
+    from add_skills.commands.gc import gc
+    from add_skills.commands.install import install_manifest
+    from add_skills.commands.installed import installed
+    from add_skills.commands.sync import sync
+
+_EXPORTS = {
+    "add_skills": "add",
+    "daemon_start": "daemon",
+    "daemon_status": "daemon",
+    "daemon_stop": "daemon",
+    "find": "find",
+    "gc": "gc",
+    "install_manifest": "install",
+    "installed": "installed",
+    "sync": "sync",
+}
+
+__all__ = [
+    "add_skills",
+    "daemon_start",
+    "daemon_status",
+    "daemon_stop",
+    "find",
+    "gc",
+    "install_manifest",
+    "installed",
+    "sync",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
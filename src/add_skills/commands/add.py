@@ -1,49 +1,162 @@
 """Add command implementation."""
 
+import re
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
 
 import typer
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
-from add_skills.cli_utils import exit_with_error
-from add_skills.core import get_agent
+from add_skills.cli_utils import (
+    exit_with_error,
+    format_size,
+    print_install_result,
+)
+from add_skills.core import resolve_agents
 from add_skills.core.source_parser import parse_source
-from add_skills.exceptions import InstallError, SourceParseError
-from add_skills.models import InstallScope, SourceType
-from add_skills.repositories import clone_repo, discover_skills
-from add_skills.services import install_skill
+from add_skills.exceptions import (
+    ArchiveError,
+    GitError,
+    InstallError,
+    LockfileError,
+    SourceParseError,
+)
+from add_skills.models import (
+    AgentConfig,
+    InstallMode,
+    InstallScope,
+    LockEntry,
+    Skill,
+    SkillSource,
+    SourceType,
+    SyncResult,
+    TransportOptions,
+)
+from add_skills.repositories import (
+    discover_skills,
+    get_lockfile_path,
+    load_lockfile,
+    lock_key,
+    lock_source,
+    update_lockfile,
+)
+from add_skills.repositories.cache import directory_stats
+from add_skills.repositories.filesystem import DEFAULT_WORKERS, SKILL_FILENAME
+from add_skills.repositories.refs import DEFAULT_REF_TTL_SECONDS
+from add_skills.repositories.skill_index import load_commit_index, save_commit_index
+from add_skills.services import (
+    get_install_path,
+    hash_tree,
+    install_skill,
+    matches_lock,
+    sync_skill,
+    sync_skill_paths,
+)
+from add_skills.timings import is_enabled, span
 
 
 def add_skills(
     ctx: typer.Context,
     source: str,
     global_install: bool = False,
-    agent: str = "claude-code",
+    agent: str | list[str] = "claude-code",
     skill_name: str | None = None,
     list_only: bool = False,
     yes: bool = False,
+    use_cache: bool = True,
+    sparse: bool = False,
+    fetcher: str = "git",
+    max_depth: int | None = None,
+    jobs: int | None = None,
+    install_mode: InstallMode = InstallMode.COPY,
+    sync: bool = False,
+    fetch_timeout: float | None = None,
+    git_config: list[str] | None = None,
+    ref_ttl: float = DEFAULT_REF_TTL_SECONDS,
+    watch: bool = False,
+    archive_sha256: str | None = None,
 ) -> None:
-    """Install Skills from a source."""
+    """Install Skills from a source.
+
+    The source is fetched and discovered once and installed for every
+    requested agent. Sources fetched through the repository cache are
+    first resolved to a commit with ``git ls-remote``: Skills already
+    discovered at that commit are listed without a checkout, and with
+    ``sync`` Skills installed from it are not fetched again.
+
+    With ``watch``, a local source is installed as with ``sync`` and then
+    watched: changed files are copied into the installed Skills until the
+    command is interrupted.
+
+    With ``archive_sha256``, a remote source is downloaded as an archive
+    that must have that SHA-256 digest. It is not cloned instead if the
+    download fails, since the clone would not be checked.
+    """
     console: Console = ctx.obj
+    scope = InstallScope.GLOBAL if global_install else InstallScope.LOCAL
 
-    # Validate agent
+    # Validate agents
     try:
-        agent_config = get_agent(agent)
+        agent_configs = resolve_agents(
+            [agent] if isinstance(agent, str) else agent, scope
+        )
     except KeyError as e:
-        exit_with_error(console, str(e))
+        exit_with_error(console, str(e.args[0]))
+    if not agent_configs:
+        exit_with_error(console, "No agent given")
 
     # Parse source
     try:
-        skill_source = parse_source(source)
+        with span("parse_source"):
+            skill_source = parse_source(source)
     except SourceParseError as e:
         exit_with_error(console, str(e))
+    if watch:
+        if skill_source.source_type != SourceType.LOCAL:
+            exit_with_error(console, "--watch only works with local sources")
+        sync = True
+    if archive_sha256 is not None:
+        if skill_source.source_type == SourceType.LOCAL:
+            exit_with_error(console, "--sha256 only works with remote sources")
+        if not re.fullmatch(r"[0-9a-fA-F]{64}", archive_sha256):
+            exit_with_error(console, "--sha256 must be 64 hexadecimal digits")
+        fetcher = "archive"
 
     # Get skill directory
-    skill_dir: Path
+    skill_dir: Path | None = None
     temp_dir: Path | None = None
+    transport = TransportOptions(timeout=fetch_timeout, config=git_config or [])
+    skills: list[Skill] | None = None
+
+    # Remote sources fetched through the repository cache are resolved to
+    # a commit first; its skills may already be indexed, and then nothing
+    # is fetched until something needs installing
+    by_commit = (
+        skill_source.source_type != SourceType.LOCAL
+        and use_cache
+        and fetcher == "git"
+        and not sparse
+    )
+
+    def fetch() -> Path:
+        nonlocal temp_dir
+        temp_dir = Path(tempfile.mkdtemp(prefix="add-skills-"))
+        return _fetch_remote(
+            console,
+            skill_source,
+            temp_dir,
+            fetcher=fetcher,
+            use_cache=use_cache,
+            sparse=sparse,
+            skill_name=skill_name,
+            transport=transport,
+            archive_sha256=archive_sha256,
+        )
 
     try:
         if skill_source.source_type == SourceType.LOCAL:
@@ -51,16 +164,42 @@ def add_skills(
                 exit_with_error(console, "Local source path is None")
             skill_dir = skill_source.path
         else:
-            # Clone remote repository
-            console.print(f"Cloning [cyan]{source}[/cyan]...")
-            temp_dir = Path(tempfile.mkdtemp(prefix="add-skills-"))
-            try:
-                skill_dir = clone_repo(skill_source, temp_dir)
-            except Exception as e:
-                exit_with_error(console, f"cloning repository: {e}")
+            if by_commit:
+                skill_source.commit = _resolve_commit(skill_source, ref_ttl, transport)
+            if by_commit and skill_source.commit:
+                assert skill_source.clone_url is not None
+                skills = load_commit_index(
+                    skill_source.clone_url,
+                    skill_source.commit,
+                    skill_source.subpath,
+                    max_depth,
+                )
+            if skills is None:
+                skill_dir = fetch()
 
         # Discover skills
-        skills = discover_skills(skill_dir)
+        if skills is None:
+            assert skill_dir is not None
+            with span("discover_skills") as discover_args:
+                skills = discover_skills(
+                    skill_dir,
+                    max_depth=max_depth,
+                    use_git_index=skill_source.source_type != SourceType.LOCAL,
+                    workers=jobs,
+                    use_index=use_cache
+                    and skill_source.source_type == SourceType.LOCAL,
+                )
+                discover_args["skills"] = len(skills)
+            if by_commit and skill_source.commit:
+                assert skill_source.clone_url is not None
+                save_commit_index(
+                    skill_source.clone_url,
+                    skill_source.commit,
+                    skill_source.subpath,
+                    max_depth,
+                    skill_dir,
+                    skills,
+                )
 
         if not skills:
             console.print(f"[yellow]No skills found in {source}[/yellow]")
@@ -74,48 +213,399 @@ def add_skills(
                 raise typer.Exit(code=1)
 
         # Display skills
-        _display_skills(console, skills)
+        with span("render"):
+            _display_skills(console, skills)
 
         if list_only:
             raise typer.Exit(code=0)
 
         # Confirm installation
-        scope = InstallScope.GLOBAL if global_install else InstallScope.LOCAL
         scope_label = "globally" if global_install else "locally"
+        agent_names = ", ".join(a.display_name for a in agent_configs)
 
         if not yes:
             console.print()
             confirm = typer.confirm(
-                f"Install {len(skills)} skill(s) {scope_label} for {agent_config.display_name}?"
+                f"Install {len(skills)} skill(s) {scope_label} for {agent_names}?"
             )
             if not confirm:
                 console.print("[yellow]Installation cancelled.[/yellow]")
                 raise typer.Exit(code=0)
 
-        # Install skills
         console.print()
+        targets = [(a, s) for a in agent_configs for s in skills]
+        total = len(targets)
         installed_count = 0
-        for skill in skills:
+
+        # With --sync, Skills locked at the resolved commit whose files
+        # still match the lockfile need neither a fetch nor an update
+        if sync and skill_source.commit:
+            current = _locked_current(targets, skill_source, scope, install_mode)
+            for agent_config, skill in current:
+                install_path = get_install_path(skill, agent_config, scope)
+                print_install_result(console, skill.name, install_path, SyncResult())
+            installed_count += len(current)
+            targets = [t for t in targets if t not in current]
+
+        if targets and skill_dir is None:
+            # The skills came from the commit index, relative to the source
+            skill_dir = fetch()
+            targets = [
+                (a, replace(s, path=skill_dir / s.path)) for a, s in targets
+            ]
+
+        # Install skills concurrently; results are reported in order
+        lock_entries: list[LockEntry] = []
+        root = skill_dir.resolve() if skill_dir else Path()
+        commit = None
+        if temp_dir:
+            from add_skills.repositories import get_head_commit
+
+            commit = get_head_commit(temp_dir)
+
+        def install(
+            skill: Skill, agent_config: AgentConfig
+        ) -> tuple[Path, SyncResult | None, str]:
+            with span(
+                "install_skill", skill=skill.name, agent=agent_config.name
+            ) as install_args:
+                if sync:
+                    path, changes = sync_skill(
+                        skill, agent_config, scope, mode=install_mode
+                    )
+                else:
+                    path = install_skill(
+                        skill, agent_config, scope, mode=install_mode
+                    )
+                    changes = None
+                if is_enabled():
+                    install_args["files"], install_args["bytes"] = directory_stats(
+                        skill.path
+                    )
             try:
-                install_path = install_skill(skill, agent_config, scope)
-                console.print(
-                    f"[green]Installed:[/green] {skill.name} -> {install_path}"
-                )
-                installed_count += 1
-            except InstallError as e:
-                console.print(f"[red]Failed:[/red] {skill.name} - {e}")
+                with span("hash_tree", skill=skill.name):
+                    return path, changes, hash_tree(path)
+            except OSError as e:
+                raise InstallError(f"Failed to hash installed skill: {e}") from e
+
+        with span("install", skills=len(targets)):
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, min(jobs or DEFAULT_WORKERS, len(targets)))
+            )
+            try:
+                futures = [
+                    executor.submit(install, skill, agent_config)
+                    for agent_config, skill in targets
+                ]
+                for (agent_config, skill), future in zip(targets, futures, strict=True):
+                    try:
+                        install_path, changes, tree_hash = future.result()
+                        print_install_result(
+                            console, skill.name, install_path, changes
+                        )
+                        installed_count += 1
+                        lock_entries.append(
+                            _lock_entry(
+                                skill,
+                                agent_config,
+                                skill_source,
+                                scope,
+                                root,
+                                tree_hash,
+                                commit,
+                                install_mode,
+                            )
+                        )
+                    except InstallError as e:
+                        console.print(f"[red]Failed:[/red] {skill.name} - {e}")
+            finally:
+                # On interrupt, skip queued installs; running ones finish or roll back
+                executor.shutdown(cancel_futures=True)
+
+        if lock_entries:
+            try:
+                with span("update_lockfile"):
+                    update_lockfile(get_lockfile_path(scope), lock_entries)
+            except LockfileError as e:
+                console.print(f"[yellow]Lockfile not updated: {e}[/yellow]")
 
         console.print()
         console.print(
-            f"[green]Done![/green] Installed {installed_count}/{len(skills)} skill(s)."
+            f"[green]Done![/green] Installed {installed_count}/{total} skill(s)."
         )
 
+        if watch:
+            assert skill_dir is not None
+            _watch(
+                console,
+                skill_source,
+                skill_dir,
+                skills,
+                agent_configs,
+                scope,
+                install_mode,
+                skill_name,
+                max_depth,
+                jobs,
+            )
+
     finally:
         # Cleanup temp directory
         if temp_dir and temp_dir.exists():
             shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+def _lock_entry(
+    skill: Skill,
+    agent_config: AgentConfig,
+    skill_source: SkillSource,
+    scope: InstallScope,
+    root: Path,
+    tree_hash: str,
+    commit: str | None,
+    install_mode: InstallMode,
+) -> LockEntry:
+    """Build the lockfile entry for an installed skill."""
+    return LockEntry(
+        name=skill.name,
+        agent=agent_config.name,
+        source=lock_source(skill_source, scope),
+        path=skill.path.resolve().relative_to(root).as_posix(),
+        hash=tree_hash,
+        commit=commit,
+        mode=install_mode,
+    )
+
+
+def _is_within(path: Path, directory: Path) -> bool:
+    """Check whether path is directory or below it."""
+    return path == directory or directory in path.parents
+
+
+def _watch(
+    console: Console,
+    skill_source: SkillSource,
+    skill_dir: Path,
+    skills: list[Skill],
+    agent_configs: list[AgentConfig],
+    scope: InstallScope,
+    install_mode: InstallMode,
+    skill_name: str | None,
+    max_depth: int | None,
+    jobs: int | None,
+) -> None:
+    """Copy changes below a local source into its installs until interrupted.
+
+    Only the changed paths of each affected skill are compared and
+    written. A changed SKILL.md rediscovers the source, so added and
+    renamed skills are installed. The lockfile is updated on exit.
+    """
+    from add_skills.repositories import get_watcher, iter_changes
+
+    root = skill_dir.resolve()
+    # Installs inside the source must not be mistaken for edits
+    install_dirs = {
+        get_install_path(skills[0], agent_config, scope).parent.resolve()
+        for agent_config in agent_configs
+    }
+
+    def is_installed(path: Path) -> bool:
+        return any(d == path or d in path.parents for d in install_dirs)
+
+    watcher = get_watcher(root)
+    console.print()
+    console.print(
+        f"Watching [cyan]{escape(str(root))}[/cyan] for changes. "
+        "Press Ctrl+C to stop."
+    )
+    updated: dict[tuple[str, str], tuple[AgentConfig, Skill]] = {}
+    try:
+        for changed in iter_changes(watcher):
+            changed = {path for path in changed if not is_installed(path)}
+            if root in changed or any(
+                p.name == SKILL_FILENAME
+                # A new directory may hold a SKILL.md written before it
+                # was watched
+                or (p.is_dir() and not any(_is_within(p, s.path) for s in skills))
+                for p in changed
+            ):
+                # Skills may have been added, renamed or re-described
+                known = {(s.name, s.path) for s in skills}
+                skills = [
+                    s
+                    for s in discover_skills(
+                        root, max_depth=max_depth, workers=jobs, use_index=True
+                    )
+                    if not is_installed(s.path)
+                    and (not skill_name or s.name == skill_name)
+                ]
+                changed |= {s.path for s in skills if (s.name, s.path) not in known}
+
+            with span("sync_changes", paths=len(changed)):
+                for skill in skills:
+                    paths = [
+                        p for p in changed if _is_within(p, skill.path)
+                    ]
+                    if not paths or not skill.path.exists():
+                        continue
+                    for agent_config in agent_configs:
+                        try:
+                            install_path, changes = sync_skill_paths(
+                                skill, agent_config, scope, paths, mode=install_mode
+                            )
+                        except InstallError as e:
+                            console.print(f"[red]Failed:[/red] {skill.name} - {e}")
+                            continue
+                        if changes is None or not changes.up_to_date:
+                            print_install_result(
+                                console, skill.name, install_path, changes
+                            )
+                            updated[(agent_config.name, skill.name)] = (
+                                agent_config,
+                                skill,
+                            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    console.print("Stopped watching.")
+
+    lock_entries = []
+    for agent_config, skill in updated.values():
+        try:
+            tree_hash = hash_tree(get_install_path(skill, agent_config, scope))
+        except OSError:
+            continue
+        lock_entries.append(
+            _lock_entry(
+                skill,
+                agent_config,
+                skill_source,
+                scope,
+                root,
+                tree_hash,
+                None,
+                install_mode,
+            )
+        )
+    if lock_entries:
+        try:
+            update_lockfile(get_lockfile_path(scope), lock_entries)
+        except LockfileError as e:
+            console.print(f"[yellow]Lockfile not updated: {e}[/yellow]")
+
+
+def _resolve_commit(
+    skill_source: SkillSource, ttl: float, transport: TransportOptions
+) -> str | None:
+    """Resolve a remote source's branch to a commit, if the remote answers."""
+    from add_skills.repositories import resolve_commit
+
+    assert skill_source.clone_url is not None
+    try:
+        with span("resolve_commit"):
+            return resolve_commit(
+                skill_source.clone_url, skill_source.branch, ttl, transport
+            )
+    except GitError:
+        # Fetching the branch reports the problem
+        return None
+
+
+def _locked_current(
+    targets: list[tuple[AgentConfig, Skill]],
+    skill_source: SkillSource,
+    scope: InstallScope,
+    install_mode: InstallMode,
+) -> list[tuple[AgentConfig, Skill]]:
+    """Return the targets locked at the source's commit that still match."""
+    try:
+        locked = load_lockfile(get_lockfile_path(scope))
+    except LockfileError:
+        return []
+
+    source = lock_source(skill_source, scope)
+    current = []
+    for agent_config, skill in targets:
+        entry = locked.get(lock_key(agent_config.name, skill.name))
+        if (
+            entry is not None
+            and entry.source == source
+            and entry.commit == skill_source.commit
+            and entry.mode == install_mode
+            and matches_lock(entry, agent_config, scope)
+        ):
+            current.append((agent_config, skill))
+    return current
+
+
+def _fetch_remote(
+    console: Console,
+    skill_source: SkillSource,
+    temp_dir: Path,
+    fetcher: str,
+    use_cache: bool,
+    sparse: bool,
+    skill_name: str | None,
+    transport: TransportOptions,
+    archive_sha256: str | None = None,
+) -> Path:
+    """Fetch a remote source into temp_dir and return its skill directory."""
+    # Imported here so local sources never load the fetchers
+    from add_skills.repositories import fetch_archive, get_fetcher, get_transfer_size
+
+    if fetcher == "archive":
+        console.print(f"Downloading [cyan]{skill_source.original}[/cyan]...")
+        try:
+            with span("fetch", fetcher=fetcher) as fetch_args:
+                skill_dir = fetch_archive(
+                    skill_source, temp_dir, expected_sha256=archive_sha256
+                )
+                if is_enabled():
+                    fetch_args["files"], fetch_args["bytes"] = directory_stats(temp_dir)
+            return skill_dir
+        except ArchiveError as e:
+            if archive_sha256 is not None:
+                exit_with_error(console, f"downloading archive: {e}")
+            console.print(
+                f"[yellow]Archive download failed ({e}), "
+                "falling back to git clone.[/yellow]"
+            )
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            temp_dir.mkdir()
+
+    label = f"Cloning [cyan]{escape(skill_source.original)}[/cyan]"
+    console.print(f"{label}...")
+    try:
+        with span("fetch", fetcher="git") as fetch_args, console.status(
+            f"{label}..."
+        ) as status:
+            # Show the latest line of git's transfer progress
+            transport = replace(
+                transport,
+                progress=lambda line: status.update(
+                    f"{label} [dim]{escape(line)}[/dim]"
+                ),
+            )
+            skill_dir = get_fetcher(skill_source.source_type, "git", transport).fetch(
+                skill_source,
+                temp_dir,
+                use_cache=use_cache,
+                sparse=sparse,
+                skill_name=skill_name,
+            )
+            if is_enabled():
+                fetch_args["bytes"] = get_transfer_size(temp_dir)
+    except Exception as e:
+        exit_with_error(console, f"cloning repository: {e}")
+
+    if sparse or not use_cache:
+        console.print(
+            f"Fetched [cyan]{format_size(get_transfer_size(temp_dir))}[/cyan]"
+        )
+    return skill_dir
+
+
 def _display_skills(console: Console, skills: list) -> None:
     """Display skills in a table."""
     table = Table(title="Available Skills")
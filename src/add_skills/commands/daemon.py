@@ -0,0 +1,101 @@
+"""Daemon commands for running invocations in a warm background process."""
+
+import subprocess
+import sys
+import time
+
+import typer
+from rich.console import Console
+
+from add_skills.cli_utils import exit_with_error
+from add_skills.daemon import (
+    DAEMON_ENV,
+    get_socket_path,
+    is_supported,
+    request,
+    serve,
+)
+from add_skills.repositories.cache import get_cache_dir
+
+LOG_NAME = "daemon.log"
+START_TIMEOUT_SECONDS = 10.0
+
+
+def daemon_start(ctx: typer.Context, foreground: bool, idle_timeout: float) -> None:
+    """Start the daemon in the background, or serve in this process."""
+    console: Console = ctx.obj
+
+    if not is_supported():
+        exit_with_error(console, "the daemon needs Unix sockets")
+    answer = request("ping")
+    if answer is not None:
+        console.print(f"Daemon already running (pid {answer.get('pid')}).")
+        return
+
+    if foreground:
+        try:
+            serve(idle_timeout)
+        except OSError as e:
+            exit_with_error(console, f"starting daemon: {e}")
+        return
+
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    log_path = cache_dir / LOG_NAME
+    with open(log_path, "w") as log:
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                # Not -m, which click would show as the program name in
+                # the usage of forwarded invocations
+                "-c",
+                "from add_skills.__main__ import main; main()",
+                "daemon",
+                "start",
+                "--foreground",
+                "--idle-timeout",
+                str(idle_timeout),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        answer = request("ping")
+        if answer is not None:
+            console.print(
+                f"[green]Daemon started[/green] (pid {answer.get('pid')}) "
+                f"on {get_socket_path()}"
+            )
+            return
+        if proc.poll() is not None:
+            break
+        time.sleep(0.05)
+    exit_with_error(console, f"daemon did not start, see {log_path}")
+
+
+def daemon_stop(ctx: typer.Context) -> None:
+    """Stop the running daemon."""
+    console: Console = ctx.obj
+
+    if request("stop") is None:
+        console.print("No daemon running.")
+        return
+    console.print("Daemon stopped.")
+
+
+def daemon_status(ctx: typer.Context) -> None:
+    """Show whether a daemon is running."""
+    console: Console = ctx.obj
+
+    answer = request("ping")
+    if answer is None:
+        console.print("No daemon running.")
+        raise typer.Exit(code=1)
+    console.print(
+        f"Daemon running (pid {answer.get('pid')}) on {get_socket_path()}. "
+        f"Set {DAEMON_ENV}=0 to bypass it."
+    )
@@ -1,13 +1,23 @@
 """Find command for searching skills in the registry."""
 
+from collections.abc import Iterable
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
 from add_skills.cli_utils import exit_with_error
 from add_skills.exceptions import RegistryFetchError, RegistryParseError
-from add_skills.repositories import fetch_registry
+from add_skills.models import RegistryEntry
+from add_skills.repositories import iter_registry
+from add_skills.repositories.cache import keeps_in_memory, load_memoized
+from add_skills.repositories.registry import (
+    DEFAULT_TTL_SECONDS,
+    get_fresh_cache_path,
+    wait_for_refresh,
+)
 from add_skills.services import search_registry
+from add_skills.services.registry_index import RegistryIndex
 
 
 def find(
@@ -16,6 +26,10 @@ def find(
         None,
         help="Keyword to search for in skill names, descriptions, and tags.",
     ),
+    offline: bool = False,
+    max_age: float = DEFAULT_TTL_SECONDS,
+    stale: bool = False,
+    limit: int | None = None,
 ) -> None:
     """Search for Skills in the curated registry.
 
@@ -23,15 +37,30 @@ def find(
     """
     console: Console = ctx.obj
 
+    # Entries are streamed into the search, so memory does not grow with
+    # the size of the registry. A long-lived process indexes it once instead.
     try:
-        entries = fetch_registry()
+        entries: Iterable[RegistryEntry] | RegistryIndex | None = _memoized_index(
+            max_age
+        )
+        if entries is None:
+            entries = iter_registry(
+                ttl=max_age, stale_while_revalidate=stale, offline=offline
+            )
+        results = search_registry(entries, keyword, limit)
     except RegistryFetchError as e:
         exit_with_error(console, f"fetching registry: {e}")
     except RegistryParseError as e:
         exit_with_error(console, f"parsing registry: {e}")
 
-    results = search_registry(entries, keyword)
+    _print_results(console, results, keyword)
+    # A --stale refresh runs in the background; give it a moment to finish
+    wait_for_refresh()
+
 
+def _print_results(
+    console: Console, results: list[RegistryEntry], keyword: str | None
+) -> None:
     if not results:
         if keyword:
             console.print(f"No Skills found matching '{keyword}'.")
@@ -48,3 +77,20 @@ def find(
         table.add_row(entry.name, entry.repo, entry.description)
 
     console.print(table)
+
+
+def _memoized_index(max_age: float) -> RegistryIndex | None:
+    """Return the index of the fresh cached registry, built once per download.
+
+    Returns:
+        None unless the process keeps cache files in memory and the cached
+        registry is fresh.
+    """
+    if not keeps_in_memory():
+        return None
+    body_path = get_fresh_cache_path(ttl=max_age)
+    if body_path is None:
+        return None
+    return load_memoized(
+        body_path, lambda _: RegistryIndex(iter_registry(ttl=max_age))
+    )
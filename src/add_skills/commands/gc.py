@@ -0,0 +1,26 @@
+"""Gc command for pruning the skill store."""
+
+import typer
+from rich.console import Console
+
+from add_skills.cli_utils import exit_with_error, format_size
+from add_skills.services import gc_store
+
+
+def gc(ctx: typer.Context) -> None:
+    """Remove store entries that no installed Skill links to."""
+    console: Console = ctx.obj
+
+    try:
+        removed, freed = gc_store()
+    except OSError as e:
+        exit_with_error(console, f"cleaning store: {e}")
+
+    if not removed:
+        console.print("Nothing to remove.")
+        return
+
+    console.print(
+        f"[green]Removed[/green] {removed} store entr{'y' if removed == 1 else 'ies'}, "
+        f"freed [cyan]{format_size(freed)}[/cyan]."
+    )
@@ -0,0 +1,218 @@
+"""Install command for provisioning every source listed in a manifest."""
+
+import shutil
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from add_skills.cli_utils import exit_with_error, print_install_result
+from add_skills.core import resolve_agents
+from add_skills.core.agents import DEFAULT_AGENT
+from add_skills.core.source_parser import parse_source
+from add_skills.exceptions import (
+    InstallError,
+    LockfileError,
+    ManifestError,
+    SourceParseError,
+)
+from add_skills.models import (
+    AgentConfig,
+    InstallMode,
+    InstallScope,
+    LockEntry,
+    ManifestEntry,
+    SkillSource,
+    SourceType,
+    TransportOptions,
+)
+from add_skills.repositories import (
+    discover_skills,
+    get_head_commit,
+    get_lockfile_path,
+    load_manifest,
+    lock_source,
+    update_lockfile,
+)
+from add_skills.services import hash_tree, sync_skill
+from add_skills.services.batch import DEFAULT_PER_HOST, fetch_key, fetch_sources
+from add_skills.timings import span
+
+
+def install_manifest(
+    ctx: typer.Context,
+    manifest: Path,
+    global_install: bool = False,
+    use_cache: bool = True,
+    jobs: int | None = None,
+    per_host: int = DEFAULT_PER_HOST,
+    install_mode: InstallMode = InstallMode.COPY,
+    fetch_timeout: float | None = None,
+    git_config: list[str] | None = None,
+) -> None:
+    """Install the Skills listed in a manifest.
+
+    Each repository is fetched once, concurrently with the others, and
+    the Skills of a source are installed as soon as it has been fetched.
+    Installing is idempotent: Skills already installed are synced.
+    """
+    console: Console = ctx.obj
+    scope = InstallScope.GLOBAL if global_install else InstallScope.LOCAL
+
+    try:
+        entries, default_agents = load_manifest(manifest)
+    except ManifestError as e:
+        exit_with_error(console, str(e))
+
+    # Validate the whole manifest before fetching anything
+    planned: list[tuple[ManifestEntry, SkillSource, list[AgentConfig]]] = []
+    for entry in entries:
+        try:
+            skill_source = parse_source(entry.source)
+            agent_configs = resolve_agents(
+                entry.agents or default_agents or [DEFAULT_AGENT], scope
+            )
+        except SourceParseError as e:
+            exit_with_error(console, str(e))
+        except KeyError as e:
+            exit_with_error(console, f"{entry.source}: {e.args[0]}")
+        planned.append((entry, skill_source, agent_configs))
+
+    work_dir = Path(tempfile.mkdtemp(prefix="add-skills-"))
+    lock_entries: list[LockEntry] = []
+    failed = 0
+    remote = [p for p in planned if p[1].source_type != SourceType.LOCAL]
+    try:
+        if remote:
+            console.print(
+                f"Fetching {len({fetch_key(s) for _, s, _ in remote})} repositories..."
+            )
+        # The fetches start here and run while the local sources install
+        results = fetch_sources(
+            [skill_source for _, skill_source, _ in remote],
+            work_dir,
+            jobs=jobs,
+            per_host=per_host,
+            use_cache=use_cache,
+            transport=TransportOptions(timeout=fetch_timeout, config=git_config or []),
+        )
+        with closing(results):
+            for entry, skill_source, agent_configs in planned:
+                if skill_source.source_type == SourceType.LOCAL:
+                    assert skill_source.path is not None
+                    failed += _install_source(
+                        console,
+                        entry,
+                        skill_source,
+                        agent_configs,
+                        skill_source.path,
+                        None,
+                        scope,
+                        install_mode,
+                        lock_entries,
+                    )
+
+            for key, result in results:
+                for entry, skill_source, agent_configs in remote:
+                    if fetch_key(skill_source) != key:
+                        continue
+                    if isinstance(result, Exception):
+                        console.print(f"[red]Failed:[/red] {entry.source} - {result}")
+                        failed += 1
+                        continue
+                    root = result
+                    if skill_source.subpath:
+                        root = result / skill_source.subpath.strip("/")
+                    failed += _install_source(
+                        console,
+                        entry,
+                        skill_source,
+                        agent_configs,
+                        root,
+                        get_head_commit(result),
+                        scope,
+                        install_mode,
+                        lock_entries,
+                    )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if lock_entries:
+        try:
+            with span("update_lockfile"):
+                update_lockfile(get_lockfile_path(scope), lock_entries)
+        except LockfileError as e:
+            console.print(f"[yellow]Lockfile not updated: {e}[/yellow]")
+
+    console.print()
+    console.print(
+        f"[green]Done![/green] {len(lock_entries)} skill(s) installed or up to date"
+        f"{f', {failed} failed' if failed else ''}."
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _install_source(
+    console: Console,
+    entry: ManifestEntry,
+    skill_source: SkillSource,
+    agent_configs: list[AgentConfig],
+    root: Path,
+    commit: str | None,
+    scope: InstallScope,
+    install_mode: InstallMode,
+    lock_entries: list[LockEntry],
+) -> int:
+    """Discover and install the Skills of one fetched source.
+
+    Returns:
+        Number of failures.
+    """
+    if not root.is_dir():
+        console.print(f"[red]Failed:[/red] {entry.source} - path not found")
+        return 1
+
+    skills = discover_skills(
+        root, use_git_index=skill_source.source_type != SourceType.LOCAL
+    )
+    if entry.skills:
+        found = {skill.name for skill in skills}
+        missing = [name for name in entry.skills if name not in found]
+        for name in missing:
+            console.print(f"[red]Skill not found:[/red] {name} in {entry.source}")
+        skills = [skill for skill in skills if skill.name in entry.skills]
+    else:
+        missing = []
+        if not skills:
+            console.print(f"[yellow]No skills found in {entry.source}[/yellow]")
+
+    failed = len(missing)
+    root = root.resolve()
+    for agent_config in agent_configs:
+        for skill in skills:
+            try:
+                with span("install_skill", skill=skill.name, agent=agent_config.name):
+                    install_path, changes = sync_skill(
+                        skill, agent_config, scope, mode=install_mode
+                    )
+                    tree_hash = hash_tree(install_path)
+            except (InstallError, OSError) as e:
+                console.print(f"[red]Failed:[/red] {skill.name} - {e}")
+                failed += 1
+                continue
+            print_install_result(console, skill.name, install_path, changes)
+            lock_entries.append(
+                LockEntry(
+                    name=skill.name,
+                    agent=agent_config.name,
+                    source=lock_source(skill_source, scope),
+                    path=skill.path.resolve().relative_to(root).as_posix(),
+                    hash=tree_hash,
+                    commit=commit,
+                    mode=install_mode,
+                )
+            )
+    return failed
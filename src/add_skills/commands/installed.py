@@ -0,0 +1,97 @@
+"""Installed command for listing the Skills installed for every agent."""
+
+import json
+
+import typer
+from rich.cells import cell_len
+from rich.console import Console
+from rich.table import Table
+
+from add_skills.cli_utils import exit_with_error, format_size
+from add_skills.core import resolve_agents
+from add_skills.models import InstallScope
+from add_skills.services import list_installed
+
+# Rich tables take about a millisecond per row; more rows are printed as
+# plain columns
+TABLE_MAX_ROWS = 500
+COLUMNS = ("Name", "Agent", "Scope", "Size", "Source")
+SIZE_COLUMN = 3
+
+
+def installed(
+    ctx: typer.Context,
+    agent: list[str] | None = None,
+    scope: InstallScope | None = None,
+    json_output: bool = False,
+) -> None:
+    """List the Skills installed in project and global agent directories."""
+    console: Console = ctx.obj
+
+    agent_configs = None
+    if agent:
+        try:
+            agent_configs = resolve_agents(agent, scope or InstallScope.LOCAL)
+        except KeyError as e:
+            exit_with_error(console, str(e.args[0]))
+
+    skills = list_installed(agent_configs, [scope] if scope else None)
+
+    if json_output:
+        records = [
+            {
+                "name": skill.name,
+                "agent": skill.agent,
+                "scope": skill.scope.value,
+                "size": skill.size,
+                "source": skill.source,
+                "path": str(skill.path),
+                "description": skill.description,
+            }
+            for skill in skills
+        ]
+        # Not print_json: highlighting thousands of records is slow
+        console.out(json.dumps(records, indent=2), highlight=False)
+        return
+
+    if not skills:
+        console.print("No Skills installed.")
+        return
+
+    rows = [
+        (
+            skill.name,
+            skill.agent,
+            skill.scope.value,
+            format_size(skill.size),
+            skill.source or "-",
+        )
+        for skill in skills
+    ]
+    if len(rows) > TABLE_MAX_ROWS:
+        _print_columns(console, rows)
+        return
+
+    table = Table(title="Installed Skills")
+    table.add_column("Name", style="cyan", no_wrap=True)
+    table.add_column("Agent")
+    table.add_column("Scope")
+    table.add_column("Size", justify="right")
+    table.add_column("Source", style="green")
+    for row in rows:
+        table.add_row(*row)
+    console.print(table)
+
+
+def _print_columns(console: Console, rows: list[tuple[str, ...]]) -> None:
+    """Print rows as plain aligned columns, in one write."""
+    rows = [COLUMNS, *rows]
+    widths = [max(cell_len(row[i]) for row in rows) for i in range(len(COLUMNS))]
+    lines = []
+    for row in rows:
+        cells = []
+        for i, (value, width) in enumerate(zip(row, widths, strict=True)):
+            padding = " " * (width - cell_len(value))
+            cells.append(padding + value if i == SIZE_COLUMN else value + padding)
+        lines.append("  ".join(cells).rstrip())
+    console.out("\n".join(lines), highlight=False)
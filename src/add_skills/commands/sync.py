@@ -0,0 +1,146 @@
+"""Sync command for restoring the skills recorded in the lockfile."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from add_skills.cli_utils import exit_with_error
+from add_skills.core import get_agent
+from add_skills.core.source_parser import parse_source
+from add_skills.exceptions import (
+    GitError,
+    InstallError,
+    LockfileError,
+    SourceParseError,
+)
+from add_skills.models import (
+    InstallScope,
+    LockEntry,
+    SourceType,
+    TransportOptions,
+)
+from add_skills.repositories import get_lockfile_path, load_lockfile, parse_skill
+from add_skills.services import hash_tree, matches_lock, sync_skill
+from add_skills.timings import span
+
+
+def sync(
+    ctx: typer.Context,
+    global_install: bool = False,
+    use_cache: bool = True,
+    fetch_timeout: float | None = None,
+    git_config: list[str] | None = None,
+) -> None:
+    """Install exactly the Skills recorded in the lockfile.
+
+    Skills whose installed content already matches the lockfile are
+    skipped, and a source is only fetched if one of its Skills is not.
+    Remote sources are fetched at the locked commit.
+    """
+    console: Console = ctx.obj
+    scope = InstallScope.GLOBAL if global_install else InstallScope.LOCAL
+    transport = TransportOptions(timeout=fetch_timeout, config=git_config or [])
+    lockfile = get_lockfile_path(scope)
+
+    try:
+        entries = load_lockfile(lockfile)
+    except LockfileError as e:
+        exit_with_error(console, str(e))
+    if not entries:
+        console.print(f"No Skills locked in {lockfile}.")
+        return
+
+    # One fetch per source and commit
+    groups: dict[tuple[str, str | None], list[LockEntry]] = {}
+    for key in sorted(entries):
+        entry = entries[key]
+        groups.setdefault((entry.source, entry.commit), []).append(entry)
+
+    synced = 0
+    failed = 0
+    for (source, commit), group in groups.items():
+        with span("check_installed", skills=len(group)):
+            pending = [entry for entry in group if not _is_current(entry, scope)]
+        synced += len(group) - len(pending)
+        if not pending:
+            continue
+
+        temp_dir: Path | None = None
+        try:
+            try:
+                skill_source = parse_source(source)
+                if skill_source.source_type == SourceType.LOCAL:
+                    assert skill_source.path is not None
+                    root = skill_source.path
+                else:
+                    from add_skills.repositories import get_fetcher
+
+                    skill_source.commit = commit
+                    label = f"{source}@{commit[:12]}" if commit else source
+                    console.print(f"Fetching [cyan]{label}[/cyan]...")
+                    temp_dir = Path(tempfile.mkdtemp(prefix="add-skills-"))
+                    fetcher = get_fetcher(skill_source.source_type, transport=transport)
+                    with span("fetch", source=source):
+                        root = fetcher.fetch(
+                            skill_source, temp_dir, use_cache=use_cache
+                        )
+            except (SourceParseError, GitError) as e:
+                for entry in pending:
+                    console.print(f"[red]Failed:[/red] {entry.name} - {e}")
+                failed += len(pending)
+                continue
+
+            for entry in pending:
+                if _restore(console, entry, root, scope):
+                    synced += 1
+                else:
+                    failed += 1
+        finally:
+            if temp_dir and temp_dir.exists():
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    console.print()
+    console.print(f"[green]Done![/green] {synced}/{len(entries)} skill(s) in sync.")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _is_current(entry: LockEntry, scope: InstallScope) -> bool:
+    """Check whether an installed skill matches its lockfile hash."""
+    try:
+        agent = get_agent(entry.agent)
+    except KeyError:
+        return False
+    return matches_lock(entry, agent, scope)
+
+
+def _restore(
+    console: Console, entry: LockEntry, root: Path, scope: InstallScope
+) -> bool:
+    """Install or update one locked skill from a fetched source."""
+    try:
+        agent = get_agent(entry.agent)
+        skill = parse_skill(root / entry.path)
+        if skill is None or skill.name != entry.name:
+            raise InstallError(f"not found in source at {entry.path}")
+        with span("install_skill", skill=entry.name, agent=entry.agent):
+            install_path, changes = sync_skill(skill, agent, scope, mode=entry.mode)
+            tree_hash = hash_tree(install_path)
+    except KeyError as e:
+        console.print(f"[red]Failed:[/red] {entry.name} - {e.args[0]}")
+        return False
+    except (InstallError, OSError) as e:
+        console.print(f"[red]Failed:[/red] {entry.name} - {e}")
+        return False
+
+    action = "Installed" if changes is None else "Updated"
+    console.print(f"[green]{action}:[/green] {entry.name} -> {install_path}")
+    if tree_hash != entry.hash:
+        console.print(
+            f"[yellow]Warning:[/yellow] {entry.name} differs from the lockfile "
+            "(the source changed since it was locked)"
+        )
+    return True
@@ -1,21 +1,43 @@
 """Core functionality for add-skills.
 
 This module re-exports from repositories and services for backward compatibility.
+Those re-exports are imported on first use.
 """
 
-from add_skills.core.agents import AGENTS, get_agent, get_all_agents
-from add_skills.core.source_parser import parse_source
-from add_skills.repositories import (
-    clone_repo,
-    discover_skills,
-    fetch_registry,
-    parse_skill,
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from add_skills.core.agents import (
+    AGENTS,
+    detect_agents,
+    get_agent,
+    get_all_agents,
+    resolve_agents,
 )
-from add_skills.services import install_skill, search_registry
+from add_skills.core.source_parser import parse_source
+
+if TYPE_CHECKING:
+    from add_skills.repositories import (
+        clone_repo,
+        discover_skills,
+        fetch_registry,
+        parse_skill,
+    )
+    from add_skills.services import install_skill, search_registry
+
+_REEXPORTS = {
+    "clone_repo": "add_skills.repositories",
+    "discover_skills": "add_skills.repositories",
+    "fetch_registry": "add_skills.repositories",
+    "install_skill": "add_skills.services",
+    "parse_skill": "add_skills.repositories",
+    "search_registry": "add_skills.services",
+}
 
 __all__ = [
     "AGENTS",
     "clone_repo",
+    "detect_agents",
     "discover_skills",
     "fetch_registry",
     "get_agent",
@@ -23,5 +45,14 @@ __all__ = [
     "install_skill",
     "parse_skill",
     "parse_source",
+    "resolve_agents",
     "search_registry",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _REEXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_REEXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -2,7 +2,11 @@
 
 from pathlib import Path
 
-from add_skills.models import AgentConfig
+from add_skills.models import AgentConfig, InstallScope
+
+# Top-level project directories that do not imply an agent, e.g. .github
+# for CI workflows
+SHARED_PROJECT_DIRS = frozenset({".github"})
 
 # Agent configurations matching vercel-labs/skills
 AGENTS: dict[str, AgentConfig] = {
@@ -185,6 +189,9 @@ AGENTS: dict[str, AgentConfig] = {
 # Default agent
 DEFAULT_AGENT = "claude-code"
 
+# Agent name that selects every agent detected on this machine
+AUTO_AGENT = "auto"
+
 
 def get_agent(name: str) -> AgentConfig:
     """Get agent configuration by name.
@@ -210,3 +217,76 @@ def get_all_agents() -> list[AgentConfig]:
         List of all AgentConfig objects.
     """
     return list(AGENTS.values())
+
+
+def detect_agents(
+    scope: InstallScope, project_dir: Path | None = None
+) -> list[AgentConfig]:
+    """Detect agents whose configuration directory exists.
+
+    For local scope an agent is detected when the top-level directory of
+    its project skills path (e.g. ``.claude``) exists in the project.
+    Directories that other tools create too, such as ``.github``, only
+    count with the skills directory itself in them. Agents installing into
+    a plain top-level directory such as ``skills`` are never detected,
+    since that name says nothing about the agent. For global scope the
+    parent of the global skills directory must exist.
+
+    Args:
+        scope: Installation scope.
+        project_dir: Project directory for local scope. Defaults to cwd.
+
+    Returns:
+        Detected AgentConfig objects in AGENTS order.
+    """
+    if project_dir is None:
+        project_dir = Path.cwd()
+
+    detected = []
+    for agent in AGENTS.values():
+        if scope == InstallScope.LOCAL:
+            parts = Path(agent.project_skills_dir).parts
+            marker = project_dir / (
+                agent.project_skills_dir if parts[0] in SHARED_PROJECT_DIRS else parts[0]
+            )
+            found = len(parts) > 1 and marker.is_dir()
+        else:
+            found = agent.global_skills_path.parent.is_dir()
+        if found:
+            detected.append(agent)
+    return detected
+
+
+def resolve_agents(
+    names: list[str], scope: InstallScope, project_dir: Path | None = None
+) -> list[AgentConfig]:
+    """Resolve agent names to configurations.
+
+    Names may be comma-separated; ``auto`` expands to the detected agents.
+    Duplicates are dropped, keeping the first occurrence.
+
+    Args:
+        names: Agent names as given on the command line.
+        scope: Installation scope, used for detection.
+        project_dir: Project directory for local scope. Defaults to cwd.
+
+    Returns:
+        List of AgentConfig objects.
+
+    Raises:
+        KeyError: If an agent is unknown or ``auto`` detects nothing.
+    """
+    resolved: dict[str, AgentConfig] = {}
+    for name in (part.strip() for value in names for part in value.split(",")):
+        if not name:
+            continue
+        if name == AUTO_AGENT:
+            detected = detect_agents(scope, project_dir)
+            if not detected:
+                raise KeyError("No agent directories detected. Use --agent to choose.")
+            for agent in detected:
+                resolved.setdefault(agent.name, agent)
+        else:
+            agent = get_agent(name)
+            resolved.setdefault(agent.name, agent)
+    return list(resolved.values())
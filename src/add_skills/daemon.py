@@ -0,0 +1,375 @@
+"""Background daemon that runs CLI invocations in a warm process.
+
+``add-skills daemon start`` serves invocations on a Unix socket in the
+cache directory. Each one runs in the daemon's process, so imports, agent
+lookups, the registry index and discovery indexes loaded by one call are
+reused by the next. forward() sends an invocation there if a daemon is
+running; it only imports the standard library, so a forwarded call does
+not pay for loading the CLI.
+
+Messages are JSON objects, one per line. The client sends ``{"prog",
+"argv", "cwd", "env", "terminal", "width"}`` (or ``{"command": "ping"}`` /
+``{"command": "stop"}``); the daemon answers with ``{"stdout": text}``
+and ``{"stderr": text}`` messages followed by ``{"exit": status}``.
+Invocations run one at a time. A client that is interrupted closes the
+connection, which interrupts its invocation in the daemon.
+
+Each invocation runs with the client's environment, so settings read from
+it, such as the cache directory or the git backend, are looked up when
+they are used rather than once per process.
+"""
+
+import io
+import json
+import os
+import shutil
+import signal
+import socket
+import sys
+import threading
+import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+from add_skills.defaults import DEFAULT_IDLE_TIMEOUT_SECONDS
+from add_skills.repositories.cache import file_lock, get_cache_dir, keep_in_memory
+
+DAEMON_ENV = "ADD_SKILLS_DAEMON"  # "0" runs every invocation locally
+SOCKET_NAME = "daemon.sock"
+LOCK_NAME = "daemon.lock"
+
+# Packages whose exports are loaded when the daemon starts, so the first
+# invocation is fast too
+WARM_PACKAGES = (
+    "add_skills.commands",
+    "add_skills.repositories",
+    "add_skills.services",
+)
+
+
+def get_socket_path() -> Path:
+    """Return the socket a daemon for the current cache directory listens on."""
+    return get_cache_dir() / SOCKET_NAME
+
+
+def is_supported() -> bool:
+    """Check whether the platform has Unix sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a CLI invocation in the daemon, if one is running.
+
+    Invocations that may prompt for input, and the daemon's own commands,
+    are never forwarded.
+
+    Args:
+        argv: Command-line arguments, without the program name.
+
+    Returns:
+        The exit status, or None if the invocation was not forwarded and
+        must run locally.
+    """
+    if os.environ.get(DAEMON_ENV) == "0" or not _forwardable(argv):
+        return None
+    sock = _connect()
+    if sock is None:
+        return None
+
+    terminal = sys.stdout.isatty()
+    request = {
+        "prog": sys.argv[0],
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "terminal": terminal,
+        "width": shutil.get_terminal_size().columns if terminal else None,
+    }
+    with sock:
+        try:
+            try:
+                _send(sock, request)
+                messages = _receive(sock)
+            except OSError:
+                messages = iter(())
+            while True:
+                try:
+                    message = next(messages, None)
+                except OSError:
+                    message = None
+                if message is None:
+                    break
+                if "stdout" in message:
+                    sys.stdout.write(message["stdout"])
+                    sys.stdout.flush()
+                elif "stderr" in message:
+                    sys.stderr.write(message["stderr"])
+                    sys.stderr.flush()
+                elif "exit" in message:
+                    return int(message["exit"])
+        except KeyboardInterrupt:
+            # Closing the connection stops the invocation in the daemon;
+            # report it the way click does for a local run
+            print("\nAborted!", file=sys.stderr)
+            return 1
+    print("Error: lost the connection to the add-skills daemon", file=sys.stderr)
+    return 1
+
+
+def _forwardable(argv: list[str]) -> bool:
+    """Check whether an invocation can run without a terminal on stdin.
+
+    Watching is not forwarded either, as it would hold the daemon.
+    """
+    if (argv and argv[0] == "daemon") or "--watch" in argv:
+        return False
+    if argv and argv[0] in ("find", "gc", "install", "installed", "sync"):
+        return True
+    # Adding asks for confirmation unless told not to
+    return any(arg in ("-y", "--yes", "-l", "--list", "--help") for arg in argv)
+
+
+def request(command: str) -> dict[str, Any] | None:
+    """Send a control command ("ping" or "stop") to the daemon.
+
+    Returns:
+        The daemon's answer, or None if no daemon is running.
+    """
+    sock = _connect()
+    if sock is None:
+        return None
+    with sock:
+        try:
+            _send(sock, {"command": command})
+            return next(_receive(sock), None)
+        except OSError:
+            return None
+
+
+def _connect() -> socket.socket | None:
+    if not is_supported():
+        return None
+    path = get_socket_path()
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        # A daemon that did not shut down cleanly leaves its socket behind
+        sock.close()
+        return None
+    return sock
+
+
+def _send(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _receive(sock: socket.socket) -> Iterator[dict[str, Any]]:
+    with sock.makefile("rb") as reader:
+        for line in reader:
+            yield json.loads(line)
+
+
+def serve(idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS) -> None:
+    """Serve invocations until stopped, or idle for ``idle_timeout`` seconds.
+
+    Args:
+        idle_timeout: Seconds without a connection before exiting. 0 never
+            exits on its own.
+
+    Raises:
+        OSError: If Unix sockets are not supported, a daemon is already
+            running, or the socket cannot be created.
+    """
+    if not is_supported():
+        raise OSError("Unix sockets are not supported on this platform")
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = get_socket_path()
+
+    with file_lock(cache_dir / LOCK_NAME, blocking=False) as locked:
+        if not locked:
+            raise OSError(f"A daemon is already running on {path}")
+        import_module("add_skills.cli")
+        for package_name in WARM_PACKAGES:
+            # Through the package, whose exports are imported lazily
+            package = import_module(package_name)
+            for name in package.__all__:
+                getattr(package, name)
+        keep_in_memory()
+
+        path.unlink(missing_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the owner may connect: invocations run with the daemon's rights
+        umask = os.umask(0o177)
+        try:
+            server.bind(str(path))
+        finally:
+            os.umask(umask)
+        server.listen()
+        server.settimeout(idle_timeout or None)
+
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except TimeoutError:
+                    break
+                with conn:
+                    conn.settimeout(None)
+                    if not _handle(conn):
+                        break
+        finally:
+            server.close()
+            path.unlink(missing_ok=True)
+
+
+def _handle(conn: socket.socket) -> bool:
+    """Answer one connection; False once the daemon should stop."""
+    try:
+        message = next(_receive(conn), None)
+    except (OSError, ValueError):
+        return True
+    if not isinstance(message, dict):
+        return True
+
+    command = message.get("command")
+    if command is None:
+        answer: dict[str, Any] = {"exit": _invoke(conn, message)}
+    else:
+        answer = {"exit": 0, "pid": os.getpid()}
+    try:
+        _send(conn, answer)
+    except OSError:
+        pass
+    return command != "stop"
+
+
+class _Output(io.TextIOBase):
+    """Text stream that sends what is written to the client."""
+
+    encoding = "utf-8"
+
+    def __init__(
+        self, conn: socket.socket, name: str, lock: threading.Lock, terminal: bool
+    ) -> None:
+        self._conn = conn
+        self._name = name
+        self._lock = lock
+        self._terminal = terminal
+
+    def isatty(self) -> bool:
+        return self._terminal
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            # Progress displays write from their own threads
+            with self._lock:
+                _send(self._conn, {self._name: text})
+        return len(text)
+
+
+def _invoke(conn: socket.socket, message: dict[str, Any]) -> int:
+    """Run a forwarded invocation in the client's directory and environment."""
+    from rich.console import Console
+
+    from add_skills import cli
+
+    terminal = bool(message.get("terminal"))
+    width = message.get("width")
+    lock = threading.Lock()
+    stdout = _Output(conn, "stdout", lock, terminal)
+    stderr = _Output(conn, "stderr", lock, terminal)
+
+    env = dict(os.environ)
+    cwd = os.getcwd()
+    argv = sys.argv
+    stdin = sys.stdin
+    create_console = cli._create_console
+    try:
+        os.environ.clear()
+        os.environ.update(message.get("env") or {})
+        os.chdir(message["cwd"])
+        sys.argv = [message.get("prog") or "add-skills", *message.get("argv", [])]
+        # Prompts read end of file instead of waiting on the daemon's stdin
+        sys.stdin = io.StringIO()
+        cli._create_console = lambda: Console(force_terminal=terminal, width=width)
+        with _interrupt_on_disconnect(conn):
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                cli.run()
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        _write_quietly(stderr, f"{e.code}\n")
+        return 1
+    except KeyboardInterrupt:
+        return 1
+    except Exception:
+        _write_quietly(stderr, traceback.format_exc())
+        return 1
+    finally:
+        cli._create_console = create_console
+        sys.stdin = stdin
+        sys.argv = argv
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+
+
+@contextmanager
+def _interrupt_on_disconnect(conn: socket.socket) -> Iterator[None]:
+    """Raise KeyboardInterrupt in the enclosed block if the client goes away.
+
+    The client sends nothing after its request, so a watcher thread reads
+    the connection until it is closed and then interrupts the invocation
+    as Ctrl-C would in a local run, which stops running git commands.
+    Only an invocation on the main thread can be interrupted.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    lock = threading.Lock()
+    running = True
+
+    def watch() -> None:
+        try:
+            while conn.recv(4096):
+                pass
+        except OSError:
+            pass
+        with lock:
+            if running:
+                signal.pthread_kill(threading.main_thread().ident or 0, signal.SIGINT)
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        with lock:
+            running = False
+        try:
+            # Wakes the watcher; the answer can still be sent
+            conn.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+        # A signal sent just before the block ended is raised by now
+        watcher.join()
+
+
+def _write_quietly(stream: _Output, text: str) -> None:
+    """Report to a client that may have gone away."""
+    try:
+        stream.write(text)
+    except OSError:
+        pass
@@ -0,0 +1,17 @@
+"""Defaults shared by the CLI options and the modules that implement them.
+
+This module imports nothing, so the CLI can show these values in --help
+without loading the modules that use them.
+"""
+
+MANIFEST_NAME = "skills.json"
+
+# Seconds a cached registry (find) or ls-remote result (add) stays fresh
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_REF_TTL_SECONDS = 60
+
+# Repositories fetched at once per host by install
+DEFAULT_PER_HOST = 4
+
+# Seconds the daemon waits for a request before exiting
+DEFAULT_IDLE_TIMEOUT_SECONDS = 1800
@@ -35,3 +35,21 @@ class SourceParseError(AddSkillsError):
     """Failed to parse source string."""
 
     pass
+
+
+class ArchiveError(AddSkillsError):
+    """Failed to download or extract a repository archive."""
+
+    pass
+
+
+class LockfileError(AddSkillsError):
+    """Failed to read or write the lockfile."""
+
+    pass
+
+
+class ManifestError(AddSkillsError):
+    """Failed to read or validate a manifest file."""
+
+    pass
@@ -2,18 +2,30 @@
 
 from add_skills.models.types import (
     AgentConfig,
+    InstalledSkill,
+    InstallMode,
     InstallScope,
+    LockEntry,
+    ManifestEntry,
     RegistryEntry,
     Skill,
     SkillSource,
     SourceType,
+    SyncResult,
+    TransportOptions,
 )
 
 __all__ = [
     "AgentConfig",
+    "InstalledSkill",
+    "InstallMode",
     "InstallScope",
+    "LockEntry",
+    "ManifestEntry",
     "RegistryEntry",
     "Skill",
     "SkillSource",
     "SourceType",
+    "SyncResult",
+    "TransportOptions",
 ]
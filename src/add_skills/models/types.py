@@ -1,5 +1,8 @@
 """Type definitions for add-skills."""
 
+import sys
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -21,6 +24,14 @@ class InstallScope(Enum):
     GLOBAL = "global"
 
 
+class InstallMode(Enum):
+    """How a skill is placed into an agent's skills directory."""
+
+    COPY = "copy"
+    SYMLINK = "symlink"  # Symlink to the content-addressed store
+    HARDLINK = "hardlink"  # Tree of hardlinks into the store
+
+
 @dataclass
 class AgentConfig:
     """Configuration for an AI agent."""
@@ -36,6 +47,58 @@ class AgentConfig:
         return self.global_skills_dir.expanduser()
 
 
+@dataclass
+class SyncResult:
+    """Files written or deleted when syncing an installed skill.
+
+    Paths are POSIX-style and relative to the skill directory.
+    """
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    @property
+    def up_to_date(self) -> bool:
+        """Return True if nothing needed to change."""
+        return not (self.added or self.changed or self.removed)
+
+
+@dataclass
+class ManifestEntry:
+    """A source listed in a manifest, with the skills and agents it targets."""
+
+    source: str
+    skills: list[str] = field(default_factory=list)  # Empty installs every skill
+    agents: list[str] = field(default_factory=list)  # Empty uses the manifest default
+
+
+@dataclass
+class LockEntry:
+    """An installed skill recorded in the lockfile."""
+
+    name: str
+    agent: str
+    source: str  # Source string as given on the command line
+    path: str  # Skill directory relative to the source root, POSIX-style
+    hash: str  # Content hash of the installed tree
+    commit: str | None = None  # Resolved commit SHA for git sources
+    mode: InstallMode = InstallMode.COPY
+
+
+@dataclass
+class InstalledSkill:
+    """A skill found in an agent's skills directory."""
+
+    name: str
+    agent: str
+    scope: InstallScope
+    path: Path
+    size: int  # Bytes, following a symlink install into the store
+    description: str = ""
+    source: str | None = None  # From the lockfile; None if not recorded
+
+
 @dataclass
 class SkillSource:
     """Parsed source information."""
@@ -47,6 +110,7 @@ class SkillSource:
     branch: str | None = None
     subpath: str | None = None
     original: str = ""
+    commit: str | None = None  # Pinned commit SHA, checked out instead of branch
 
     @property
     def clone_url(self) -> str | None:
@@ -58,6 +122,17 @@ class SkillSource:
         return None
 
 
+@dataclass
+class TransportOptions:
+    """How a fetch talks to the remote."""
+
+    timeout: float | None = None  # Seconds each git operation may take
+    config: list[str] = field(default_factory=list)  # KEY=VALUE, passed as git -c
+    extra_args: list[str] = field(default_factory=list)  # Appended to clone/fetch
+    progress: Callable[[str], None] | None = None  # Receives progress lines
+    cancel: threading.Event | None = None  # Set to abort running operations
+
+
 @dataclass
 class Skill:
     """A skill definition."""
@@ -75,20 +150,34 @@ class Skill:
         return self.path / "SKILL.md"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RegistryEntry:
-    """A skill entry in the curated registry."""
+    """A skill entry in the curated registry.
+
+    Registries can hold millions of entries, so instances use slots, tag
+    strings are interned and the case-folded search text is computed once,
+    on the first search. Entries are frozen so that text cannot go stale.
+    """
 
     name: str
     repo: str
     description: str
     tags: list[str] = field(default_factory=list)
+    _search_key: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tags", [sys.intern(tag) for tag in self.tags])
+
+    @property
+    def search_key(self) -> str:
+        """Case-folded name, description and tags, for substring search."""
+        if self._search_key is None:
+            # NUL separates fields so a keyword cannot match across them
+            key = "\0".join([self.name, self.description, *self.tags]).casefold()
+            object.__setattr__(self, "_search_key", key)
+            return key
+        return self._search_key
 
     def matches(self, keyword: str) -> bool:
         """Check if this entry matches a search keyword."""
-        keyword_lower = keyword.lower()
-        return (
-            keyword_lower in self.name.lower()
-            or keyword_lower in self.description.lower()
-            or any(keyword_lower in tag.lower() for tag in self.tags)
-        )
+        return keyword.casefold() in self.search_key
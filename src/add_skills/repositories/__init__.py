@@ -1,12 +1,88 @@
-"""Repositories for data access."""
+"""Repositories for data access.
 
-from add_skills.repositories.filesystem import discover_skills, parse_skill
-from add_skills.repositories.git import clone_repo
-from add_skills.repositories.registry import fetch_registry
+Exports are imported on first use, so that commands only load the
+dependencies (YAML, HTTP, tar) of the repositories they use.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from add_skills.repositories.archive import fetch_archive
+    from add_skills.repositories.fetchers import get_fetcher
+    from add_skills.repositories.filesystem import (
+        discover_skills,
+        parse_skill,
+        parse_skill_header,
+    )
+    from add_skills.repositories.git import (
+        clone_repo,
+        get_head_commit,
+        get_transfer_size,
+        prune_repo_cache,
+    )
+    from add_skills.repositories.lockfile import (
+        get_lockfile_path,
+        load_lockfile,
+        lock_key,
+        lock_source,
+        update_lockfile,
+    )
+    from add_skills.repositories.manifest import load_manifest
+    from add_skills.repositories.refs import resolve_commit
+    from add_skills.repositories.registry import fetch_registry, iter_registry
+    from add_skills.repositories.watcher import get_watcher, iter_changes
+
+_EXPORTS = {
+    "clone_repo": "git",
+    "discover_skills": "filesystem",
+    "fetch_archive": "archive",
+    "fetch_registry": "registry",
+    "get_fetcher": "fetchers",
+    "get_head_commit": "git",
+    "get_lockfile_path": "lockfile",
+    "get_transfer_size": "git",
+    "get_watcher": "watcher",
+    "iter_changes": "watcher",
+    "iter_registry": "registry",
+    "load_lockfile": "lockfile",
+    "load_manifest": "manifest",
+    "lock_key": "lockfile",
+    "lock_source": "lockfile",
+    "parse_skill": "filesystem",
+    "parse_skill_header": "filesystem",
+    "prune_repo_cache": "git",
+    "resolve_commit": "refs",
+    "update_lockfile": "lockfile",
+}
 
 __all__ = [
     "clone_repo",
     "discover_skills",
+    "fetch_archive",
     "fetch_registry",
+    "get_fetcher",
+    "get_head_commit",
+    "get_lockfile_path",
+    "get_transfer_size",
+    "get_watcher",
+    "iter_changes",
+    "iter_registry",
+    "load_lockfile",
+    "load_manifest",
+    "lock_key",
+    "lock_source",
     "parse_skill",
+    "parse_skill_header",
+    "prune_repo_cache",
+    "resolve_commit",
+    "update_lockfile",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
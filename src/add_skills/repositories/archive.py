@@ -0,0 +1,294 @@
+"""Repository archive download with streamed extraction."""
+
+import hashlib
+import http.client
+import os
+import shutil
+import tarfile
+import urllib.request
+from pathlib import Path, PurePosixPath
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+
+from add_skills.exceptions import ArchiveError
+from add_skills.models import SkillSource, SourceType
+from add_skills.repositories.filesystem import SKILL_FILENAME
+
+TIMEOUT_SECONDS = 30
+MAX_RESUME_ATTEMPTS = 3
+STAGING_DIRNAME = ".add-skills-staging"
+
+_SKILL_FILENAME_BYTES = SKILL_FILENAME.encode("utf-8")
+
+
+def archive_url(source: SkillSource) -> str | None:
+    """Return the tarball URL for a remote source.
+
+    Args:
+        source: The skill source.
+
+    Returns:
+        The archive URL, or None for local sources.
+    """
+    ref = quote(source.branch or "HEAD", safe="/")
+    if source.source_type == SourceType.GITHUB:
+        return f"https://codeload.github.com/{source.owner}/{source.repo}/tar.gz/{ref}"
+    elif source.source_type == SourceType.GITLAB:
+        name = quote(f"{source.repo}-{source.branch or 'HEAD'}".replace("/", "-"))
+        return f"https://gitlab.com/{source.owner}/{source.repo}/-/archive/{ref}/{name}.tar.gz"
+    return None
+
+
+class _ResumableStream:
+    """Readable HTTP body that resumes with Range requests after a drop.
+
+    Every byte read is fed to a SHA-256 hasher so the download can be
+    verified once the stream is drained.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.offset = 0
+        self.sha256 = hashlib.sha256()
+        self._attempts = 0
+        self._etag: str | None = None
+        self._length: int | None = None
+        self._response = self._open()
+
+    def _open(self) -> http.client.HTTPResponse:
+        request = urllib.request.Request(self.url)
+        if self.offset:
+            request.add_header("Range", f"bytes={self.offset}-")
+            if self._etag:
+                request.add_header("If-Range", self._etag)
+
+        try:
+            response = urllib.request.urlopen(request, timeout=TIMEOUT_SECONDS)
+        except HTTPError as e:
+            raise ArchiveError(f"HTTP error {e.code}: {e.reason}") from e
+        except URLError as e:
+            raise ArchiveError(f"Failed to connect: {e.reason}") from e
+        except TimeoutError as e:
+            raise ArchiveError("Request timed out") from e
+        except (http.client.HTTPException, OSError) as e:
+            raise ArchiveError(f"Request failed: {e}") from e
+
+        if self.offset:
+            content_range = response.headers.get("Content-Range", "")
+            if response.status != 206 or not content_range.startswith(
+                f"bytes {self.offset}-"
+            ):
+                response.close()
+                raise ArchiveError("Server does not support resuming the download")
+        else:
+            self._etag = response.headers.get("ETag")
+            length = response.headers.get("Content-Length")
+            self._length = int(length) if length and length.isdigit() else None
+
+        return response
+
+    def _resume(self, error: Exception) -> None:
+        self._response.close()
+        self._attempts += 1
+        if self._attempts > MAX_RESUME_ATTEMPTS:
+            raise ArchiveError(f"Download interrupted: {error}") from error
+        self._response = self._open()
+
+    def read(self, size: int = -1) -> bytes:
+        while True:
+            try:
+                data = self._response.read(size)
+            except (http.client.HTTPException, OSError) as e:
+                self._resume(e)
+                continue
+
+            truncated = (
+                not data
+                and size != 0
+                and self._length is not None
+                and self.offset < self._length
+            )
+            if truncated:
+                self._resume(ArchiveError("connection closed early"))
+                continue
+
+            self.offset += len(data)
+            self.sha256.update(data)
+            return data
+
+    def drain(self) -> None:
+        """Read and hash whatever the tar reader left unread."""
+        while self.read(64 * 1024):
+            pass
+
+    def close(self) -> None:
+        self._response.close()
+
+
+def _sorts_before_skill_file(name: str, is_dir: bool) -> bool:
+    """Check whether a tree entry precedes SKILL.md in git tree order.
+
+    git archive emits entries in tree order, where directory names compare
+    as if they ended with a slash.
+    """
+    key = name.encode("utf-8") + (b"/" if is_dir else b"")
+    return key < _SKILL_FILENAME_BYTES
+
+
+def _safe_target(root: Path, parts: tuple[str, ...]) -> Path | None:
+    """Return the extraction path for member parts, or None if unsafe."""
+    if not parts or any(part in ("", ".", "..") for part in parts):
+        return None
+    return root.joinpath(*parts)
+
+
+class _SkillExtractor:
+    """Extracts only the members that live inside skill directories.
+
+    A member is written straight to its final place once one of its
+    ancestors (within scope) is known to hold SKILL.md. Members whose
+    SKILL.md may still follow in the stream are parked in a staging
+    directory and promoted or discarded later; members that no pending
+    SKILL.md can claim are skipped without touching the disk.
+    """
+
+    def __init__(self, target_dir: Path, scope: tuple[str, ...]) -> None:
+        self.target_dir = target_dir
+        self.staging_dir = target_dir / STAGING_DIRNAME
+        self.scope = scope
+        self.skill_roots: set[tuple[str, ...]] = set()
+        self.staged: list[tuple[str, ...]] = []
+
+    def _claimed(self, dir_parts: tuple[str, ...]) -> bool:
+        return any(
+            dir_parts[:depth] in self.skill_roots
+            for depth in range(len(self.scope), len(dir_parts) + 1)
+        )
+
+    def _claimable_later(self, parts: tuple[str, ...]) -> bool:
+        for depth in range(len(self.scope), len(parts)):
+            is_dir = depth + 1 < len(parts)
+            if _sorts_before_skill_file(parts[depth], is_dir):
+                return True
+        return False
+
+    def _write(
+        self,
+        tar: tarfile.TarFile,
+        member: tarfile.TarInfo,
+        parts: tuple[str, ...],
+        dest: Path,
+    ) -> bool:
+        """Write a member to dest; False if it was skipped."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if member.issym():
+            # Resolved from the link's final place: a staged link sits one
+            # level deeper and is later moved up unchanged
+            final = self.target_dir.joinpath(*parts)
+            resolved = (final.parent / member.linkname).resolve()
+            if self.target_dir.resolve() not in resolved.parents:
+                return False
+            os.symlink(member.linkname, dest)
+            return True
+
+        source = tar.extractfile(member)
+        if source is None:
+            return False
+        with source, open(dest, "wb") as f:
+            shutil.copyfileobj(source, f)
+        os.chmod(dest, 0o755 if member.mode & 0o111 else 0o644)
+        return True
+
+    def _promote(self, root: tuple[str, ...]) -> None:
+        remaining = []
+        for parts in self.staged:
+            if parts[: len(root)] == root:
+                dest = self.target_dir.joinpath(*parts)
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(self.staging_dir.joinpath(*parts), dest)
+            else:
+                remaining.append(parts)
+        self.staged = remaining
+
+    def add(self, tar: tarfile.TarFile, member: tarfile.TarInfo) -> None:
+        if not (member.isfile() or member.issym()):
+            return
+
+        # Drop the archive's top-level "<repo>-<ref>/" directory
+        parts = PurePosixPath(member.name).parts[1:]
+        if parts[: len(self.scope)] != self.scope or len(parts) <= len(self.scope):
+            return
+
+        dest = _safe_target(self.target_dir, parts)
+        if dest is None:
+            raise ArchiveError(f"Unsafe path in archive: {member.name}")
+
+        dir_parts = parts[:-1]
+        if parts[-1] == SKILL_FILENAME and member.isfile():
+            self.skill_roots.add(dir_parts)
+            self._promote(dir_parts)
+
+        if self._claimed(dir_parts):
+            self._write(tar, member, parts, dest)
+        elif self._claimable_later(parts):
+            staged = _safe_target(self.staging_dir, parts)
+            assert staged is not None
+            if self._write(tar, member, parts, staged):
+                self.staged.append(parts)
+
+    def finish(self) -> None:
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+
+def fetch_archive(
+    source: SkillSource,
+    target_dir: Path,
+    url: str | None = None,
+    expected_sha256: str | None = None,
+) -> Path:
+    """Download a repository archive and extract its skill directories.
+
+    The tarball is extracted while it streams in. Only directories that
+    contain SKILL.md (below the source subpath, if any) are written.
+
+    Args:
+        source: The remote skill source.
+        target_dir: Directory to extract into.
+        url: Archive URL. Defaults to the source's GitHub/GitLab tarball.
+        expected_sha256: Hex digest the downloaded archive must match.
+
+    Returns:
+        Path to the extracted repository, or to its subpath.
+
+    Raises:
+        ArchiveError: If the download, extraction or checksum check fails.
+    """
+    url = url or archive_url(source)
+    if url is None:
+        raise ArchiveError("Cannot download an archive for a local source")
+
+    scope = PurePosixPath((source.subpath or "").strip("/")).parts
+    target_dir.mkdir(parents=True, exist_ok=True)
+    extractor = _SkillExtractor(target_dir, scope)
+
+    stream: _ResumableStream | None = None
+    try:
+        stream = _ResumableStream(url)
+        with tarfile.open(fileobj=stream, mode="r|gz") as tar:  # type: ignore[arg-type]
+            for member in tar:
+                extractor.add(tar, member)
+        stream.drain()
+        digest = stream.sha256.hexdigest()
+    except (tarfile.TarError, EOFError, OSError, http.client.HTTPException) as e:
+        raise ArchiveError(f"Failed to extract archive: {e}") from e
+    finally:
+        if stream is not None:
+            stream.close()
+        extractor.finish()
+
+    if expected_sha256 and digest != expected_sha256.lower():
+        raise ArchiveError(
+            f"Checksum mismatch: expected {expected_sha256}, got {digest}"
+        )
+
+    return target_dir.joinpath(*scope)
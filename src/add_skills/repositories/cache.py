@@ -0,0 +1,227 @@
+"""On-disk cache and data locations, and cross-process locking."""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+CACHE_DIR_ENV = "ADD_SKILLS_CACHE_DIR"
+DATA_DIR_ENV = "ADD_SKILLS_DATA_DIR"
+LOCK_POLL_SECONDS = 0.1
+MEMORY_MAX_ENTRIES = 256
+
+T = TypeVar("T")
+
+
+def get_cache_dir() -> Path:
+    """Return the user cache directory for add-skills.
+
+    Honours ``ADD_SKILLS_CACHE_DIR``, then the platform convention
+    (``%LOCALAPPDATA%`` on Windows, ``~/Library/Caches`` on macOS and
+    ``$XDG_CACHE_HOME`` or ``~/.cache`` elsewhere).
+
+    Returns:
+        Path to the cache directory. It is not created.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+
+    return base / "add-skills"
+
+
+def get_data_dir() -> Path:
+    """Return the user data directory for add-skills.
+
+    Unlike the cache directory, its contents are referenced by installed
+    Skills and must not be deleted by cache cleaners. Honours
+    ``ADD_SKILLS_DATA_DIR``, then the platform convention (``%LOCALAPPDATA%``
+    on Windows, ``~/Library/Application Support`` on macOS and
+    ``$XDG_DATA_HOME`` or ``~/.local/share`` elsewhere).
+
+    Returns:
+        Path to the data directory. It is not created.
+    """
+    override = os.environ.get(DATA_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+
+    return base / "add-skills"
+
+
+def read_json_object(path: Path) -> dict[str, Any]:
+    """Read a JSON object, or return an empty one if it is missing or invalid."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    """Atomically write a JSON object.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+# Values loaded from cache files, kept between calls by a long-lived process
+_memory: dict[Path, tuple[tuple[int, int], Any]] | None = None
+_memory_lock = threading.Lock()
+
+
+def keep_in_memory() -> None:
+    """Keep values loaded with load_memoized for later calls."""
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = {}
+
+
+def keeps_in_memory() -> bool:
+    """Check whether load_memoized keeps values in memory."""
+    return _memory is not None
+
+
+def load_memoized(path: Path, load: Callable[[Path], T]) -> T:
+    """Return ``load(path)``, reusing an earlier result while the file is unchanged.
+
+    Results are only kept once keep_in_memory() has been called, and are
+    reused while the file's modification time and size stay the same.
+    Callers share the result and must not modify it.
+    """
+    if _memory is None:
+        return load(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return load(path)
+    version = (st.st_mtime_ns, st.st_size)
+
+    with _memory_lock:
+        cached = _memory.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    value = load(path)
+    with _memory_lock:
+        _memory.pop(path, None)
+        if len(_memory) >= MEMORY_MAX_ENTRIES:
+            del _memory[next(iter(_memory))]
+        _memory[path] = (version, value)
+    return value
+
+
+def directory_size(path: Path) -> int:
+    """Return the total size in bytes of all files below a directory."""
+    return directory_stats(path)[1]
+
+
+def directory_stats(path: Path) -> tuple[int, int]:
+    """Return the number of files below a directory and their total size."""
+    files = 0
+    total = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        files += 1
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return files, total
+
+
+def _try_lock(fd: int) -> bool:
+    """Try to take an exclusive lock on an open file descriptor."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    import fcntl
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    """Release a lock taken by _try_lock."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: Path, blocking: bool = True) -> Iterator[bool]:
+    """Hold an exclusive cross-process lock on a lock file.
+
+    Args:
+        path: Lock file path. Created if missing.
+        blocking: Wait for the lock. If False, yields False immediately
+            when another process holds it.
+
+    Yields:
+        True if the lock is held, False if it could not be taken.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        acquired = _try_lock(fd)
+        while not acquired and blocking:
+            time.sleep(LOCK_POLL_SECONDS)
+            acquired = _try_lock(fd)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                _unlock(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,422 @@
+"""Fast file and directory tree copying."""
+
+import errno
+import filecmp
+import os
+import shutil
+import sys
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from add_skills.models import SyncResult
+
+# ioctl request for a copy-on-write clone of a whole file (Linux, btrfs/XFS)
+FICLONE = 0x40049409
+
+# Copies are mostly kernel time, so threads beyond the CPU count do not help
+DEFAULT_COPY_WORKERS = min(8, os.cpu_count() or 1)
+
+# Trees with fewer files are copied on the calling thread
+PARALLEL_MIN_FILES = 8
+
+# errnos meaning "this filesystem or file cannot do it", not a real failure
+_UNSUPPORTED = frozenset(
+    {
+        errno.EBADF,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.ENOTSUP,
+        errno.ENOTTY,
+        errno.EOPNOTSUPP,
+        errno.EPERM,
+        errno.EXDEV,
+    }
+)
+
+# Devices found not to support reflinks, so the ioctl is not retried per file
+_no_reflink_devices: set[int] = set()
+_no_copy_file_range = not hasattr(os, "copy_file_range")
+
+
+def _reflink(src_fd: int, dst_fd: int, device: int) -> bool:
+    """Try to clone a file with FICLONE. Returns False if unsupported."""
+    if sys.platform != "linux" or device in _no_reflink_devices:
+        return False
+
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED:
+            raise
+        _no_reflink_devices.add(device)
+        return False
+    return True
+
+
+def _copy_range(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy file contents in the kernel.
+
+    Uses copy_file_range, which can also share extents on filesystems
+    that support it, then sendfile. Some FUSE and overlay filesystems
+    copy less than asked and then nothing.
+
+    Returns:
+        True if all ``size`` bytes were copied. False if the calls are
+        unsupported or stopped short, with both file offsets left after
+        the bytes that were copied, so the caller can copy the rest.
+    """
+    global _no_copy_file_range
+
+    copied = 0
+    if not _no_copy_file_range:
+        try:
+            while copied < size:
+                sent = os.copy_file_range(src_fd, dst_fd, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED or copied:
+                raise
+            if e.errno == errno.ENOSYS:
+                _no_copy_file_range = True
+        if copied == size:
+            return True
+
+    if not hasattr(os, "sendfile") or sys.platform != "linux":
+        return False
+    start = copied
+    try:
+        while copied < size:
+            sent = os.sendfile(dst_fd, src_fd, copied, size - copied)
+            if sent == 0:
+                break
+            copied += sent
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED or copied > start:
+            raise
+    if copied < size:
+        # sendfile reads at an offset without moving the source's
+        os.lseek(src_fd, copied, os.SEEK_SET)
+        return False
+    return True
+
+
+def copy_file(src: str | Path, dst: str | Path) -> None:
+    """Copy a file with its permission bits and timestamps.
+
+    Tries a copy-on-write reflink first, then an in-kernel copy, and
+    falls back to shutil.copyfile.
+
+    Raises:
+        OSError: If copying fails.
+    """
+    with open(src, "rb") as fsrc:
+        st = os.fstat(fsrc.fileno())
+        with open(dst, "wb") as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            if not (
+                _reflink(src_fd, dst_fd, st.st_dev)
+                or (st.st_size and _copy_range(src_fd, dst_fd, st.st_size))
+            ):
+                shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src, dst)
+
+
+def copy_tree(
+    src: Path, dst: Path, workers: int | None = None, symlinks: bool = False
+) -> None:
+    """Copy a directory tree like shutil.copytree, with files in parallel.
+
+    The destination must not exist.
+
+    Args:
+        src: Directory to copy.
+        dst: Destination directory.
+        workers: Maximum copy threads. Defaults to DEFAULT_COPY_WORKERS;
+            1 copies serially.
+        symlinks: Recreate symlinks with the same target instead of
+            copying what they point to, as with shutil.copytree.
+
+    Raises:
+        OSError: If any file or directory cannot be copied.
+    """
+    # Create the directory skeleton first so file copies never race on it.
+    # Plain strings keep per-entry overhead low for trees of small files.
+    dirs: list[tuple[str, str]] = [(os.fspath(src), os.fspath(dst))]
+    files: list[tuple[str, str]] = []
+    os.mkdir(dst)
+    index = 0
+    while index < len(dirs):
+        src_dir, dst_dir = dirs[index]
+        index += 1
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                target = os.path.join(dst_dir, entry.name)
+                if symlinks and entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), target)
+                elif entry.is_dir():
+                    os.mkdir(target)
+                    dirs.append((entry.path, target))
+                else:
+                    files.append((entry.path, target))
+
+    _run_copies(copy_file, files, workers)
+
+    # Directory metadata last, since creating entries updates mtimes
+    for src_dir, dst_dir in reversed(dirs):
+        shutil.copystat(src_dir, dst_dir)
+
+
+def link_or_copy_file(src: str | Path, dst: str | Path) -> None:
+    """Hardlink a file, copying it when src is on another device."""
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        copy_file(src, dst)
+
+
+def _run_copies(
+    func: Callable[[str, str], None],
+    pairs: list[tuple[str, str]],
+    workers: int | None,
+) -> None:
+    """Apply func to (src, dst) pairs, on a thread pool for larger batches."""
+    workers = workers or DEFAULT_COPY_WORKERS
+    if workers == 1 or len(pairs) < PARALLEL_MIN_FILES:
+        for src_file, dst_file in pairs:
+            func(src_file, dst_file)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(pairs))) as executor:
+            # list() re-raises the first failure
+            list(executor.map(lambda pair: func(*pair), pairs))
+
+
+def _scan(
+    root: str, follow_symlinks: bool
+) -> tuple[dict[str, os.stat_result], set[str]]:
+    """Return the files, with stats, and directories below root by relative path."""
+    files: dict[str, os.stat_result] = {}
+    dirs: set[str] = set()
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    dirs.add(rel)
+                    stack.append(rel)
+                else:
+                    files[rel] = entry.stat(follow_symlinks=follow_symlinks)
+    return files, dirs
+
+
+def _diff(
+    src: str, dst: str, link: bool
+) -> tuple[SyncResult, list[str], set[str], set[str]]:
+    """Compare a source tree with an installed copy.
+
+    Unchanged files are detected by size and mtime first and by content
+    only when the mtime differs. In link mode, files with equal content
+    that are not the same inode as the source still need relinking.
+
+    Returns:
+        The changes, files to refresh without a content change, and the
+        source and destination directory sets.
+    """
+    src_files, src_dirs = _scan(src, follow_symlinks=True)
+    dst_files, dst_dirs = _scan(dst, follow_symlinks=False)
+    result = SyncResult()
+    refresh: list[str] = []
+
+    for rel, src_stat in src_files.items():
+        dst_stat = dst_files.get(rel)
+        if dst_stat is None:
+            (result.changed if rel in dst_dirs else result.added).append(rel)
+            continue
+        if link:
+            if os.path.samestat(src_stat, dst_stat):
+                continue
+        elif (
+            src_stat.st_size == dst_stat.st_size
+            and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+            and src_stat.st_mode == dst_stat.st_mode
+        ):
+            continue
+        if src_stat.st_size == dst_stat.st_size and filecmp.cmp(
+            os.path.join(src, rel), os.path.join(dst, rel), shallow=False
+        ):
+            refresh.append(rel)
+        else:
+            result.changed.append(rel)
+
+    result.removed = [rel for rel in dst_files if rel not in src_files]
+    for changes in (result.added, result.changed, result.removed, refresh):
+        changes.sort()
+    return result, refresh, src_dirs, dst_dirs
+
+
+def diff_tree(src: Path, dst: Path) -> SyncResult:
+    """Return what syncing dst to match src would change."""
+    return _diff(os.fspath(src), os.fspath(dst), link=False)[0]
+
+
+def _replace_file(src: str, dst: str, link: bool) -> None:
+    """Atomically replace dst with a copy or hardlink of src."""
+    head, tail = os.path.split(dst)
+    tmp = os.path.join(head, f".{tail}.add-skills-{uuid.uuid4().hex}")
+    try:
+        (link_or_copy_file if link else copy_file)(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def sync_file(src: Path, dst: Path) -> SyncResult:
+    """Make an existing single-file install match src."""
+    src_stat, dst_stat = os.stat(src), os.lstat(dst)
+    if src_stat.st_size == dst_stat.st_size and filecmp.cmp(src, dst, shallow=False):
+        if (src_stat.st_mtime_ns, src_stat.st_mode) != (
+            dst_stat.st_mtime_ns,
+            dst_stat.st_mode,
+        ):
+            shutil.copystat(src, dst)
+        return SyncResult()
+
+    _replace_file(os.fspath(src), os.fspath(dst), link=False)
+    return SyncResult(changed=[dst.name])
+
+
+def sync_tree(
+    src: Path, dst: Path, link: bool = False, workers: int | None = None
+) -> SyncResult:
+    """Make an existing tree match src, writing only what differs.
+
+    Added and changed files are written to a temporary name and renamed
+    over the old one; files and directories missing from src are
+    deleted. Files whose content is unchanged only get their metadata
+    refreshed.
+
+    Args:
+        src: Source directory. Symlinks are followed.
+        dst: Installed directory to update.
+        link: Hardlink files from src instead of copying them.
+        workers: Maximum copy threads, as for copy_tree.
+
+    Returns:
+        Relative paths that were added, changed and removed.
+
+    Raises:
+        OSError: If the tree cannot be updated.
+    """
+    src_root, dst_root = os.fspath(src), os.fspath(dst)
+    result, refresh, src_dirs, dst_dirs = _diff(src_root, dst_root, link)
+
+    # Clear entries whose type changed, then create missing directories
+    for rel in result.changed:
+        if rel in dst_dirs:
+            shutil.rmtree(os.path.join(dst_root, rel))
+    for rel in sorted(src_dirs):
+        path = os.path.join(dst_root, rel)
+        if not os.path.isdir(path) or os.path.islink(path):
+            if os.path.lexists(path):
+                os.unlink(path)  # Already listed as removed
+            os.mkdir(path)
+
+    writes = result.added + result.changed + (refresh if link else [])
+    _run_copies(
+        lambda s, d: _replace_file(s, d, link),
+        [(os.path.join(src_root, rel), os.path.join(dst_root, rel)) for rel in writes],
+        workers,
+    )
+    if not link:
+        for rel in refresh:
+            src_file = os.path.join(src_root, rel)
+            dst_file = os.path.join(dst_root, rel)
+            if os.stat(dst_file).st_nlink > 1:
+                # Shared with the store or another install: never chmod it
+                _replace_file(src_file, dst_file, link=False)
+            else:
+                shutil.copystat(src_file, dst_file)
+
+    for rel in result.removed:
+        path = os.path.join(dst_root, rel)
+        if os.path.lexists(path) and rel not in src_dirs:
+            os.unlink(path)
+    # Deepest first, so parents are empty by the time they are removed
+    for rel in sorted(dst_dirs - src_dirs, key=len, reverse=True):
+        shutil.rmtree(os.path.join(dst_root, rel), ignore_errors=True)
+
+    result.removed.sort()
+    return result
+
+
+def sync_paths(src: Path, dst: Path, paths: Iterable[str]) -> SyncResult:
+    """Make the given paths of an existing tree match src.
+
+    Only the listed paths are compared, so the cost does not depend on
+    the size of the tree. Files are replaced atomically when their
+    content differs, directories are synced with sync_tree, and paths
+    missing from src are deleted.
+
+    Args:
+        src: Source directory.
+        dst: Installed directory to update.
+        paths: POSIX-style paths relative to src; "." syncs the whole tree.
+
+    Returns:
+        Relative paths that were added, changed and removed.
+
+    Raises:
+        OSError: If the tree cannot be updated.
+    """
+    result = SyncResult()
+    synced_dirs: list[str] = []
+    # Parents sort before their children, which a synced parent covers
+    for rel in sorted(set(paths)):
+        if any(rel.startswith(f"{d}/") or d == "." for d in synced_dirs):
+            continue
+        src_path, dst_path = src / rel, dst / rel
+        prefix = "" if rel == "." else f"{rel}/"
+
+        if src_path.is_dir():
+            if not dst_path.is_dir() or dst_path.is_symlink():
+                if os.path.lexists(dst_path):
+                    dst_path.unlink()
+                dst_path.mkdir(parents=True)
+            changes = sync_tree(src_path, dst_path)
+            result.added += [prefix + p for p in changes.added]
+            result.changed += [prefix + p for p in changes.changed]
+            result.removed += [prefix + p for p in changes.removed]
+            synced_dirs.append(rel)
+        elif src_path.exists():
+            if dst_path.is_dir() and not dst_path.is_symlink():
+                shutil.rmtree(dst_path)
+            if os.path.lexists(dst_path):
+                if not sync_file(src_path, dst_path).up_to_date:
+                    result.changed.append(rel)
+            else:
+                dst_path.parent.mkdir(parents=True, exist_ok=True)
+                _replace_file(os.fspath(src_path), os.fspath(dst_path), link=False)
+                result.added.append(rel)
+        elif os.path.lexists(dst_path):
+            if dst_path.is_dir() and not dst_path.is_symlink():
+                shutil.rmtree(dst_path)
+            else:
+                dst_path.unlink()
+            result.removed.append(rel)
+
+    for changes in (result.added, result.changed, result.removed):
+        changes.sort()
+    return result
@@ -0,0 +1,110 @@
+"""Fetchers that download remote sources, selected per source type."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+from add_skills.models import SkillSource, SourceType, TransportOptions
+
+DEFAULT_FETCHER = "git"
+
+
+class Fetcher(Protocol):
+    """Downloads a remote source into a directory."""
+
+    def fetch(
+        self,
+        source: SkillSource,
+        target_dir: Path,
+        use_cache: bool = True,
+        sparse: bool = False,
+        skill_name: str | None = None,
+    ) -> Path:
+        """Fetch a source into target_dir.
+
+        Args:
+            source: The remote skill source.
+            target_dir: Directory to fetch into.
+            use_cache: Reuse a local cache of the source, if the fetcher
+                keeps one.
+            sparse: Download only the subpath or the directory of
+                ``skill_name``, if the fetcher supports it.
+            skill_name: Name of the single skill needed in sparse mode.
+
+        Returns:
+            Path to the fetched source, or to its subpath.
+        """
+        ...
+
+
+@dataclass
+class GitFetcher:
+    """Clones the source's git repository."""
+
+    transport: TransportOptions = field(default_factory=TransportOptions)
+
+    def fetch(
+        self,
+        source: SkillSource,
+        target_dir: Path,
+        use_cache: bool = True,
+        sparse: bool = False,
+        skill_name: str | None = None,
+    ) -> Path:
+        from add_skills.repositories.git import clone_repo
+
+        return clone_repo(
+            source, target_dir, use_cache, sparse, skill_name, self.transport
+        )
+
+
+@dataclass
+class ArchiveFetcher:
+    """Downloads and extracts the tarball of the source's branch.
+
+    Archives are neither cached nor sparse, and the transport options do
+    not apply: HTTP requests use their own timeout.
+    """
+
+    transport: TransportOptions = field(default_factory=TransportOptions)
+
+    def fetch(
+        self,
+        source: SkillSource,
+        target_dir: Path,
+        use_cache: bool = True,
+        sparse: bool = False,
+        skill_name: str | None = None,
+    ) -> Path:
+        from add_skills.repositories.archive import fetch_archive
+
+        return fetch_archive(source, target_dir)
+
+
+# Fetchers available for each remote source type, by name
+FETCHERS: dict[SourceType, dict[str, Callable[[TransportOptions], Fetcher]]] = {
+    SourceType.GITHUB: {"git": GitFetcher, "archive": ArchiveFetcher},
+    SourceType.GITLAB: {"git": GitFetcher, "archive": ArchiveFetcher},
+}
+
+
+def get_fetcher(
+    source_type: SourceType,
+    name: str = DEFAULT_FETCHER,
+    transport: TransportOptions | None = None,
+) -> Fetcher:
+    """Return a fetcher for a source type.
+
+    Args:
+        source_type: Type of the source to fetch.
+        name: Fetcher name, a key of FETCHERS[source_type].
+        transport: Options for talking to the remote.
+
+    Raises:
+        KeyError: If the source type has no fetcher of that name.
+    """
+    fetchers = FETCHERS.get(source_type, {})
+    if name not in fetchers:
+        raise KeyError(f"No '{name}' fetcher for {source_type.value} sources")
+    return fetchers[name](transport or TransportOptions())
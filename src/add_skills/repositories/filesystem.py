@@ -1,14 +1,61 @@
 """Filesystem operations for skill discovery."""
 
+import os
+import re
+import subprocess
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-import frontmatter
-import yaml
-
 from add_skills.models import Skill
+from add_skills.repositories.skill_index import (
+    load_index,
+    save_index,
+    skill_from_dict,
+    skill_to_dict,
+    stat_key,
+)
 
 SKILL_FILENAME = "SKILL.md"
+GITIGNORE_FILENAME = ".gitignore"
+GIT_TIMEOUT_SECONDS = 30
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Directories never searched for skills: VCS metadata, dependencies, caches
+SKIP_DIRS = frozenset(
+    {
+        ".bzr",
+        ".git",
+        ".hg",
+        ".svn",
+        ".mypy_cache",
+        ".nox",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "bower_components",
+        "node_modules",
+        "site-packages",
+        "venv",
+    }
+)
+
+# (base directory, pattern, negated, directory-only) parsed from .gitignore
+_IgnoreRule = tuple[str, re.Pattern[str], bool, bool]
+
+
+# A frontmatter line that YAML reads as a string key and a plain string
+# value: no quotes, flow collections, comments, anchors, tags or control
+# characters, and a value starting with a letter so it is not a number
+_PLAIN_LINE = re.compile(
+    r"([A-Za-z_][\w-]*): +"
+    r"([A-Za-z][^:#\[\]{}&*!|>'\"%@`\x00-\x1f\x7f-\x9f\ufeff]*?) *"
+)
+# Plain words YAML 1.1 reads as booleans or null
+_YAML_WORDS = frozenset({"y", "yes", "n", "no", "true", "false", "on", "off", "null"})
 
 
 def _parse_string(value: Any, default: str = "") -> str:
@@ -29,25 +76,283 @@ def _parse_string_list(value: Any) -> list[str]:
     return []
 
 
-def discover_skills(directory: Path) -> list[Skill]:
+def _translate_gitignore(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+def _load_gitignore(path: Path, base: str) -> list[_IgnoreRule]:
+    """Load rules from a .gitignore file.
+
+    Args:
+        path: Path to the .gitignore file.
+        base: Directory of the file, relative to the walk root ("" for root).
+
+    Returns:
+        Rules in file order.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        body = _translate_gitignore(line.lstrip("/"))
+        regex = re.compile(body if anchored else f"(?:.*/)?{body}")
+        rules.append((base, regex, negate, dir_only))
+    return rules
+
+
+def _is_ignored(rules: list[_IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Check a root-relative path against gitignore rules; the last match wins."""
+    ignored = False
+    for base, regex, negate, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if base:
+            if not rel_path.startswith(base + "/"):
+                continue
+            candidate = rel_path[len(base) + 1 :]
+        else:
+            candidate = rel_path
+        if regex.fullmatch(candidate):
+            ignored = not negate
+    return ignored
+
+
+def _walk_skill_files(
+    root: Path, max_depth: int | None = None, respect_gitignore: bool = True
+) -> Iterator[Path]:
+    """Yield SKILL.md files below root with os.scandir.
+
+    Directories in SKIP_DIRS and, when respect_gitignore is set, paths
+    ignored by .gitignore files are pruned. Symlinked directories are not
+    followed.
+
+    Args:
+        root: Directory to search.
+        max_depth: Deepest directory level (root is 0) searched for SKILL.md.
+        respect_gitignore: Apply .gitignore files found during the walk.
+    """
+    stack: list[tuple[str, str, int, list[_IgnoreRule]]] = [(str(root), "", 0, [])]
+    while stack:
+        dir_path, rel_dir, depth, rules = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        if respect_gitignore and any(e.name == GITIGNORE_FILENAME for e in entries):
+            rules = rules + _load_gitignore(
+                Path(dir_path) / GITIGNORE_FILENAME, rel_dir
+            )
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SKIP_DIRS:
+                        continue
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+                    if rules and _is_ignored(rules, rel_path, is_dir=True):
+                        continue
+                    stack.append((entry.path, rel_path, depth + 1, rules))
+                elif entry.name == SKILL_FILENAME and entry.is_file():
+                    if rules and _is_ignored(rules, rel_path, is_dir=False):
+                        continue
+                    yield Path(entry.path)
+            except OSError:
+                continue
+
+
+def _git_skill_files(directory: Path, max_depth: int | None = None) -> list[Path] | None:
+    """List SKILL.md files from the git index of a checkout.
+
+    Tracked files and untracked files not excluded by .gitignore are listed,
+    except below SKIP_DIRS, as the walker does.
+
+    Returns:
+        The files, or None if the directory is not inside a git work tree,
+        git is unavailable or it lists no SKILL.md, so the caller walks the
+        directory instead.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "git",
+                "-C",
+                str(directory),
+                "ls-files",
+                "-z",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                "--",
+                f":(glob)**/{SKILL_FILENAME}",
+            ],
+            capture_output=True,
+            check=True,
+            timeout=GIT_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    files = []
+    for name in result.stdout.decode("utf-8", errors="surrogateescape").split("\0"):
+        if not name:
+            continue
+        *dirs, _ = name.split("/")
+        if max_depth is not None and len(dirs) > max_depth:
+            continue
+        if SKIP_DIRS.intersection(dirs):
+            continue
+        files.append(directory / name)
+    return files or None
+
+
+def discover_skills(
+    directory: Path,
+    max_depth: int | None = None,
+    use_git_index: bool = False,
+    workers: int | None = None,
+    use_index: bool = False,
+) -> list[Skill]:
     """Discover all skills in a directory.
 
+    SKILL.md files are parsed concurrently on a bounded thread pool; the
+    result is sorted by name (then path) regardless of completion order.
+
     Args:
         directory: Directory to search for skills.
+        max_depth: Deepest directory level (directory itself is 0) searched
+            for SKILL.md. None searches the whole tree.
+        use_git_index: List candidates from the git index when the directory
+            is a git checkout, falling back to a filesystem walk. Only for
+            checkouts made by add-skills: in a user's directory, the index
+            misses skills below paths that the repository ignores.
+        workers: Maximum number of parser threads. None picks a default
+            based on the CPU count; 1 parses serially, which is easier to
+            debug.
+        use_index: Reuse skills parsed by earlier runs from the on-disk
+            discovery index, re-parsing only SKILL.md files whose mtime,
+            size or inode changed.
 
     Returns:
         List of discovered Skill objects.
     """
-    skills = []
     directory = Path(directory).resolve()
 
     # Find all SKILL.md files
-    for skill_file in directory.rglob(SKILL_FILENAME):
-        skill = parse_skill(skill_file.parent)
-        if skill:
-            skills.append(skill)
+    skill_files = _git_skill_files(directory, max_depth) if use_git_index else None
+    if skill_files is None:
+        skill_files = list(_walk_skill_files(directory, max_depth))
 
-    return sorted(skills, key=lambda s: s.name)
+    if use_index:
+        parsed = _parse_with_index(directory, skill_files, workers)
+    else:
+        parsed = _parse_skills([f.parent for f in skill_files], workers)
+
+    skills = [skill for skill in parsed if skill]
+    return sorted(skills, key=lambda s: (s.name, str(s.path)))
+
+
+def _parse_skills(skill_dirs: list[Path], workers: int | None) -> list[Skill | None]:
+    """Parse skill directories, concurrently unless workers is 1."""
+    if workers is None:
+        workers = DEFAULT_WORKERS
+
+    if workers <= 1 or len(skill_dirs) <= 1:
+        return [parse_skill(skill_dir) for skill_dir in skill_dirs]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_skill, skill_dirs))
+
+
+def _parse_with_index(
+    directory: Path, skill_files: list[Path], workers: int | None
+) -> list[Skill | None]:
+    """Parse skills, reusing index entries whose stat data is unchanged.
+
+    Files are stat'ed before parsing, so an edit racing with the parse is
+    picked up by the next run. Entries for files that are gone are dropped.
+    """
+    entries = load_index(directory)
+    new_entries: dict[str, dict[str, Any]] = {}
+    parsed: list[Skill | None] = []
+    stale: list[tuple[str, list[int], Path]] = []
+
+    for skill_file in skill_files:
+        try:
+            stat = stat_key(os.stat(skill_file))
+        except OSError:
+            continue
+        key = str(skill_file)
+        entry = entries.get(key)
+        if entry is not None and entry.get("stat") == stat:
+            new_entries[key] = entry
+            data = entry.get("skill")
+            parsed.append(skill_from_dict(data) if data else None)
+        else:
+            stale.append((key, stat, skill_file.parent))
+
+    fresh = _parse_skills([skill_dir for _, _, skill_dir in stale], workers)
+    for (key, stat, _), skill in zip(stale, fresh, strict=True):
+        data = skill_to_dict(skill) if skill else None
+        # Skills with metadata JSON cannot hold are parsed on every run
+        if skill is None or data is not None:
+            new_entries[key] = {"stat": stat, "skill": data}
+        parsed.append(skill)
+
+    if new_entries != entries:
+        save_index(directory, new_entries)
+
+    return parsed
 
 
 def parse_skill(skill_dir: Path) -> Skill | None:
@@ -59,10 +364,11 @@ def parse_skill(skill_dir: Path) -> Skill | None:
     Returns:
         Skill object or None if invalid.
     """
-    skill_file = skill_dir / SKILL_FILENAME
+    # Loaded here: discovery served from the index never parses YAML
+    import frontmatter
+    import yaml
 
-    if not skill_file.exists():
-        return None
+    skill_file = skill_dir / SKILL_FILENAME
 
     try:
         with open(skill_file, encoding="utf-8") as f:
@@ -78,3 +384,72 @@ def parse_skill(skill_dir: Path) -> Skill | None:
         agents=_parse_string_list(post.get("agents")),
         metadata=dict(post.metadata),
     )
+
+
+def parse_skill_header(path: Path) -> Skill | None:
+    """Parse a skill from the frontmatter of its SKILL.md only.
+
+    Reading stops at the closing ``---``, so the body of the file is never
+    read. Cheaper than parse_skill when the instructions are not needed.
+
+    Args:
+        path: Directory containing SKILL.md, or a single-file skill.
+
+    Returns:
+        Skill object, or None if there is no readable SKILL.md or its
+        frontmatter is invalid. A single-file skill must have frontmatter.
+    """
+    skill_file = path / SKILL_FILENAME if path.is_dir() else path
+    lines = []
+    try:
+        with open(skill_file, encoding="utf-8-sig") as f:
+            if f.readline().rstrip() == "---":
+                for line in f:
+                    if line.rstrip() == "---":
+                        break
+                    lines.append(line)
+                else:
+                    lines = []  # Unterminated: not frontmatter
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not lines and skill_file == path:
+        return None
+
+    metadata = _parse_plain_frontmatter(lines)
+    if metadata is None:
+        # Loaded here: plain frontmatter never needs YAML
+        import yaml
+
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        try:
+            metadata = yaml.load("".join(lines), Loader=loader) or {}
+        except yaml.YAMLError:
+            return None
+        if not isinstance(metadata, dict):
+            return None
+
+    return Skill(
+        name=_parse_string(metadata.get("name"), path.name),
+        path=path,
+        description=_parse_string(metadata.get("description")),
+        globs=_parse_string_list(metadata.get("globs")),
+        agents=_parse_string_list(metadata.get("agents")),
+        metadata=metadata,
+    )
+
+
+def _parse_plain_frontmatter(lines: list[str]) -> dict[str, Any] | None:
+    """Parse frontmatter made only of ``key: plain text`` lines.
+
+    Returns:
+        The mapping YAML would produce, or None if any line needs YAML.
+    """
+    metadata: dict[str, Any] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        match = _PLAIN_LINE.fullmatch(line.rstrip("\r\n"))
+        if match is None or match[2].lower() in _YAML_WORDS:
+            return None
+        metadata[match[1]] = match[2]
+    return metadata
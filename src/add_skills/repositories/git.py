@@ -1,21 +1,84 @@
-"""Git operations for cloning repositories."""
+"""Git operations for cloning repositories.
 
+Commands are run through the backend returned by get_git_backend.
+"""
+
+import hashlib
+import os
+import shutil
 import tempfile
+import time
 from pathlib import Path
-
-from git import Repo
-from git.exc import GitCommandError
+from typing import Any
 
 from add_skills.exceptions import GitError
-from add_skills.models import SkillSource
+from add_skills.models import SkillSource, TransportOptions
+from add_skills.repositories.cache import (
+    directory_size,
+    file_lock,
+    get_cache_dir,
+    read_json_object,
+    write_json_atomic,
+)
+from add_skills.repositories.filesystem import SKILL_FILENAME, discover_skills
+from add_skills.repositories.git_backends import get_git_backend
+from add_skills.timings import span
+
+REPO_CACHE_MAX_BYTES_ENV = "ADD_SKILLS_REPO_CACHE_MAX_BYTES"
+DEFAULT_REPO_CACHE_MAX_BYTES = 2 * 1024**3
+MIRROR_STATE_FILE = "add-skills.json"
+
+
+def _git(
+    args: list[str], cwd: Path | None = None, options: TransportOptions | None = None
+) -> str:
+    """Run a git command, returning its output.
+
+    Raises:
+        GitError: If the command fails, times out or is cancelled.
+    """
+    with span(f"git {args[0]}", "git"):
+        return get_git_backend().run(args, cwd, options or TransportOptions())
+
 
+def _transfer_args(command: str, options: TransportOptions) -> list[str]:
+    """Return the start of a clone or fetch command line.
 
-def clone_repo(source: SkillSource, target_dir: Path | None = None) -> Path:
+    Progress is requested when a callback wants it, since git only
+    reports it to a terminal by default, and the extra transport
+    arguments are added.
+    """
+    args = [command]
+    if options.progress is not None:
+        args.append("--progress")
+    return [*args, *options.extra_args]
+
+
+def clone_repo(
+    source: SkillSource,
+    target_dir: Path | None = None,
+    use_cache: bool = False,
+    sparse: bool = False,
+    skill_name: str | None = None,
+    options: TransportOptions | None = None,
+) -> Path:
     """Clone a repository.
 
     Args:
         source: The skill source to clone.
         target_dir: Optional target directory. If None, uses a temp directory.
+        use_cache: Check out from a persistent mirror in the user cache,
+            updating it with an incremental fetch, instead of cloning from
+            the remote.
+        sparse: Use a blobless partial clone with sparse checkout so only
+            the source subpath, or the directory of ``skill_name``, is
+            downloaded. Takes precedence over ``use_cache``.
+        skill_name: Name of the single skill to materialize in sparse mode.
+        options: Timeout, git config overrides, extra clone/fetch arguments,
+            progress callback and cancellation event.
+
+    If ``source.commit`` is set, exactly that commit is checked out with a
+    shallow fetch by SHA, and ``sparse`` is ignored.
 
     Returns:
         Path to the cloned repository.
@@ -29,19 +92,25 @@ def clone_repo(source: SkillSource, target_dir: Path | None = None) -> Path:
     if target_dir is None:
         target_dir = Path(tempfile.mkdtemp(prefix="add-skills-"))
 
-    # Shallow clone for faster download
-    clone_kwargs = {
-        "depth": 1,
-        "single_branch": True,
-    }
+    options = options or TransportOptions()
+    if source.commit and not use_cache:
+        _clone_commit(source.clone_url, source.commit, target_dir, options)
+    elif sparse and not source.commit and (source.subpath or skill_name):
+        _sparse_clone(source, target_dir, skill_name, options)
+    elif use_cache:
+        _clone_from_cache(
+            source.clone_url, source.branch, target_dir, source.commit, options
+        )
+    else:
+        # Shallow clone for faster download
+        args = [*_transfer_args("clone", options), "--depth=1", "--single-branch"]
+        if source.branch:
+            args += ["--branch", source.branch]
 
-    if source.branch:
-        clone_kwargs["branch"] = source.branch
-
-    try:
-        Repo.clone_from(source.clone_url, target_dir, **clone_kwargs)
-    except GitCommandError as e:
-        raise GitError(f"Failed to clone repository: {e}") from e
+        try:
+            _git([*args, "--", source.clone_url, str(target_dir)], options=options)
+        except GitError as e:
+            raise GitError(f"Failed to clone repository: {e}") from e
 
     # If there's a subpath, return that directory
     if source.subpath:
@@ -51,3 +120,234 @@ def clone_repo(source: SkillSource, target_dir: Path | None = None) -> Path:
         return subpath
 
     return target_dir
+
+
+def get_transfer_size(repo_dir: Path) -> int:
+    """Return the size of the object store of a clone.
+
+    For a fresh clone this is the number of bytes received from the remote.
+    """
+    return directory_size(repo_dir / ".git" / "objects")
+
+
+def get_head_commit(repo_dir: Path) -> str | None:
+    """Return the SHA of the commit checked out in a clone, if it is one."""
+    # Only the clone itself, not a repository it happens to be inside
+    if not (repo_dir / ".git").exists():
+        return None
+    try:
+        return _git(["rev-parse", "--verify", "-q", "HEAD"], repo_dir).strip() or None
+    except GitError:
+        return None
+
+
+def _clone_commit(
+    url: str, commit: str, target_dir: Path, options: TransportOptions
+) -> None:
+    """Shallow-fetch a single commit by SHA and check it out."""
+    try:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        _git(["init", "-q"], target_dir)
+        _git(
+            [*_transfer_args("fetch", options), "--depth=1", "--no-tags", url, commit],
+            target_dir,
+            options,
+        )
+        _git(["checkout", "-q", "--detach", "FETCH_HEAD"], target_dir, options)
+    except GitError as e:
+        raise GitError(f"Failed to fetch commit {commit}: {e}") from e
+
+
+def _sparse_clone(
+    source: SkillSource,
+    target_dir: Path,
+    skill_name: str | None,
+    options: TransportOptions,
+) -> None:
+    """Partially clone a repository and materialize only what is needed.
+
+    Blobs are fetched on demand, so only files inside the sparse checkout
+    patterns are downloaded. To find the directory of a named skill, only
+    the SKILL.md files below the subpath are checked out first.
+    """
+    assert source.clone_url is not None
+    args = [
+        *_transfer_args("clone", options),
+        "--depth=1",
+        "--single-branch",
+        "--filter=blob:none",
+        "--no-checkout",
+        "--sparse",
+    ]
+    if source.branch:
+        args += ["--branch", source.branch]
+
+    subpath = (source.subpath or "").strip("/")
+    prefix = f"/{subpath}/" if subpath else "/"
+
+    # Checking out fetches the blobs, so it gets the transfer options too
+    checkout = ["checkout", "-q"]
+    if options.progress is not None:
+        checkout.append("--progress")
+
+    try:
+        _git([*args, "--", source.clone_url, str(target_dir)], options=options)
+
+        if skill_name:
+            _git(
+                ["sparse-checkout", "set", "--no-cone", f"{prefix}**/{SKILL_FILENAME}"],
+                target_dir,
+                options,
+            )
+            _git(checkout, target_dir, options)
+            skill = next(
+                (s for s in discover_skills(target_dir / subpath) if s.name == skill_name),
+                None,
+            )
+            if skill is None:
+                # Leave only the SKILL.md files so the caller reports the miss
+                return
+            prefix = f"/{skill.path.relative_to(target_dir.resolve()).as_posix()}/"
+
+        _git(["sparse-checkout", "set", "--no-cone", prefix], target_dir, options)
+        _git(checkout, target_dir, options)
+    except GitError as e:
+        raise GitError(f"Failed to clone repository: {e}") from e
+
+
+def get_repo_cache_dir() -> Path:
+    """Return the directory holding cached repository mirrors."""
+    return get_cache_dir() / "repos"
+
+
+def _mirror_key(url: str) -> str:
+    """Return the cache key for a clone URL."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_mirror_state(mirror: Path) -> dict[str, Any]:
+    """Read the bookkeeping file of a mirror."""
+    return read_json_object(mirror / MIRROR_STATE_FILE)
+
+
+def _write_mirror_state(mirror: Path, state: dict[str, Any]) -> None:
+    """Atomically write the bookkeeping file of a mirror."""
+    write_json_atomic(mirror / MIRROR_STATE_FILE, state)
+
+
+def _has_commit(repo_dir: Path, commit: str) -> bool:
+    """Check whether a repository already holds a commit."""
+    try:
+        _git(["cat-file", "-e", f"{commit}^{{commit}}"], repo_dir)
+    except GitError:
+        return False
+    return True
+
+
+def _clone_from_cache(
+    url: str,
+    branch: str | None,
+    target_dir: Path,
+    commit: str | None = None,
+    options: TransportOptions | None = None,
+) -> None:
+    """Update the cached mirror of a repository and check it out.
+
+    The mirror is a shallow bare repository. Fetches happen under a
+    per-mirror lock; a process that waited on the lock while another one
+    fetched the same ref reuses that fetch instead of repeating it. A
+    pinned commit is fetched by SHA only if the mirror does not have it.
+    """
+    cache_dir = get_repo_cache_dir()
+    key = _mirror_key(url)
+    mirror = cache_dir / f"{key}.git"
+    ref = commit or branch or "HEAD"
+    local_ref = f"refs/add-skills/{ref}"
+    options = options or TransportOptions()
+    fetch = [*_transfer_args("fetch", options), "--depth=1", "--no-tags"]
+
+    waiting_since = time.time()
+    with file_lock(cache_dir / f"{key}.lock"):
+        try:
+            if not (mirror / "HEAD").exists():
+                shutil.rmtree(mirror, ignore_errors=True)
+                _git(["init", "-q", "--bare", str(mirror)])
+                _git(["remote", "add", "origin", url], mirror)
+
+            state = _read_mirror_state(mirror)
+            fetched = state.setdefault("fetched", {})
+            if commit:
+                if not _has_commit(mirror, commit):
+                    _git([*fetch, "origin", commit], mirror, options)
+                _git(["update-ref", local_ref, commit], mirror)
+            elif fetched.get(ref, 0) < waiting_since:
+                _git([*fetch, "origin", f"+{ref}:{local_ref}"], mirror, options)
+                fetched[ref] = time.time()
+
+            # The local checkout only passes the options that still apply
+            local = TransportOptions(timeout=options.timeout, cancel=options.cancel)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            _git(["init", "-q"], target_dir)
+            _git(
+                ["fetch", "--depth=1", "--no-tags", mirror.as_uri(), local_ref],
+                target_dir,
+                local,
+            )
+            _git(["checkout", "-q", "--detach", "FETCH_HEAD"], target_dir, local)
+        except GitError as e:
+            raise GitError(f"Failed to clone repository: {e}") from e
+
+        state["url"] = url
+        state["last_used"] = time.time()
+        state["size"] = directory_size(mirror)
+        _write_mirror_state(mirror, state)
+
+    prune_repo_cache(keep=mirror)
+
+
+def prune_repo_cache(max_bytes: int | None = None, keep: Path | None = None) -> int:
+    """Evict least recently used mirrors until the cache fits its size cap.
+
+    Mirrors locked by another process are skipped.
+
+    Args:
+        max_bytes: Size cap in bytes. Defaults to ``ADD_SKILLS_REPO_CACHE_MAX_BYTES``
+            or 2 GiB.
+        keep: Mirror that must not be evicted.
+
+    Returns:
+        Number of bytes freed.
+    """
+    if max_bytes is None:
+        max_bytes = int(
+            os.environ.get(REPO_CACHE_MAX_BYTES_ENV, DEFAULT_REPO_CACHE_MAX_BYTES)
+        )
+
+    cache_dir = get_repo_cache_dir()
+    if not cache_dir.is_dir():
+        return 0
+
+    mirrors = []
+    for mirror in cache_dir.glob("*.git"):
+        state = _read_mirror_state(mirror)
+        size = state.get("size")
+        if not isinstance(size, int):
+            size = directory_size(mirror)
+        mirrors.append((state.get("last_used", 0), size, mirror))
+
+    total = sum(size for _, size, _ in mirrors)
+    freed = 0
+    for _, size, mirror in sorted(mirrors, key=lambda m: m[0]):
+        if total <= max_bytes:
+            break
+        if keep is not None and mirror == keep:
+            continue
+        lock_path = cache_dir / f"{mirror.stem}.lock"
+        with file_lock(lock_path, blocking=False) as acquired:
+            if not acquired:
+                continue
+            shutil.rmtree(mirror, ignore_errors=True)
+        total -= size
+        freed += size
+
+    return freed
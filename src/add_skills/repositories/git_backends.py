@@ -0,0 +1,235 @@
+"""Backends that run git commands.
+
+The default backend runs the system ``git`` in a subprocess, streaming its
+progress output and enforcing timeouts and cancellation. GitPython, if
+installed, can be selected instead; it also needs a git executable, which
+it finds on the PATH or through ``GIT_PYTHON_GIT_EXECUTABLE``.
+"""
+
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Protocol
+
+from add_skills.exceptions import GitError
+from add_skills.models import TransportOptions
+
+GIT_BACKEND_ENV = "ADD_SKILLS_GIT_BACKEND"
+POLL_INTERVAL_SECONDS = 0.1
+TERMINATE_GRACE_SECONDS = 2.0
+ERROR_CONTEXT_LINES = 10
+
+# git rewrites progress lines in place with carriage returns
+_LINE_BREAK = re.compile(rb"[\r\n]")
+
+
+class GitBackend(Protocol):
+    """Runs a git command and returns its standard output."""
+
+    def run(
+        self, args: list[str], cwd: Path | None, options: TransportOptions
+    ) -> str:
+        """Run ``git <args>`` in ``cwd``.
+
+        Raises:
+            GitError: If git fails, times out or is cancelled.
+        """
+        ...
+
+
+def _config_args(options: TransportOptions) -> list[str]:
+    """Return the ``-c KEY=VALUE`` arguments for the configured overrides."""
+    args = []
+    for item in options.config:
+        args += ["-c", item]
+    return args
+
+
+class SubprocessGit:
+    """Runs the system git executable."""
+
+    def __init__(self, executable: str = "git") -> None:
+        self.executable = executable
+
+    def run(
+        self, args: list[str], cwd: Path | None, options: TransportOptions
+    ) -> str:
+        command = [self.executable, *_config_args(options), *args]
+        # Fail instead of waiting for credentials nobody will type
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        try:
+            proc = subprocess.Popen(
+                command,
+                cwd=cwd,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                # Own process group, so helpers like git-remote-https are
+                # terminated along with git
+                start_new_session=os.name == "posix",
+            )
+        except FileNotFoundError as e:
+            raise GitError(
+                f"git not found: '{self.executable}' is not on the PATH"
+            ) from e
+        except OSError as e:
+            raise GitError(f"Cannot run git: {e}") from e
+
+        out, err = proc.stdout, proc.stderr
+        assert out is not None and err is not None
+        stdout: list[bytes] = []
+        stderr: deque[str] = deque(maxlen=ERROR_CONTEXT_LINES)
+        readers = [
+            threading.Thread(target=lambda: stdout.append(out.read())),
+            threading.Thread(target=self._read_stderr, args=(err, stderr, options)),
+        ]
+        for reader in readers:
+            reader.daemon = True
+            reader.start()
+
+        deadline = None
+        if options.timeout is not None:
+            deadline = time.monotonic() + options.timeout
+        try:
+            while proc.poll() is None:
+                if options.cancel is not None and options.cancel.is_set():
+                    self._stop(proc)
+                    raise GitError(f"git {args[0]} cancelled")
+                if deadline is not None and time.monotonic() > deadline:
+                    self._stop(proc)
+                    raise GitError(
+                        f"git {args[0]} timed out after {options.timeout:g}s"
+                    )
+                try:
+                    proc.wait(POLL_INTERVAL_SECONDS)
+                except subprocess.TimeoutExpired:
+                    pass
+        except BaseException:
+            self._stop(proc)
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+            out.close()
+            err.close()
+
+        if proc.returncode != 0:
+            detail = "\n".join(stderr) or f"exit status {proc.returncode}"
+            raise GitError(f"git {args[0]} failed: {detail}")
+        return b"".join(stdout).decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _read_stderr(
+        stream: IO[bytes], lines: deque[str], options: TransportOptions
+    ) -> None:
+        """Split stderr into lines, passing each one to the progress callback."""
+        pending = b""
+        while chunk := stream.read1(8192):  # type: ignore[attr-defined]
+            *complete, pending = _LINE_BREAK.split(pending + chunk)
+            for raw in complete:
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                lines.append(line)
+                if options.progress is not None:
+                    options.progress(line)
+        if pending.strip():
+            lines.append(pending.decode("utf-8", errors="replace").strip())
+
+    @staticmethod
+    def _stop(proc: subprocess.Popen[bytes]) -> None:
+        """Terminate git and its helpers, killing them if they linger."""
+        if proc.poll() is not None:
+            return
+        if os.name == "posix":
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except OSError:
+                pass
+        else:
+            proc.terminate()
+        try:
+            proc.wait(TERMINATE_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            if os.name == "posix":
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+            else:
+                proc.kill()
+            proc.wait()
+
+
+class GitPythonGit:
+    """Runs git through GitPython.
+
+    Progress is not streamed and cancellation is not supported; timeouts
+    are enforced by GitPython.
+    """
+
+    def run(
+        self, args: list[str], cwd: Path | None, options: TransportOptions
+    ) -> str:
+        try:
+            from git import Git
+            from git.exc import CommandError
+        except ModuleNotFoundError as e:
+            raise GitError(
+                "GitPython is not installed (pip install 'add-skills[gitpython]')"
+            ) from e
+        except ImportError as e:
+            # GitPython refuses to import when it cannot find git
+            raise GitError(f"Cannot use GitPython: {e}") from e
+
+        executable = Git.GIT_PYTHON_GIT_EXECUTABLE
+        if not executable:
+            raise GitError("git not found: set GIT_PYTHON_GIT_EXECUTABLE")
+        command = [executable, *_config_args(options), *args]
+        try:
+            output = Git(cwd).execute(
+                command, kill_after_timeout=options.timeout, stdout_as_string=True
+            )
+        except CommandError as e:
+            # Also raised as GitCommandNotFound when git cannot be run
+            detail = str(e.stderr).strip() or e
+            raise GitError(f"git {args[0]} failed: {detail}") from e
+        return str(output)
+
+
+BACKENDS: dict[str, type[GitBackend]] = {
+    "subprocess": SubprocessGit,
+    "gitpython": GitPythonGit,
+}
+
+_backends: dict[str, GitBackend] = {}
+_backend_lock = threading.Lock()
+
+
+def get_git_backend() -> GitBackend:
+    """Return the git backend selected by ``ADD_SKILLS_GIT_BACKEND``.
+
+    The variable names one of BACKENDS; the default is the system git. It
+    is read on every call, since the daemon runs each invocation with its
+    client's environment, and each backend is created once per process.
+
+    Raises:
+        GitError: If ``ADD_SKILLS_GIT_BACKEND`` names an unknown backend.
+    """
+    name = os.environ.get(GIT_BACKEND_ENV, "subprocess")
+    with _backend_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            if name not in BACKENDS:
+                raise GitError(
+                    f"Unknown git backend '{name}' in {GIT_BACKEND_ENV} "
+                    f"(expected one of: {', '.join(BACKENDS)})"
+                )
+            backend = _backends[name] = BACKENDS[name]()
+        return backend
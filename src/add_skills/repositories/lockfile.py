@@ -0,0 +1,140 @@
+"""Lockfile recording installed skills and the commits they came from."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from add_skills.exceptions import LockfileError
+from add_skills.models import (
+    InstallMode,
+    InstallScope,
+    LockEntry,
+    SkillSource,
+    SourceType,
+)
+from add_skills.repositories.cache import file_lock, get_data_dir
+
+LOCKFILE_NAME = "skills-lock.json"
+LOCKFILE_VERSION = 1
+
+
+def get_lockfile_path(scope: InstallScope, project_dir: Path | None = None) -> Path:
+    """Return the lockfile for an install scope.
+
+    Local installs are locked in the project directory, so the lockfile
+    can be committed; global installs in the user data directory.
+    """
+    if scope == InstallScope.GLOBAL:
+        return get_data_dir() / LOCKFILE_NAME
+    return (project_dir or Path.cwd()) / LOCKFILE_NAME
+
+
+def lock_key(agent: str, name: str) -> str:
+    """Return the lockfile key of a skill installed for an agent."""
+    return f"{agent}/{name}"
+
+
+def lock_source(source: SkillSource, scope: InstallScope) -> str:
+    """Return the source string to record for a skill source.
+
+    Local paths are made relative to the project for project installs, so
+    a committed lockfile works in other checkouts.
+    """
+    if source.source_type != SourceType.LOCAL or source.path is None:
+        return source.original
+    if scope == InstallScope.LOCAL:
+        relative = Path(os.path.relpath(source.path)).as_posix()
+        return relative if relative.startswith(".") else f"./{relative}"
+    return str(source.path)
+
+
+def load_lockfile(path: Path) -> dict[str, LockEntry]:
+    """Read a lockfile.
+
+    Returns:
+        Entries by lock_key. Empty if the lockfile does not exist.
+
+    Raises:
+        LockfileError: If the lockfile is unreadable or malformed.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        raise LockfileError(f"Cannot read {path}: {e}") from e
+
+    if not isinstance(data, dict) or data.get("version") != LOCKFILE_VERSION:
+        raise LockfileError(f"Unsupported lockfile format in {path}")
+
+    entries = {}
+    for key, value in (data.get("skills") or {}).items():
+        try:
+            entry = LockEntry(
+                name=value["name"],
+                agent=value["agent"],
+                source=value["source"],
+                path=value["path"],
+                hash=value["hash"],
+                commit=value.get("commit"),
+                mode=InstallMode(value.get("mode", InstallMode.COPY.value)),
+            )
+        except (TypeError, KeyError, ValueError) as e:
+            raise LockfileError(f"Invalid lockfile entry '{key}' in {path}") from e
+        entries[key] = entry
+    return entries
+
+
+def _entry_to_dict(entry: LockEntry) -> dict[str, Any]:
+    return {
+        "name": entry.name,
+        "agent": entry.agent,
+        "source": entry.source,
+        "path": entry.path,
+        "commit": entry.commit,
+        "hash": entry.hash,
+        "mode": entry.mode.value,
+    }
+
+
+def save_lockfile(path: Path, entries: dict[str, LockEntry]) -> None:
+    """Atomically write a lockfile, with keys sorted for stable diffs.
+
+    Raises:
+        LockfileError: If the lockfile cannot be written.
+    """
+    data = {
+        "version": LOCKFILE_VERSION,
+        "skills": {key: _entry_to_dict(entries[key]) for key in sorted(entries)},
+    }
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        raise LockfileError(f"Cannot write {path}: {e}") from e
+
+
+def update_lockfile(path: Path, entries: list[LockEntry]) -> None:
+    """Add or replace entries in a lockfile, keeping the others.
+
+    The lockfile is read and rewritten while holding a lock on the hidden
+    ``.<name>.lock`` file next to it, so concurrent installs into the same
+    scope keep each other's entries.
+
+    Raises:
+        LockfileError: If the lockfile cannot be locked, read or written.
+    """
+    try:
+        with file_lock(path.with_name(f".{path.name}.lock")):
+            locked = load_lockfile(path)
+            for entry in entries:
+                locked[lock_key(entry.agent, entry.name)] = entry
+            save_lockfile(path, locked)
+    except OSError as e:
+        raise LockfileError(f"Cannot lock {path}: {e}") from e
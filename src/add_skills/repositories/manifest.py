@@ -0,0 +1,55 @@
+"""Manifest files listing sources to install in one batch."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from add_skills.exceptions import ManifestError
+from add_skills.models import ManifestEntry
+
+
+def _string_list(value: Any, what: str) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return list(value)
+    raise ManifestError(f"{what} must be a string or a list of strings")
+
+
+def load_manifest(path: Path) -> tuple[list[ManifestEntry], list[str]]:
+    """Read a manifest.
+
+    The manifest is a JSON object with a ``sources`` list and optional
+    default ``agents``. Each source is a source string, or an object with
+    ``source`` and optional ``skills`` and ``agents``.
+
+    Returns:
+        The entries and the default agent names.
+
+    Raises:
+        ManifestError: If the file is unreadable or malformed.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Cannot read {path}: {e}") from e
+
+    if not isinstance(data, dict) or not isinstance(data.get("sources"), list):
+        raise ManifestError(f"{path} must be an object with a 'sources' list")
+
+    agents = _string_list(data.get("agents", []), "'agents'")
+    entries = []
+    for i, item in enumerate(data["sources"]):
+        if isinstance(item, str):
+            item = {"source": item}
+        if not isinstance(item, dict) or not isinstance(item.get("source"), str):
+            raise ManifestError(f"Source {i} must be a string or have a 'source'")
+        entries.append(
+            ManifestEntry(
+                source=item["source"],
+                skills=_string_list(item.get("skills", []), f"Source {i} 'skills'"),
+                agents=_string_list(item.get("agents", []), f"Source {i} 'agents'"),
+            )
+        )
+    return entries, agents
@@ -0,0 +1,108 @@
+"""Resolving remote branches to commits without fetching them."""
+
+import re
+import time
+
+from add_skills.defaults import DEFAULT_REF_TTL_SECONDS
+from add_skills.exceptions import GitError
+from add_skills.models import TransportOptions
+from add_skills.repositories.cache import (
+    file_lock,
+    get_cache_dir,
+    read_json_object,
+    write_json_atomic,
+)
+
+REF_CACHE_FILE = "refs.json"
+REF_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+_SHA = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+
+def resolve_commit(
+    url: str,
+    branch: str | None,
+    ttl: float = DEFAULT_REF_TTL_SECONDS,
+    options: TransportOptions | None = None,
+) -> str:
+    """Return the commit a remote branch, tag or HEAD points to.
+
+    The remote is asked with ``git ls-remote``, which transfers no objects.
+    Answers are cached for ``ttl`` seconds, so runs in quick succession do
+    not ask again.
+
+    Args:
+        url: Clone URL of the repository.
+        branch: Branch or tag name. None resolves the default branch.
+        ttl: Seconds a cached answer is reused. 0 always asks the remote.
+        options: Timeout and git config overrides for the query.
+
+    Raises:
+        GitError: If the remote cannot be queried or has no such ref.
+    """
+    if branch and _SHA.fullmatch(branch):
+        return branch
+    ref = branch or "HEAD"
+    key = f"{url} {ref}"
+    cache_dir = get_cache_dir()
+    cache_path = cache_dir / REF_CACHE_FILE
+
+    now = time.time()
+    cached = read_json_object(cache_path).get(key)
+    if isinstance(cached, dict) and now - cached.get("resolved_at", 0) < ttl:
+        return cached["commit"]
+
+    # The git backend is only loaded when the remote is asked
+    from add_skills.repositories.git_backends import get_git_backend
+    from add_skills.timings import span
+
+    try:
+        with span("git ls-remote", "git"):
+            # A pattern only matches whole trailing path components, so
+            # the peeled line of an annotated tag needs its own pattern
+            output = get_git_backend().run(
+                ["ls-remote", "--", url, ref, f"{ref}^{{}}"],
+                None,
+                options or TransportOptions(),
+            )
+    except GitError as e:
+        raise GitError(f"Failed to resolve {ref}: {e}") from e
+    commit = _pick_ref(output, ref)
+    if commit is None:
+        raise GitError(f"Ref not found in repository: {ref}")
+
+    try:
+        with file_lock(cache_dir / "refs.lock"):
+            refs = {
+                k: v
+                for k, v in read_json_object(cache_path).items()
+                if isinstance(v, dict)
+                and now - v.get("resolved_at", 0) < REF_CACHE_MAX_AGE_SECONDS
+            }
+            refs[key] = {"commit": commit, "resolved_at": now}
+            write_json_atomic(cache_path, refs)
+    except OSError:
+        # The cache is only an optimisation
+        pass
+    return commit
+
+
+def _pick_ref(ls_remote_output: str, ref: str) -> str | None:
+    """Pick the commit for a ref from ``git ls-remote`` output.
+
+    Branches win over tags, and an annotated tag resolves to the commit
+    it points to.
+    """
+    commits = {}
+    for line in ls_remote_output.splitlines():
+        sha, _, name = line.partition("\t")
+        commits[name] = sha
+    for name in (
+        ref,
+        f"refs/heads/{ref}",
+        f"refs/tags/{ref}^{{}}",
+        f"refs/tags/{ref}",
+    ):
+        if name in commits:
+            return commits[name]
+    return None
@@ -1,21 +1,50 @@
 """Registry fetching from remote."""
 
+import codecs
+import hashlib
+import itertools
 import json
-import urllib.request
-from urllib.error import HTTPError, URLError
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+from urllib.parse import urljoin
 
+from add_skills.defaults import DEFAULT_TTL_SECONDS
 from add_skills.exceptions import RegistryFetchError, RegistryParseError
 from add_skills.models import RegistryEntry
+from add_skills.repositories.cache import get_cache_dir
 
 REGISTRY_URL = "https://raw.githubusercontent.com/ludo-technologies/add-skills/main/registry.json"
 TIMEOUT_SECONDS = 10
+CHUNK_SIZE = 64 * 1024
+REFRESH_WAIT_SECONDS = 2.0
 
+# Background refreshes started by stale-while-revalidate
+_refreshes: list[threading.Thread] = []
 
-def fetch_registry(url: str = REGISTRY_URL) -> list[RegistryEntry]:
+
+def fetch_registry(
+    url: str = REGISTRY_URL,
+    ttl: float = DEFAULT_TTL_SECONDS,
+    stale_while_revalidate: bool = False,
+    offline: bool = False,
+    use_cache: bool = True,
+) -> list[RegistryEntry]:
     """Fetch the skill registry from the remote URL.
 
+    See iter_registry for the supported formats and caching behaviour.
+
     Args:
         url: The URL to fetch the registry from.
+        ttl: Seconds a cached copy is considered fresh.
+        stale_while_revalidate: Return an expired cached copy immediately
+            and refresh the cache in a background thread.
+        offline: Only use the cached copy.
+        use_cache: Read and write the local cache.
 
     Returns:
         A list of RegistryEntry objects.
@@ -24,44 +53,552 @@ def fetch_registry(url: str = REGISTRY_URL) -> list[RegistryEntry]:
         RegistryFetchError: If the registry cannot be fetched.
         RegistryParseError: If the registry JSON is invalid.
     """
+    return list(
+        iter_registry(
+            url,
+            ttl=ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            offline=offline,
+            use_cache=use_cache,
+        )
+    )
+
+
+def iter_registry(
+    url: str = REGISTRY_URL,
+    ttl: float = DEFAULT_TTL_SECONDS,
+    stale_while_revalidate: bool = False,
+    offline: bool = False,
+    use_cache: bool = True,
+) -> Iterator[RegistryEntry]:
+    """Stream registry entries as they are parsed.
+
+    The registry may be a JSON array of entries, newline-delimited JSON
+    (one entry object per line) or a shard manifest
+    ``{"shards": ["part-1.ndjson", ...]}`` whose shard URLs are resolved
+    relative to ``url`` and read in order. Memory use does not grow with
+    the size of the registry.
+
+    Each document is cached together with its ETag and Last-Modified
+    validators. A cached copy younger than ``ttl`` is used as is; an older
+    one is revalidated with a conditional request. If the network fails,
+    the cached copy is used instead. A download is cached once it has been
+    read and validated to the end. A background refresh is a daemon thread;
+    wait_for_refresh() lets it finish before the process exits.
+
+    Args:
+        url: The URL to fetch the registry from.
+        ttl: Seconds a cached copy is considered fresh.
+        stale_while_revalidate: Return an expired cached copy immediately
+            and refresh the cache in a background thread.
+        offline: Only use the cached copy.
+        use_cache: Read and write the local cache.
+
+    Yields:
+        RegistryEntry objects in registry order.
+
+    Raises:
+        RegistryFetchError: If the registry cannot be fetched.
+        RegistryParseError: If the registry JSON is invalid.
+    """
+    options = _FetchOptions(
+        ttl, stale_while_revalidate, offline, use_cache, get_cache_dir()
+    )
+    yield from _iter_document(url, options, itertools.count(), allow_shards=True)
+
+
+def get_fresh_cache_path(
+    url: str = REGISTRY_URL, ttl: float = DEFAULT_TTL_SECONDS
+) -> Path | None:
+    """Return the cached copy of a registry document if it is still fresh.
+
+    iter_registry reads such a copy as is, without a request, so entries
+    parsed from it stay valid while the file is unchanged. Shards of a
+    shard manifest are cached separately and not checked.
+
+    Returns:
+        Path to the cached body, or None if there is no copy younger
+        than ``ttl``.
+    """
+    meta, body_path = _load_cached(url, get_cache_dir())
+    if meta is None or time.time() - meta.get("fetched_at", 0) >= ttl:
+        return None
+    return body_path
+
+
+def wait_for_refresh(timeout: float = REFRESH_WAIT_SECONDS) -> None:
+    """Wait up to ``timeout`` seconds in total for background refreshes.
+
+    A refresh still running afterwards is abandoned when the process
+    exits, leaving the stale copy in place.
+    """
+    deadline = time.monotonic() + timeout
+    while _refreshes:
+        _refreshes[0].join(max(deadline - time.monotonic(), 0))
+        if _refreshes and _refreshes[0].is_alive():
+            return
+
+
+class _FetchOptions:
+    """Caching options shared by a registry document and its shards.
+
+    The cache directory is resolved once, so a background refresh keeps
+    using it when a daemon later runs an invocation with another
+    environment.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_while_revalidate: bool,
+        offline: bool,
+        use_cache: bool,
+        cache_dir: Path,
+    ) -> None:
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.offline = offline
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+
+
+def _iter_document(
+    url: str, options: _FetchOptions, counter: Iterator[int], allow_shards: bool
+) -> Iterator[RegistryEntry]:
+    """Stream the entries of one registry document (or its shards)."""
+    body = _open_body(url, options)
     try:
-        with urllib.request.urlopen(url, timeout=TIMEOUT_SECONDS) as response:
-            data = response.read().decode("utf-8")
+        reader = _JsonStreamReader(body)
+        is_object_stream = reader.peek() == "{"
+        values = _iter_values(reader)
+        try:
+            for i, value in enumerate(values):
+                if i == 0 and is_object_stream and _is_shard_manifest(value):
+                    if not allow_shards:
+                        raise RegistryParseError("Shards must not be shard manifests")
+                    body.commit()
+                    for shard in value["shards"]:
+                        yield from _iter_document(
+                            urljoin(url, shard), options, counter, allow_shards=False
+                        )
+                    return
+                yield _validate_entry(next(counter), value)
+        except GeneratorExit:
+            # The consumer stopped early, e.g. at a result limit: validate
+            # the rest of a download so it is still cached
+            if body.is_download:
+                try:
+                    for value in values:
+                        _validate_entry(next(counter), value)
+                    body.commit()
+                except (RegistryFetchError, RegistryParseError):
+                    pass
+            raise
+        body.commit()
+    finally:
+        body.close()
+
+
+def _is_shard_manifest(value: Any) -> bool:
+    """Check whether a top-level JSON object is a shard manifest."""
+    return (
+        isinstance(value, dict)
+        and "name" not in value
+        and isinstance(value.get("shards"), list)
+        and all(isinstance(shard, str) for shard in value["shards"])
+    )
+
+
+def _validate_entry(i: int, entry: Any) -> RegistryEntry:
+    """Build a RegistryEntry from a parsed JSON value.
+
+    Raises:
+        RegistryParseError: If the value is not a valid entry.
+    """
+    if not isinstance(entry, dict):
+        raise RegistryParseError(
+            f"Entry {i} must be an object, got {type(entry).__name__}"
+        )
+
+    missing = [key for key in ("name", "repo") if key not in entry]
+    if missing:
+        raise RegistryParseError(
+            f"Entry {i} missing required fields: {', '.join(missing)}"
+        )
+    for key in ("name", "repo"):
+        if not isinstance(entry[key], str):
+            raise RegistryParseError(f"Entry {i} field {key} must be a string")
+
+    # Optional fields are coerced, so one sloppy record does not fail the load
+    description = entry.get("description")
+    tags = entry.get("tags")
+    return RegistryEntry(
+        name=entry["name"],
+        repo=entry["repo"],
+        description=description if isinstance(description, str) else "",
+        tags=(
+            [tag for tag in tags if isinstance(tag, str)]
+            if isinstance(tags, list)
+            else []
+        ),
+    )
+
+
+class _JsonStreamReader:
+    """Decodes consecutive JSON values from a byte stream, chunk by chunk."""
+
+    def __init__(self, stream: "_RegistryBody") -> None:
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk; return False at end of stream."""
+        if self._eof:
+            return False
+        data = self._stream.read(CHUNK_SIZE)
+        try:
+            text = self._decoder.decode(data, final=not data)
+        except UnicodeDecodeError as e:
+            raise RegistryParseError(f"Invalid JSON: {e}") from e
+        if not data:
+            self._eof = True
+        if self._pos > CHUNK_SIZE:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        self._buffer += text
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at the end."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def consume(self) -> None:
+        """Skip the character returned by peek."""
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise RegistryParseError(f"Invalid JSON: {e.msg}") from e
+            # A number may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and not isinstance(
+                value, (dict, list, str)
+            ):
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_values(reader: _JsonStreamReader) -> Iterator[Any]:
+    """Yield the elements of a JSON array, or a sequence of JSON values."""
+    first = reader.peek()
+    if first == "[":
+        reader.consume()
+        if reader.peek() == "]":
+            reader.consume()
+        else:
+            while True:
+                yield reader.read_value()
+                separator = reader.peek()
+                reader.consume()
+                if separator == "]":
+                    break
+                if separator != ",":
+                    raise RegistryParseError("Invalid JSON: expected ',' or ']'")
+        if reader.peek():
+            raise RegistryParseError("Invalid JSON: extra data after array")
+    elif first == "{":
+        while reader.peek():
+            yield reader.read_value()
+    elif first:
+        raise RegistryParseError(
+            "Registry must be a JSON array, newline-delimited JSON or a shard manifest"
+        )
+    else:
+        raise RegistryParseError("Invalid JSON: empty document")
+
+
+class _RegistryBody:
+    """A registry document being read, from the network or the cache.
+
+    Network downloads are copied to a temporary cache file as they are
+    read; commit() makes that file the cached copy.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        meta_path: Path | None = None,
+        meta: dict[str, Any] | None = None,
+        previous: Path | None = None,
+    ) -> None:
+        self.stream = stream
+        self._meta_path = meta_path
+        self._meta = meta
+        self._previous = previous
+        self._sha256 = hashlib.sha256()
+        self._tmp_path: Path | None = None
+        self._tmp_file: BinaryIO | None = None
+        if meta_path is not None:
+            try:
+                meta_path.parent.mkdir(parents=True, exist_ok=True)
+                self._tmp_path = meta_path.with_suffix(
+                    f".{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                self._tmp_file = open(self._tmp_path, "wb")
+            except OSError:
+                self._tmp_path = None
+
+    @property
+    def is_download(self) -> bool:
+        """Whether this is a download that commit() would cache."""
+        return self._tmp_file is not None
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            data = self.stream.read(size)
+        except Exception as e:
+            if not _is_read_error(e):
+                raise
+            raise RegistryFetchError(f"Failed to read registry: {e}") from e
+        # http.client ends a body cut short of its Content-Length quietly
+        if not data and size and getattr(self.stream, "length", None):
+            raise RegistryFetchError("Failed to read registry: connection closed early")
+        if self._tmp_file is not None:
+            try:
+                self._tmp_file.write(data)
+                self._sha256.update(data)
+            except OSError:
+                self._discard()
+        return data
+
+    def _discard(self) -> None:
+        if self._tmp_file is not None:
+            self._tmp_file.close()
+            self._tmp_file = None
+        if self._tmp_path is not None:
+            self._tmp_path.unlink(missing_ok=True)
+            self._tmp_path = None
+
+    def commit(self) -> None:
+        """Store a fully read download as the cached copy.
+
+        The body is stored under its checksum before the metadata that
+        names it replaces the old metadata, so readers never pair the
+        validators of one download with the body of another.
+        """
+        if self._tmp_file is None or self._tmp_path is None:
+            return
+        assert self._meta_path is not None and self._meta is not None
+        # Drain anything the parser did not need
+        while self.read(CHUNK_SIZE):
+            pass
+        if self._tmp_file is None:
+            return
+        self._tmp_file.close()
+        self._tmp_file = None
+        digest = self._sha256.hexdigest()
+        body_path = self._meta_path.with_suffix(f".{digest[:16]}.body")
+        try:
+            os.replace(self._tmp_path, body_path)
+        except OSError:
+            self._discard()
+            return
+        self._tmp_path = None
+        meta = {**self._meta, "body": body_path.name, "sha256": digest}
+        if not _write_meta(self._meta_path, meta):
+            return
+        if self._previous is not None and self._previous != body_path:
+            # Readers that already opened it keep reading it
+            self._previous.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._discard()
+        self.stream.close()
+
+
+def _is_read_error(error: Exception) -> bool:
+    """Check whether reading a body failed, e.g. on a timeout or a drop."""
+    if isinstance(error, OSError):
+        return True
+    # Loaded by urllib for downloads; not imported for cached reads
+    http_client = sys.modules.get("http.client")
+    return http_client is not None and isinstance(error, http_client.HTTPException)
+
+
+def _open_body(url: str, options: _FetchOptions) -> _RegistryBody:
+    """Open a registry document according to the caching options."""
+    if not options.use_cache:
+        response, _ = _request(url)
+        assert response is not None
+        return _RegistryBody(response)
+
+    meta, body_path = _load_cached(url, options.cache_dir)
+
+    if options.offline:
+        if meta is None:
+            raise RegistryFetchError("No cached registry available offline")
+        return _open_cached(body_path)
+
+    if meta is not None:
+        age = time.time() - meta.get("fetched_at", 0)
+        if age < options.ttl:
+            return _open_cached(body_path)
+        if options.stale_while_revalidate:
+            thread = threading.Thread(
+                target=_refresh_quietly,
+                args=(url, options.cache_dir),
+                name="registry-refresh",
+                daemon=True,
+            )
+            _refreshes.append(thread)
+            thread.start()
+            return _open_cached(body_path)
+
+    try:
+        response, response_headers = _request(url, _conditional_headers(meta))
+    except RegistryFetchError:
+        if meta is None:
+            raise
+        return _open_cached(body_path)
+
+    if response is None:
+        if meta is None:
+            raise RegistryFetchError("Server sent 304 Not Modified without a cached copy")
+        meta["fetched_at"] = time.time()
+        _write_meta(_meta_path(url, options.cache_dir), meta)
+        return _open_cached(body_path)
+
+    new_meta = {
+        "url": url,
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+    }
+    return _RegistryBody(
+        response,
+        _meta_path(url, options.cache_dir),
+        new_meta,
+        body_path if meta is not None else None,
+    )
+
+
+def _open_cached(body_path: Path | None) -> _RegistryBody:
+    """Open a cached registry body."""
+    assert body_path is not None
+    try:
+        return _RegistryBody(open(body_path, "rb"))
+    except OSError as e:
+        raise RegistryFetchError(f"Failed to read cached registry: {e}") from e
+
+
+def _conditional_headers(meta: dict[str, Any] | None) -> dict[str, str]:
+    """Return revalidation headers for cached metadata."""
+    headers = {}
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _request(url: str, headers: dict[str, str] | None = None) -> tuple[Any, Any]:
+    """Open a GET request.
+
+    Returns:
+        The open response (None for 304 Not Modified) and its headers.
+
+    Raises:
+        RegistryFetchError: On HTTP errors, connection failures and timeouts.
+    """
+    # http.client is slow to import and unused when the cache is fresh
+    import urllib.request
+    from urllib.error import HTTPError, URLError
+
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        response = urllib.request.urlopen(request, timeout=TIMEOUT_SECONDS)
     except HTTPError as e:
+        if e.code == 304:
+            return None, e.headers
         raise RegistryFetchError(f"HTTP error {e.code}: {e.reason}") from e
     except URLError as e:
         raise RegistryFetchError(f"Failed to connect: {e.reason}") from e
     except TimeoutError as e:
         raise RegistryFetchError("Request timed out") from e
+    return response, response.headers
+
 
+def _refresh_quietly(url: str, cache_dir: Path) -> None:
+    """Background revalidation; failures leave the stale copy in place."""
+    options = _FetchOptions(0, False, False, True, cache_dir)
     try:
-        entries = json.loads(data)
-    except json.JSONDecodeError as e:
-        raise RegistryParseError(f"Invalid JSON: {e}") from e
-
-    if not isinstance(entries, list):
-        raise RegistryParseError("Registry must be a JSON array")
-
-    result = []
-    for i, entry in enumerate(entries):
-        if not isinstance(entry, dict):
-            raise RegistryParseError(
-                f"Entry {i} must be an object, got {type(entry).__name__}"
-            )
+        for _ in _iter_document(url, options, itertools.count(), allow_shards=True):
+            pass
+    except (RegistryFetchError, RegistryParseError, OSError):
+        pass
+    finally:
+        _refreshes.remove(threading.current_thread())
 
-        missing = [key for key in ("name", "repo") if key not in entry]
-        if missing:
-            raise RegistryParseError(
-                f"Entry {i} missing required fields: {', '.join(missing)}"
-            )
 
-        result.append(
-            RegistryEntry(
-                name=entry["name"],
-                repo=entry["repo"],
-                description=entry.get("description", ""),
-                tags=entry.get("tags", []),
-            )
-        )
+def _meta_path(url: str, cache_dir: Path) -> Path:
+    """Return the metadata cache file for a registry URL.
+
+    Bodies are stored next to it as ``<key>.<checksum>.body``.
+    """
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    return cache_dir / "registry" / f"{key}.json"
+
 
-    return result
+def _load_cached(
+    url: str, cache_dir: Path
+) -> tuple[dict[str, Any] | None, Path | None]:
+    """Return the cached metadata for a URL and the body it names.
+
+    Both are None if there is no complete cached copy.
+    """
+    meta_path = _meta_path(url, cache_dir)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(meta, dict) or meta.get("url") != url:
+        return None, None
+    name = meta.get("body")
+    if not isinstance(name, str) or Path(name).name != name:
+        return None, None
+    body_path = meta_path.parent / name
+    if not body_path.exists():
+        return None, None
+    return meta, body_path
+
+
+def _write_meta(meta_path: Path, meta: dict[str, Any]) -> bool:
+    """Atomically write cache metadata (best effort); False on failure."""
+    tmp_path = meta_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+    except OSError:
+        return False
+    return True
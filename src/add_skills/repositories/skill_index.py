@@ -0,0 +1,164 @@
+"""Persistent indexes of parsed skills.
+
+Local sources are indexed by SKILL.md stat data. Remote sources are
+indexed by commit, whose contents never change.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from add_skills.models import Skill
+from add_skills.repositories.cache import get_cache_dir, load_memoized
+
+INDEX_VERSION = 1
+
+
+def get_index_path(directory: Path) -> Path:
+    """Return the index file for a discovery root."""
+    key = hashlib.sha256(str(directory).encode("utf-8")).hexdigest()[:16]
+    return get_cache_dir() / "discovery" / f"{key}.json"
+
+
+def stat_key(stat: os.stat_result) -> list[int]:
+    """Return the fields that identify an unchanged file."""
+    return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+
+def skill_to_dict(skill: Skill) -> dict[str, Any] | None:
+    """Serialize a skill, or return None if its metadata is not JSON-safe."""
+    data = {
+        "name": skill.name,
+        "path": str(skill.path),
+        "description": skill.description,
+        "globs": skill.globs,
+        "agents": skill.agents,
+        "metadata": skill.metadata,
+    }
+    try:
+        json.dumps(data)
+    except (TypeError, ValueError):
+        return None
+    return data
+
+
+def skill_from_dict(data: dict[str, Any]) -> Skill:
+    """Deserialize a skill written by skill_to_dict."""
+    return Skill(
+        name=data["name"],
+        path=Path(data["path"]),
+        description=data["description"],
+        globs=data["globs"],
+        agents=data["agents"],
+        metadata=data["metadata"],
+    )
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_index(directory: Path) -> dict[str, dict[str, Any]]:
+    """Load the index entries for a discovery root.
+
+    Returns:
+        Mapping of SKILL.md path to {"stat": [...], "skill": {...} | None}.
+        Empty if there is no usable index.
+    """
+    try:
+        data = load_memoized(get_index_path(directory), _read_json)
+    except (OSError, ValueError):
+        return {}
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != INDEX_VERSION
+        or data.get("root") != str(directory)
+        or not isinstance(data.get("entries"), dict)
+    ):
+        return {}
+    return data["entries"]
+
+
+def save_index(directory: Path, entries: dict[str, dict[str, Any]]) -> None:
+    """Atomically write the index entries for a discovery root."""
+    path = get_index_path(directory)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "root": str(directory), "entries": entries},
+                f,
+            )
+        os.replace(tmp_path, path)
+    except OSError:
+        # The index is only an optimisation
+        tmp_path.unlink(missing_ok=True)
+
+
+def get_commit_index_path(
+    url: str, commit: str, subpath: str | None, max_depth: int | None
+) -> Path:
+    """Return the index file for the skills of a remote source at a commit."""
+    key = hashlib.sha256(
+        f"{url}\0{commit}\0{subpath or ''}\0{max_depth}".encode()
+    ).hexdigest()[:16]
+    return get_cache_dir() / "discovery" / f"commit-{key}.json"
+
+
+def load_commit_index(
+    url: str, commit: str, subpath: str | None, max_depth: int | None
+) -> list[Skill] | None:
+    """Load the skills discovered in a remote source at a commit.
+
+    Skill paths are relative to the source root (the subpath, if any).
+
+    Returns:
+        The skills, or None if they have not been indexed.
+    """
+    path = get_commit_index_path(url, commit, subpath, max_depth)
+    try:
+        data = load_memoized(path, _read_json)
+        if data.get("version") != INDEX_VERSION or data.get("commit") != commit:
+            return None
+        return [skill_from_dict(skill) for skill in data["skills"]]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def save_commit_index(
+    url: str,
+    commit: str,
+    subpath: str | None,
+    max_depth: int | None,
+    root: Path,
+    skills: list[Skill],
+) -> None:
+    """Index the skills discovered in a remote source at a commit.
+
+    Nothing is written if a skill's metadata is not JSON-safe.
+    """
+    root = root.resolve()
+    entries = []
+    for skill in skills:
+        data = skill_to_dict(skill)
+        if data is None:
+            return
+        data["path"] = skill.path.resolve().relative_to(root).as_posix()
+        entries.append(data)
+
+    path = get_commit_index_path(url, commit, subpath, max_depth)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "commit": commit, "skills": entries}, f
+            )
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
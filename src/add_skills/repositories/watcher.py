@@ -0,0 +1,257 @@
+"""Watching a directory tree for file changes.
+
+On Linux, changes are reported by inotify, called through ctypes. Other
+platforms, and trees inotify cannot watch (for instance when the watch
+limit is reached), are scanned periodically instead.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Protocol
+
+WATCHER_ENV = "ADD_SKILLS_WATCHER"
+DEBOUNCE_SECONDS = 0.05
+MAX_BATCH_DELAY_SECONDS = 0.5
+POLL_INTERVAL_SECONDS = 0.5
+STOP_CHECK_SECONDS = 0.5
+
+# inotify event masks, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then the name
+
+
+class Watcher(Protocol):
+    """Reports paths below a root that were created, changed or deleted."""
+
+    root: Path
+
+    def read(self, timeout: float) -> set[Path]:
+        """Wait up to ``timeout`` seconds for changes.
+
+        Returns:
+            Changed paths, empty if there were none. A changed directory
+            means anything below it may have changed.
+        """
+        ...
+
+    def close(self) -> None:
+        """Stop watching."""
+        ...
+
+
+class InotifyWatcher:
+    """Watches every directory of a tree with inotify."""
+
+    def __init__(self, root: Path) -> None:
+        """Start watching root.
+
+        Raises:
+            OSError: If inotify is unavailable or the tree cannot be
+                watched, e.g. because the watch limit is reached.
+        """
+        self.root = root
+        name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise _errno_error("inotify_init1")
+        self._dirs: dict[int, Path] = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, directory: Path) -> None:
+        """Watch a directory and every directory below it."""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(current), WATCH_MASK | IN_ONLYDIR
+            )
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # Removed while being watched
+                raise _errno_error("inotify_add_watch", error, current)
+            self._dirs[wd] = current
+            try:
+                with os.scandir(current) as it:
+                    stack += [
+                        Path(e.path) for e in it if e.is_dir(follow_symlinks=False)
+                    ]
+            except OSError:
+                continue
+
+    def read(self, timeout: float) -> set[Path]:
+        changed: set[Path] = set()
+        if self._fd < 0 or not select.select([self._fd], [], [], timeout)[0]:
+            return changed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, so anything may have changed
+                changed.add(self.root)
+                continue
+            directory = self._dirs.get(wd)
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # Files created before the new watch exist are covered by
+                # reporting the directory itself
+                try:
+                    self._watch_tree(path)
+                except OSError:
+                    changed.add(self.root)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Finds changes by comparing periodic scans of the tree."""
+
+    def __init__(self, root: Path, interval: float = POLL_INTERVAL_SECONDS) -> None:
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict[str, tuple[int, int, int]]:
+        """Return the mode, size and mtime of every path below the root."""
+        snapshot = {}
+        stack = [os.fspath(self.root)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        snapshot[entry.path] = (st.st_mode, st.st_size, st.st_mtime_ns)
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+        return snapshot
+
+    def read(self, timeout: float) -> set[Path]:
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next_scan = time.monotonic() + self.interval
+
+        old, new = self._snapshot, self._scan()
+        self._snapshot = new
+        return {
+            Path(path)
+            for path in old.keys() | new.keys()
+            if old.get(path) != new.get(path)
+        }
+
+    def close(self) -> None:
+        pass
+
+
+def get_watcher(root: Path) -> Watcher:
+    """Start watching a directory tree.
+
+    inotify is used on Linux, and periodic scans elsewhere or if inotify
+    fails. ``ADD_SKILLS_WATCHER=poll`` forces scanning.
+    """
+    if sys.platform == "linux" and os.environ.get(WATCHER_ENV) != "poll":
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            # AttributeError: a C library without inotify functions
+            pass
+    return PollingWatcher(root)
+
+
+def iter_changes(
+    watcher: Watcher,
+    debounce: float = DEBOUNCE_SECONDS,
+    stop: threading.Event | None = None,
+) -> Iterator[set[Path]]:
+    """Yield batches of changed paths until ``stop`` is set.
+
+    A batch is yielded once no change has been seen for ``debounce``
+    seconds, or MAX_BATCH_DELAY_SECONDS after its first change, so a
+    burst of writes (an editor saving, a checkout) arrives as one batch.
+    """
+    while stop is None or not stop.is_set():
+        changed = watcher.read(STOP_CHECK_SECONDS)
+        if not changed:
+            continue
+        deadline = time.monotonic() + MAX_BATCH_DELAY_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            more = watcher.read(min(debounce, remaining))
+            if not more:
+                break
+            changed |= more
+        yield changed
+
+
+def _errno_error(
+    function: str, error: int | None = None, path: Path | None = None
+) -> OSError:
+    error = ctypes.get_errno() if error is None else error
+    message = f"{function}: {os.strerror(error)}"
+    return OSError(error, message, os.fspath(path) if path is not None else None)
@@ -1,15 +1,60 @@
-"""Business logic services."""
+"""Business logic services.
 
-from add_skills.services.installer import (
-    get_install_path,
-    install_skill,
-    uninstall_skill,
-)
-from add_skills.services.registry_search import search_registry
+Exports are imported on first use, so that commands only load the
+dependencies of the services they use.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from add_skills.services.installer import (
+        get_install_path,
+        install_skill,
+        matches_lock,
+        sync_skill,
+        sync_skill_paths,
+        uninstall_skill,
+    )
+    from add_skills.services.inventory import list_installed
+    from add_skills.services.registry_index import RegistryIndex
+    from add_skills.services.registry_search import search_registry
+    from add_skills.services.store import gc_store, get_store_dir, hash_tree
+
+_EXPORTS = {
+    "RegistryIndex": "registry_index",
+    "gc_store": "store",
+    "get_install_path": "installer",
+    "get_store_dir": "store",
+    "hash_tree": "store",
+    "install_skill": "installer",
+    "list_installed": "inventory",
+    "matches_lock": "installer",
+    "search_registry": "registry_search",
+    "sync_skill": "installer",
+    "sync_skill_paths": "installer",
+    "uninstall_skill": "installer",
+}
 
 __all__ = [
+    "RegistryIndex",
+    "gc_store",
     "get_install_path",
+    "get_store_dir",
+    "hash_tree",
     "install_skill",
+    "list_installed",
+    "matches_lock",
     "search_registry",
+    "sync_skill",
+    "sync_skill_paths",
     "uninstall_skill",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
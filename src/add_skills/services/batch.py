@@ -0,0 +1,110 @@
+"""Concurrent, deduplicated fetching of many sources."""
+
+import tempfile
+import threading
+from collections.abc import Generator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+from urllib.parse import urlparse
+
+from add_skills.defaults import DEFAULT_PER_HOST
+from add_skills.models import SkillSource, TransportOptions
+from add_skills.repositories.filesystem import DEFAULT_WORKERS
+from add_skills.timings import is_enabled, span
+
+# Sources that check out the same tree: clone URL, branch and commit
+FetchKey = tuple[str, str | None, str | None]
+
+
+def fetch_key(source: SkillSource) -> FetchKey:
+    """Return the key shared by remote sources that need the same checkout."""
+    if source.clone_url is None:
+        raise ValueError("Local sources are not fetched")
+    return (source.clone_url, source.branch, source.commit)
+
+
+def fetch_sources(
+    sources: list[SkillSource],
+    work_dir: Path,
+    jobs: int | None = None,
+    per_host: int = DEFAULT_PER_HOST,
+    use_cache: bool = True,
+    transport: TransportOptions | None = None,
+) -> Generator[tuple[FetchKey, Path | Exception], None, None]:
+    """Fetch remote sources concurrently, each repository once.
+
+    Sources are deduplicated by fetch_key; subpaths are ignored, so the
+    whole repository is checked out for all of them. The fetches start
+    when this is called, so the caller can do other work while they run.
+
+    Args:
+        sources: Remote sources to fetch.
+        work_dir: Directory to check out into.
+        jobs: Maximum concurrent fetches. Defaults to DEFAULT_WORKERS.
+        per_host: Maximum concurrent fetches from one host.
+        use_cache: Check out from the repository cache.
+        transport: Options for talking to the remotes. Fetches still
+            running when the generator is closed are cancelled.
+
+    Yields:
+        Each fetch key with the checkout root, or the exception that
+        fetching raised, as soon as that fetch finishes.
+    """
+    results = _fetch_all(sources, work_dir, jobs, per_host, use_cache, transport)
+    # Run up to the first yield, which comes once every fetch is submitted
+    next(results, None)
+    return results
+
+
+def _fetch_all(
+    sources: list[SkillSource],
+    work_dir: Path,
+    jobs: int | None,
+    per_host: int,
+    use_cache: bool,
+    transport: TransportOptions | None,
+) -> Generator[tuple[FetchKey, Path | Exception], None, None]:
+    unique: dict[FetchKey, SkillSource] = {}
+    for source in sources:
+        unique.setdefault(fetch_key(source), replace(source, subpath=None))
+    if not unique:
+        return
+
+    host_limits: dict[str, threading.Semaphore] = {}
+    for key in unique:
+        host = urlparse(key[0]).hostname or ""
+        host_limits.setdefault(host, threading.Semaphore(per_host))
+
+    # The fetchers are only loaded once something is fetched
+    from add_skills.repositories import get_fetcher, get_transfer_size
+
+    cancel = threading.Event()
+    transport = replace(transport or TransportOptions(), cancel=cancel)
+
+    def fetch(key: FetchKey, source: SkillSource) -> Path:
+        with host_limits[urlparse(key[0]).hostname or ""]:
+            target = Path(tempfile.mkdtemp(prefix="fetch-", dir=work_dir))
+            fetcher = get_fetcher(source.source_type, transport=transport)
+            with span("fetch", source=key[0]) as fetch_args:
+                root = fetcher.fetch(source, target, use_cache=use_cache)
+                if is_enabled():
+                    fetch_args["bytes"] = get_transfer_size(target)
+            return root
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(jobs or DEFAULT_WORKERS, len(unique))
+    )
+    try:
+        futures: dict[Future[Path], FetchKey] = {
+            executor.submit(fetch, key, source): key for key, source in unique.items()
+        }
+        yield  # type: ignore[misc]
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+    finally:
+        cancel.set()
+        executor.shutdown(cancel_futures=True)
@@ -1,10 +1,29 @@
 """Skill installation logic."""
 
+import os
 import shutil
+import uuid
+from collections.abc import Iterable
 from pathlib import Path
 
 from add_skills.exceptions import InstallError
-from add_skills.models import AgentConfig, InstallScope, Skill
+from add_skills.models import (
+    AgentConfig,
+    InstallMode,
+    InstallScope,
+    LockEntry,
+    Skill,
+    SyncResult,
+)
+from add_skills.repositories.copier import (
+    copy_file,
+    copy_tree,
+    diff_tree,
+    sync_file,
+    sync_paths,
+    sync_tree,
+)
+from add_skills.services.store import hash_tree, link_from_store, store_skill
 
 
 def get_install_path(
@@ -39,16 +58,21 @@ def install_skill(
     agent: AgentConfig,
     scope: InstallScope,
     project_dir: Path | None = None,
+    mode: InstallMode = InstallMode.COPY,
 ) -> Path:
     """Install a skill for an agent.
 
-    Copies the skill directory to the agent's skills directory.
+    Copies the skill directory to the agent's skills directory, or in the
+    symlink and hardlink modes links it from the content-addressed store.
+    The skill is built next to its final path and renamed into place, so
+    it appears complete or not at all. Safe to call from several threads.
 
     Args:
         skill: The skill to install.
         agent: Target agent configuration.
         scope: Installation scope (local or global).
         project_dir: Project directory for local scope.
+        mode: How to place the skill. Single-file skills are always copied.
 
     Returns:
         Path to the installed skill.
@@ -68,18 +92,187 @@ def install_skill(
             "Remove it first or use a different name."
         )
 
-    # Copy skill directory
+    if mode == InstallMode.SYMLINK and skill.path.is_dir():
+        # Creating a symlink is already atomic
+        with store_skill(skill.path, install_path) as entry:
+            link_from_store(entry, install_path, hardlink=False)
+        return install_path
+
+    # Build the skill in a hidden sibling and rename it into place, so an
+    # interrupted install never leaves a partial skill at install_path
+    staging_path = install_path.with_name(
+        f".{install_path.name}.add-skills-{uuid.uuid4().hex}"
+    )
     try:
-        if skill.path.is_dir():
-            shutil.copytree(skill.path, install_path)
+        if mode == InstallMode.HARDLINK and skill.path.is_dir():
+            with store_skill(skill.path, install_path) as entry:
+                link_from_store(entry, staging_path, hardlink=True)
+                _move_into_place(staging_path, install_path)
         else:
-            shutil.copy2(skill.path, install_path)
-    except OSError as e:
-        raise InstallError(f"Failed to copy skill: {e}") from e
+            try:
+                if skill.path.is_dir():
+                    copy_tree(skill.path, staging_path)
+                else:
+                    copy_file(skill.path, staging_path)
+            except OSError as e:
+                raise InstallError(f"Failed to copy skill: {e}") from e
+            _move_into_place(staging_path, install_path)
+    except BaseException:
+        _remove_staging(staging_path)
+        raise
 
     return install_path
 
 
+def _move_into_place(staging_path: Path, install_path: Path) -> None:
+    try:
+        os.rename(staging_path, install_path)
+    except OSError as e:
+        raise InstallError(f"Failed to move skill into place: {e}") from e
+
+
+def sync_skill(
+    skill: Skill,
+    agent: AgentConfig,
+    scope: InstallScope,
+    project_dir: Path | None = None,
+    mode: InstallMode = InstallMode.COPY,
+) -> tuple[Path, SyncResult | None]:
+    """Install a skill, or update an existing install in place.
+
+    Only added and changed files are written and removed files are
+    deleted. Symlink installs are repointed at the new store entry.
+
+    Args:
+        skill: The skill to install.
+        agent: Target agent configuration.
+        scope: Installation scope (local or global).
+        project_dir: Project directory for local scope.
+        mode: Install mode. It must match how the skill was installed.
+
+    Returns:
+        Path to the installed skill, and the changes made, or None if the
+        skill was not installed before.
+
+    Raises:
+        InstallError: If installation fails or the existing install was
+            made with a different mode.
+    """
+    install_path = get_install_path(skill, agent, scope, project_dir)
+    if not install_path.exists() and not install_path.is_symlink():
+        return install_skill(skill, agent, scope, project_dir, mode), None
+
+    is_link = install_path.is_symlink()
+    if is_link != (mode == InstallMode.SYMLINK) or (
+        install_path.is_dir() != skill.path.is_dir()
+    ):
+        raise InstallError(
+            f"Skill at {install_path} was installed differently. "
+            "Remove it first to reinstall it with this mode."
+        )
+
+    try:
+        if not skill.path.is_dir():
+            return install_path, sync_file(skill.path, install_path)
+
+        if mode == InstallMode.COPY:
+            return install_path, sync_tree(skill.path, install_path)
+
+        with store_skill(skill.path, install_path) as entry:
+            if mode == InstallMode.HARDLINK:
+                result = sync_tree(entry, install_path, link=True)
+            else:
+                result = diff_tree(entry, install_path)
+                if install_path.resolve() != entry.resolve():
+                    _replace_symlink(entry, install_path)
+    except OSError as e:
+        raise InstallError(f"Failed to update skill: {e}") from e
+
+    return install_path, result
+
+
+def sync_skill_paths(
+    skill: Skill,
+    agent: AgentConfig,
+    scope: InstallScope,
+    paths: Iterable[Path],
+    project_dir: Path | None = None,
+    mode: InstallMode = InstallMode.COPY,
+) -> tuple[Path, SyncResult | None]:
+    """Update an installed skill after some of its source files changed.
+
+    Copied installs only compare and write the changed paths. Other
+    modes, single-file skills and skills not installed yet go through
+    sync_skill.
+
+    Args:
+        skill: The skill whose files changed.
+        agent: Target agent configuration.
+        scope: Installation scope (local or global).
+        paths: Changed paths below ``skill.path``, or ``skill.path``
+            itself if anything may have changed.
+        project_dir: Project directory for local scope.
+        mode: Install mode. It must match how the skill was installed.
+
+    Returns:
+        Path to the installed skill, and the changes made, or None if the
+        skill was not installed before.
+
+    Raises:
+        InstallError: If the update fails or the existing install was
+            made with a different mode.
+    """
+    install_path = get_install_path(skill, agent, scope, project_dir)
+    if (
+        mode != InstallMode.COPY
+        or not skill.path.is_dir()
+        or install_path.is_symlink()
+        or not install_path.is_dir()
+    ):
+        return sync_skill(skill, agent, scope, project_dir, mode)
+
+    relative = [path.relative_to(skill.path).as_posix() for path in paths]
+    try:
+        return install_path, sync_paths(skill.path, install_path, relative)
+    except OSError as e:
+        raise InstallError(f"Failed to update skill: {e}") from e
+
+
+def _replace_symlink(entry: Path, install_path: Path) -> None:
+    """Atomically repoint a symlink install at a store entry."""
+    staging_path = install_path.with_name(
+        f".{install_path.name}.add-skills-{uuid.uuid4().hex}"
+    )
+    os.symlink(entry, staging_path, target_is_directory=True)
+    try:
+        os.replace(staging_path, install_path)
+    except OSError:
+        _remove_staging(staging_path)
+        raise
+
+
+def _remove_staging(path: Path) -> None:
+    """Remove a partially built skill, ignoring errors."""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def matches_lock(
+    entry: LockEntry, agent: AgentConfig, scope: InstallScope
+) -> bool:
+    """Check whether an installed skill matches its lockfile hash."""
+    skill = Skill(name=entry.name, path=Path(entry.path))
+    try:
+        return hash_tree(get_install_path(skill, agent, scope)) == entry.hash
+    except OSError:
+        return False
+
+
 def uninstall_skill(
     skill_name: str,
     agent: AgentConfig,
@@ -0,0 +1,121 @@
+"""Inventory of the skills installed for every agent."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from add_skills.core.agents import get_all_agents
+from add_skills.exceptions import LockfileError
+from add_skills.models import AgentConfig, InstalledSkill, InstallScope, Skill
+from add_skills.repositories.cache import directory_stats
+from add_skills.repositories.filesystem import DEFAULT_WORKERS, parse_skill_header
+from add_skills.repositories.lockfile import get_lockfile_path, load_lockfile, lock_key
+
+BATCH_SIZE = 64
+
+
+def list_installed(
+    agents: list[AgentConfig] | None = None,
+    scopes: list[InstallScope] | None = None,
+    project_dir: Path | None = None,
+    workers: int | None = None,
+) -> list[InstalledSkill]:
+    """Find the skills installed in the agents' project and global directories.
+
+    Each distinct skills directory is listed once, even when several
+    agents share it, and directories and skills are inspected on a thread
+    pool. Only the frontmatter of each SKILL.md is read.
+
+    Args:
+        agents: Agents to look for. Defaults to every agent.
+        scopes: Scopes to look in. Defaults to both.
+        project_dir: Project directory for local scope. Defaults to cwd.
+        workers: Maximum number of threads.
+
+    Returns:
+        Installed skills sorted by scope, agent and name. A skill in a
+        directory shared by several agents is listed for each of them.
+    """
+    if project_dir is None:
+        project_dir = Path.cwd()
+    scopes = scopes or list(InstallScope)
+
+    owners: dict[Path, list[tuple[AgentConfig, InstallScope]]] = {}
+    for scope in scopes:
+        for agent in agents or get_all_agents():
+            if scope == InstallScope.LOCAL:
+                base_dir = project_dir / agent.project_skills_dir
+            else:
+                base_dir = agent.global_skills_path
+            owners.setdefault(base_dir, []).append((agent, scope))
+    sources = {scope: _locked_sources(scope, project_dir) for scope in scopes}
+
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as executor:
+        paths = [path for batch in executor.map(_list_dir, owners) for path in batch]
+        # Batched, as a single skill takes less time than a task switch
+        batches = [paths[i : i + BATCH_SIZE] for i in range(0, len(paths), BATCH_SIZE)]
+        found = [
+            result
+            for batch in executor.map(lambda b: [_inspect(p) for p in b], batches)
+            for result in batch
+        ]
+
+    installed = []
+    for path, result in zip(paths, found, strict=True):
+        if result is None:
+            continue
+        skill, size = result
+        for agent, scope in owners[path.parent]:
+            installed.append(
+                InstalledSkill(
+                    name=skill.name,
+                    agent=agent.name,
+                    scope=scope,
+                    path=path,
+                    size=size,
+                    description=skill.description,
+                    source=sources[scope].get(lock_key(agent.name, skill.name)),
+                )
+            )
+    installed.sort(key=lambda s: (s.scope.value, s.agent, s.name))
+    return installed
+
+
+def _locked_sources(scope: InstallScope, project_dir: Path) -> dict[str, str]:
+    """Return the source of each skill in a scope's lockfile, by lock key."""
+    try:
+        entries = load_lockfile(get_lockfile_path(scope, project_dir))
+    except LockfileError:
+        return {}
+    return {key: entry.source for key, entry in entries.items()}
+
+
+def _list_dir(base_dir: Path) -> list[Path]:
+    """Return the entries of a skills directory, skipping hidden ones.
+
+    Hidden entries include the staging directories of running installs.
+    """
+    try:
+        with os.scandir(base_dir) as it:
+            return [Path(e.path) for e in it if not e.name.startswith(".")]
+    except OSError:
+        return []
+
+
+def _inspect(path: Path) -> tuple[Skill, int] | None:
+    """Read an installed skill's frontmatter and total size.
+
+    Returns:
+        The skill and its size in bytes, or None if path is not a skill.
+    """
+    skill = parse_skill_header(path)
+    if skill is None:
+        return None
+    try:
+        if path.is_dir():
+            # Symlink installs are measured in the store
+            target = Path(os.path.realpath(path)) if path.is_symlink() else path
+            return skill, directory_stats(target)[1]
+        return skill, path.stat().st_size
+    except OSError:
+        return None
@@ -0,0 +1,252 @@
+"""Inverted index with BM25 ranking for registry search."""
+
+import heapq
+import itertools
+import math
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+
+from add_skills.models import RegistryEntry
+
+# Relative weight of a token occurrence in each field
+NAME_WEIGHT = 3.0
+TAG_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Score multipliers for query terms that only match part of a token
+PREFIX_FACTOR = 0.7
+SUBSTRING_FACTOR = 0.4
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into case-folded alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _field_tokens(entry: RegistryEntry) -> list[tuple[list[str], float]]:
+    """Return the tokens of each searched field with the field's weight."""
+    return [
+        (tokenize(entry.name), NAME_WEIGHT),
+        (tokenize(" ".join(entry.tags)), TAG_WEIGHT),
+        (tokenize(entry.description), DESCRIPTION_WEIGHT),
+    ]
+
+
+def _factor(token: str, term: str) -> float:
+    """Score multiplier for a token that contains a query term."""
+    if token == term:
+        return 1.0
+    if token.startswith(term):
+        return PREFIX_FACTOR
+    return SUBSTRING_FACTOR
+
+
+def _idf(doc_count: int, corpus_size: int) -> float:
+    return math.log(1 + (corpus_size - doc_count + 0.5) / (doc_count + 0.5))
+
+
+def _bm25(idf: float, tf: float, length: float, average_length: float) -> float:
+    norm = K1 * (1 - B + B * length / average_length)
+    return idf * tf * (K1 + 1) / (tf + norm)
+
+
+def _top(totals: dict[int, float], limit: int | None) -> list[int]:
+    """Return document ids by descending score, ties in registry order."""
+    return heapq.nsmallest(
+        len(totals) if limit is None else limit,
+        totals,
+        key=lambda doc_id: (-totals[doc_id], doc_id),
+    )
+
+
+def search_entries(
+    entries: Iterable[RegistryEntry], terms: list[str], limit: int | None = None
+) -> list[RegistryEntry]:
+    """Rank entries read once, without building an index.
+
+    Gives the same results as searching a RegistryIndex of the entries
+    that contain a term, but only the tokens containing a term are
+    counted, so a search of a streamed registry reads it in one pass.
+
+    Args:
+        entries: Entries to search, such as a streamed registry.
+        terms: Distinct query terms, as returned by tokenize().
+        limit: Maximum number of results.
+
+    Returns:
+        Entries containing every term, ranked by BM25 relevance.
+    """
+    corpus_size = 0
+    candidates: list[tuple[RegistryEntry, float, dict[str, float]]] = []
+    doc_counts: dict[str, int] = {}
+    for entry in entries:
+        corpus_size += 1
+        if not any(term in entry.search_key for term in terms):
+            continue
+        length = 0.0
+        weights: dict[str, float] = {}
+        for tokens, field_weight in _field_tokens(entry):
+            length += field_weight * len(tokens)
+            for token in tokens:
+                for term in terms:
+                    if term in token:
+                        weights[token] = weights.get(token, 0.0) + field_weight
+                        break
+        for token in weights:
+            doc_counts[token] = doc_counts.get(token, 0) + 1
+        candidates.append((entry, length, weights))
+
+    if not candidates:
+        return []
+    average_length = sum(length for _, length, _ in candidates) / len(candidates)
+    idfs = {token: _idf(count, corpus_size) for token, count in doc_counts.items()}
+
+    totals: dict[int, float] = {}
+    for doc_id, (_, length, weights) in enumerate(candidates):
+        total = 0.0
+        for term in terms:
+            best = 0.0
+            for token, tf in weights.items():
+                if term in token:
+                    score = _factor(token, term) * _bm25(
+                        idfs[token], tf, length, average_length
+                    )
+                    best = max(best, score)
+            if not best:
+                break
+            total += best
+        else:
+            totals[doc_id] = total
+    return [candidates[doc_id][0] for doc_id in _top(totals, limit)]
+
+
+class RegistryIndex:
+    """Token index over the name, description and tags of registry entries.
+
+    Build it once per registry load and run any number of searches on it.
+    """
+
+    def __init__(
+        self, entries: Iterable[RegistryEntry], corpus_size: int | None = None
+    ) -> None:
+        """Index entries.
+
+        Args:
+            entries: Entries to index.
+            corpus_size: Size of the registry the entries were drawn from,
+                when only a candidate subset is indexed. Used for IDF.
+        """
+        self.entries = list(entries)
+        self._corpus_size = max(corpus_size or 0, len(self.entries))
+        self._postings: dict[str, dict[int, float]] = {}
+        self._lengths: list[float] = []
+
+        for doc_id, entry in enumerate(self.entries):
+            weights: dict[str, float] = {}
+            for tokens, field_weight in _field_tokens(entry):
+                for token in tokens:
+                    weights[token] = weights.get(token, 0.0) + field_weight
+
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    self._postings[token] = {doc_id: weight}
+                else:
+                    postings[doc_id] = weight
+            self._lengths.append(sum(weights.values()))
+
+        # Sorted, for prefix ranges; joined, so substrings are found by
+        # str.find instead of a loop over every token
+        self._vocabulary = sorted(self._postings)
+        self._joined = "\0".join(self._vocabulary)
+        self._starts = list(
+            itertools.accumulate((len(t) + 1 for t in self._vocabulary[:-1]), initial=0)
+        )
+        self._average_length = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _expand(self, term: str) -> list[tuple[str, float]]:
+        """Return vocabulary tokens containing a query term with their factor.
+
+        Exact matches rank above prefix matches, which rank above other
+        substring matches, so recall is the same as RegistryEntry.matches.
+        """
+        vocabulary = self._vocabulary
+        # Tokens starting with the term form a range of the sorted vocabulary
+        start = bisect_left(vocabulary, term)
+        end = bisect_left(vocabulary, term[:-1] + chr(ord(term[-1]) + 1), start)
+        matches = [(token, _factor(token, term)) for token in vocabulary[start:end]]
+
+        # Other tokens containing it, at most once each
+        pos = self._joined.find(term)
+        while pos != -1:
+            i = bisect_right(self._starts, pos) - 1
+            if pos != self._starts[i]:
+                matches.append((vocabulary[i], SUBSTRING_FACTOR))
+            if i + 1 == len(vocabulary):
+                break
+            pos = self._joined.find(term, self._starts[i + 1])
+        return matches
+
+    def _score_term(self, term: str) -> dict[int, float]:
+        """Score the entries containing any expansion of a query term."""
+        scores: dict[int, float] = {}
+        for token, factor in self._expand(term):
+            postings = self._postings[token]
+            idf = _idf(len(postings), self._corpus_size)
+            for doc_id, tf in postings.items():
+                score = factor * _bm25(
+                    idf, tf, self._lengths[doc_id], self._average_length
+                )
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        return scores
+
+    def search(
+        self, query: str | None, limit: int | None = None
+    ) -> list[RegistryEntry]:
+        """Return entries matching every query term, best first.
+
+        Args:
+            query: Search terms. None or an empty query returns all entries
+                in registry order.
+            limit: Maximum number of results.
+
+        Returns:
+            Matching entries ranked by BM25 relevance.
+        """
+        if not query:
+            return self.entries[:limit]
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            # Punctuation-only queries: keep the plain substring semantics
+            return [entry for entry in self.entries if entry.matches(query)][:limit]
+
+        totals: dict[int, float] | None = None
+        for term in terms:
+            scores = self._score_term(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {
+                    doc_id: total + scores[doc_id]
+                    for doc_id, total in totals.items()
+                    if doc_id in scores
+                }
+            if not totals:
+                return []
+
+        assert totals is not None
+        return [self.entries[doc_id] for doc_id in _top(totals, limit)]
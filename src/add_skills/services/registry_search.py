@@ -1,21 +1,46 @@
 """Registry search service."""
 
+from collections.abc import Iterable
+from itertools import islice
+
 from add_skills.models import RegistryEntry
+from add_skills.services.registry_index import (
+    RegistryIndex,
+    search_entries,
+    tokenize,
+)
 
 
 def search_registry(
-    entries: list[RegistryEntry], keyword: str | None = None
+    entries: Iterable[RegistryEntry] | RegistryIndex,
+    keyword: str | None = None,
+    limit: int | None = None,
 ) -> list[RegistryEntry]:
     """Search the registry for entries matching a keyword.
 
+    Every term of the keyword must occur in the entry's name, description
+    or tags. Results are ranked by BM25 relevance.
+
     Args:
-        entries: List of registry entries to search.
+        entries: Registry entries, or an index built from them. Pass a
+            RegistryIndex to search the same registry more than once. Any
+            other iterable, such as a streamed registry, is read once and
+            only entries containing a query term are kept.
         keyword: Optional keyword to filter by. If None, returns all entries.
+        limit: Maximum number of results.
 
     Returns:
-        A list of matching RegistryEntry objects.
+        A list of matching RegistryEntry objects, best match first.
     """
+    if isinstance(entries, RegistryIndex):
+        return entries.search(keyword, limit)
+
     if keyword is None:
-        return entries
+        return list(islice(entries, limit))
+
+    terms = tokenize(keyword)
+    if not terms:
+        matches = (entry for entry in entries if entry.matches(keyword))
+        return list(islice(matches, limit))
 
-    return [entry for entry in entries if entry.matches(keyword)]
+    return search_entries(entries, list(dict.fromkeys(terms)), limit)
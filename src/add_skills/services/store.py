@@ -0,0 +1,222 @@
+"""Content-addressed store of skill trees."""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from add_skills.exceptions import InstallError
+from add_skills.repositories.cache import directory_size, file_lock, get_data_dir
+from add_skills.repositories.copier import copy_tree, link_or_copy_file
+
+REFS_FILE = "refs.json"
+
+
+def get_store_dir() -> Path:
+    """Return the root directory of the skill store."""
+    return get_data_dir() / "store"
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_tree(path: Path) -> str:
+    """Return a content hash of a directory tree.
+
+    The hash covers relative paths, file contents, executable bits and
+    symlink targets, so two trees hash equal exactly when installing
+    either gives the same result.
+    """
+    digest = hashlib.sha256()
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in filenames + [d for d in dirnames if os.path.islink(Path(dirpath) / d)]:
+            entries.append(Path(dirpath) / name)
+
+    for entry in sorted(entries, key=lambda p: p.relative_to(path).as_posix()):
+        rel = entry.relative_to(path).as_posix()
+        if entry.is_symlink():
+            digest.update(f"l\0{rel}\0{os.readlink(entry)}\0".encode())
+        else:
+            executable = os.stat(entry).st_mode & stat.S_IXUSR
+            digest.update(f"f\0{rel}\0{1 if executable else 0}\0".encode())
+            digest.update(bytes.fromhex(hash_file(entry)))
+    return digest.hexdigest()
+
+
+@contextmanager
+def store_skill(skill_path: Path, install_path: Path) -> Iterator[Path]:
+    """Add a skill tree to the store, once per distinct content, for an install.
+
+    The tree is copied outside the store lock. The entry is then put in
+    place and the body of the with statement runs with the lock held, so
+    gc_store cannot delete the entry before the install links to it. The
+    install's ref is recorded when the body completes.
+
+    Stored files are made read-only, since every install links to them.
+
+    Args:
+        skill_path: Skill directory to store.
+        install_path: Install that will link to the entry.
+
+    Yields:
+        Path of the store entry.
+
+    Raises:
+        InstallError: If the tree cannot be stored.
+    """
+    store_dir = get_store_dir()
+    objects_dir = store_dir / "objects"
+    tmp_dir = None
+    try:
+        entry = objects_dir / hash_tree(skill_path)
+        if not entry.is_dir():
+            objects_dir.mkdir(parents=True, exist_ok=True)
+            tmp_dir = objects_dir / f".tmp-{uuid.uuid4().hex}"
+            _copy_read_only(skill_path, tmp_dir)
+    except OSError as e:
+        if tmp_dir is not None:
+            _remove_tree(tmp_dir)
+        raise InstallError(f"Failed to add skill to store: {e}") from e
+
+    with file_lock(store_dir / ".lock"):
+        if tmp_dir is not None:
+            try:
+                if entry.is_dir():
+                    # Another process stored the same content meanwhile
+                    _remove_tree(tmp_dir)
+                else:
+                    os.rename(tmp_dir, entry)
+            except OSError as e:
+                _remove_tree(tmp_dir)
+                raise InstallError(f"Failed to add skill to store: {e}") from e
+
+        yield entry
+
+        refs = _load_refs()
+        refs[str(install_path)] = entry.name
+        _save_refs(refs)
+
+
+def _copy_read_only(src: Path, dst: Path) -> None:
+    """Copy a tree, keeping symlinks, and clear the write bits of its files.
+
+    Symlinks are kept as they are, since hash_tree hashes their targets
+    rather than what they point to.
+    """
+    copy_tree(src, dst, symlinks=True)
+    for dirpath, _, filenames in os.walk(dst):
+        for name in filenames:
+            file_path = Path(dirpath) / name
+            if not file_path.is_symlink():
+                mode = os.stat(file_path).st_mode
+                os.chmod(file_path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def link_from_store(entry: Path, install_path: Path, hardlink: bool) -> None:
+    """Install a store entry as a symlink or as a tree of hardlinks.
+
+    Raises:
+        InstallError: If linking fails.
+    """
+    try:
+        if not hardlink:
+            os.symlink(entry, install_path, target_is_directory=True)
+            return
+
+        shutil.copytree(entry, install_path, symlinks=True, copy_function=link_or_copy_file)
+    except OSError as e:
+        _remove_tree(install_path)
+        raise InstallError(f"Failed to link skill from store: {e}") from e
+
+
+def _is_live(install_path: Path, entry: Path) -> bool:
+    """Check whether an install still links to a store entry."""
+    try:
+        if install_path.is_symlink():
+            return install_path.resolve() == entry.resolve()
+        return os.path.samefile(install_path / "SKILL.md", entry / "SKILL.md")
+    except OSError:
+        return False
+
+
+def gc_store() -> tuple[int, int]:
+    """Delete store entries that no install links to.
+
+    Refs whose install was removed or replaced are dropped first.
+
+    Returns:
+        Number of entries removed and bytes freed.
+    """
+    store_dir = get_store_dir()
+    objects_dir = store_dir / "objects"
+    if not objects_dir.is_dir():
+        return 0, 0
+
+    removed = 0
+    freed = 0
+    with file_lock(store_dir / ".lock"):
+        refs = {
+            path: digest
+            for path, digest in _load_refs().items()
+            if _is_live(Path(path), objects_dir / digest)
+        }
+        _save_refs(refs)
+
+        live = set(refs.values())
+        for entry in objects_dir.iterdir():
+            if entry.name in live or entry.name.startswith(".tmp-"):
+                continue
+            freed += directory_size(entry)
+            _remove_tree(entry)
+            removed += 1
+
+    return removed, freed
+
+
+def _load_refs() -> dict[str, str]:
+    try:
+        with open(get_store_dir() / REFS_FILE, encoding="utf-8") as f:
+            refs = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return refs if isinstance(refs, dict) else {}
+
+
+def _save_refs(refs: dict[str, str]) -> None:
+    path = get_store_dir() / REFS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(refs, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _remove_tree(path: Path) -> None:
+    """Remove a tree, including read-only store files on Windows."""
+
+    def make_writable(func, failed_path, _exc):  # type: ignore[no-untyped-def]
+        os.chmod(failed_path, stat.S_IWRITE)
+        func(failed_path)
+
+    if path.is_symlink():
+        path.unlink()
+    elif not path.exists():
+        return
+    elif sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=make_writable)
+    else:
+        shutil.rmtree(path, onerror=make_writable)
@@ -0,0 +1,143 @@
+"""Timing spans for the phases of a run.
+
+Spans are only recorded once a Recorder is enabled, so instrumented code
+costs next to nothing otherwise. Recorded spans can be summarized by name
+or written as a Chrome trace-event file for chrome://tracing or Perfetto.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class Span:
+    """A timed phase; ``args`` holds counters such as bytes and files."""
+
+    name: str
+    category: str
+    start: float  # perf_counter seconds
+    duration: float
+    thread_id: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SpanStats:
+    """Spans of one name, aggregated."""
+
+    name: str
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+class Recorder:
+    """Collects spans from any thread."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> list[SpanStats]:
+        """Aggregate spans by name, in order of first occurrence.
+
+        Integer span arguments are summed into the counters.
+        """
+        stats: dict[str, SpanStats] = {}
+        for span in sorted(self.spans, key=lambda s: s.start):
+            entry = stats.setdefault(span.name, SpanStats(span.name))
+            entry.count += 1
+            entry.total += span.duration
+            entry.longest = max(entry.longest, span.duration)
+            for key, value in span.args.items():
+                if isinstance(value, int) and not isinstance(value, bool):
+                    entry.counters[key] = entry.counters.get(key, 0) + value
+        return list(stats.values())
+
+    def write_trace(self, path: Path) -> None:
+        """Write the spans as Chrome trace-event JSON.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            }
+            for span in self.spans
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+_recorder: Recorder | None = None
+
+
+def enable() -> Recorder:
+    """Start recording spans, replacing any earlier recorder."""
+    global _recorder
+    _recorder = Recorder()
+    return _recorder
+
+
+def disable() -> None:
+    """Stop recording spans."""
+    global _recorder
+    _recorder = None
+
+
+def is_enabled() -> bool:
+    """Check whether spans are recorded, to skip computing costly counters."""
+    return _recorder is not None
+
+
+@contextmanager
+def span(
+    name: str, category: str = "phase", **args: Any
+) -> Iterator[dict[str, Any]]:
+    """Time the enclosed block.
+
+    Yields:
+        The span arguments, to which the block may add counters such as
+        ``bytes`` or ``files``. They are discarded when not recording.
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield args
+        return
+
+    start = time.perf_counter()
+    try:
+        yield args
+    finally:
+        recorder.add(
+            Span(
+                name,
+                category,
+                start,
+                time.perf_counter() - start,
+                threading.get_native_id(),
+                args,
+            )
+        )
@@ -0,0 +1,179 @@
+"""Shared fixtures: isolated environment, git remotes, HTTP server and CLI."""
+
+import hashlib
+import subprocess
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from add_skills.models import AgentConfig
+
+
+def git(*args: str, cwd: Path | None = None) -> str:
+    """Run git and return its stripped output."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class Remote:
+    """A local repository that the source ``owner/<name>`` clones from."""
+
+    def __init__(self, path: Path, name: str) -> None:
+        self.path = path
+        self.source = f"owner/{name}"
+        git("init", "-q", "-b", "main", str(path))
+        # Let clients make partial clones and fetch commits by SHA
+        git("config", "uploadpack.allowFilter", "true", cwd=path)
+        git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=path)
+
+    def commit(self, files: dict[str, str | None]) -> str:
+        """Write (or, for None, delete) files and commit them.
+
+        Returns:
+            The new commit SHA.
+        """
+        for name, content in files.items():
+            file_path = self.path / name
+            if content is None:
+                file_path.unlink()
+            else:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_text(content)
+        git("add", "-A", cwd=self.path)
+        git("commit", "-q", "-m", "update", cwd=self.path)
+        return self.head
+
+    @property
+    def head(self) -> str:
+        return git("rev-parse", "HEAD", cwd=self.path)
+
+
+class Site:
+    """Documents served over HTTP by the ``site`` fixture.
+
+    Each document gets an ETag derived from its content, and conditional
+    requests that match it are answered with 304 Not Modified.
+    """
+
+    def __init__(self, port: int) -> None:
+        self.base_url = f"http://127.0.0.1:{port}/"
+        self.documents: dict[str, bytes] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []  # (path, headers)
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def etag(self, path: str) -> str:
+        return '"' + hashlib.sha256(self.documents[path]).hexdigest()[:16] + '"'
+
+
+def skill_md(name: str, description: str = "A test skill") -> str:
+    """Return the text of a SKILL.md."""
+    return f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n"
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path_factory: pytest.TempPathFactory, monkeypatch) -> Path:
+    """Point the home, cache, data and git config at a fresh directory."""
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("ADD_SKILLS_CACHE_DIR", str(home / "cache"))
+    monkeypatch.setenv("ADD_SKILLS_DATA_DIR", str(home / "data"))
+    monkeypatch.setenv("ADD_SKILLS_DAEMON", "0")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(home / ".gitconfig"))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    monkeypatch.setenv("COLUMNS", "200")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "test@example.com")
+    monkeypatch.delenv("ADD_SKILLS_GIT_BACKEND", raising=False)
+    return home
+
+
+@pytest.fixture
+def make_remote(home: Path) -> Callable[[str], Remote]:
+    """Create local repositories that GitHub sources are fetched from.
+
+    The isolated global git config rewrites https://github.com/ to the
+    remotes directory, so ``owner/<name>`` clones ``remotes/owner/<name>.git``.
+    """
+    remotes = home / "remotes"
+    git("config", "--global", f"url.{remotes.as_uri()}/.insteadOf", "https://github.com/")
+    return lambda name: Remote(remotes / "owner" / f"{name}.git", name)
+
+
+@pytest.fixture
+def agent(home: Path) -> AgentConfig:
+    """An agent whose global skills directory is in the test home."""
+    return AgentConfig(
+        name="test-agent",
+        display_name="Test Agent",
+        project_skills_dir=".test-agent/skills",
+        global_skills_dir=home / "test-agent" / "skills",
+    )
+
+
+@pytest.fixture
+def site() -> Iterator[Site]:
+    """Serve documents from a local HTTP server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            path = self.path.lstrip("/")
+            site.requests.append((path, dict(self.headers)))
+            if path not in site.documents:
+                self.send_error(404)
+                return
+            etag = site.etag(path)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = site.documents[path]
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    site = Site(server.server_port)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield site
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def run_cli(monkeypatch, capsys) -> Callable[..., tuple[int, str]]:
+    """Run the CLI in this process.
+
+    Returns:
+        A function taking the arguments and returning the exit status and
+        what was printed to stdout and stderr.
+    """
+    from add_skills import cli
+
+    def run(*args: str) -> tuple[int, str]:
+        monkeypatch.setattr(sys, "argv", ["add-skills", *args])
+        try:
+            cli.run()
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        captured = capsys.readouterr()
+        return code, captured.out + captured.err
+
+    return run
@@ -0,0 +1,223 @@
+"""Tests for the archive backend, served by a local HTTP stand-in."""
+
+import hashlib
+import io
+import os
+import socket
+import tarfile
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from add_skills.exceptions import ArchiveError
+from add_skills.models import SkillSource, SourceType
+from add_skills.repositories.archive import fetch_archive
+
+SOURCE = SkillSource(source_type=SourceType.GITHUB, owner="owner", repo="repo")
+
+
+def make_tarball(members: list[tuple[str, bytes | str]]) -> bytes:
+    """Build a gzipped tarball like git archive's.
+
+    Args:
+        members: (path, content) pairs in stream order, below the
+            "repo-main/" top-level directory. A str content makes the
+            member a symlink to that target.
+    """
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in members:
+            info = tarfile.TarInfo(f"repo-main/{name}")
+            if isinstance(content, str):
+                info.type = tarfile.SYMTYPE
+                info.linkname = content
+                tar.addfile(info)
+            else:
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def serve() -> Iterator:
+    """Serve a body at a local URL; returns the URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+
+    def start(body: bytes) -> str:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        server.RequestHandlerClass = Handler
+        return f"http://127.0.0.1:{server.server_port}/repo.tar.gz"
+
+    yield start
+    server.shutdown()
+    server.server_close()
+
+
+def test_extracts_only_skill_directories(serve, tmp_path: Path) -> None:
+    url = serve(
+        make_tarball(
+            [
+                ("README.md", b"readme"),
+                ("skills/a/SKILL.md", b"---\nname: a\n---\n"),
+                ("skills/a/notes.txt", b"notes"),
+                ("src/main.py", b"print()"),
+            ]
+        )
+    )
+
+    root = fetch_archive(SOURCE, tmp_path / "out", url=url)
+
+    assert (root / "skills/a/notes.txt").read_bytes() == b"notes"
+    assert not (root / "README.md").exists()
+    assert not (root / "src").exists()
+    assert not (root / ".add-skills-staging").exists()
+
+
+def test_staged_files_are_promoted(serve, tmp_path: Path) -> None:
+    # "A-notes.txt" sorts before SKILL.md, so it arrives first
+    url = serve(
+        make_tarball(
+            [
+                ("a/A-notes.txt", b"notes"),
+                ("a/SKILL.md", b"---\nname: a\n---\n"),
+            ]
+        )
+    )
+
+    root = fetch_archive(SOURCE, tmp_path / "out", url=url)
+
+    assert (root / "a/A-notes.txt").read_bytes() == b"notes"
+
+
+def test_symlinks_inside_the_target_are_kept(serve, tmp_path: Path) -> None:
+    url = serve(
+        make_tarball(
+            [
+                ("a/A-link", "SKILL.md"),
+                ("a/SKILL.md", b"---\nname: a\n---\n"),
+                ("a/b-link", "SKILL.md"),
+            ]
+        )
+    )
+
+    root = fetch_archive(SOURCE, tmp_path / "out", url=url)
+
+    assert os.readlink(root / "a/A-link") == "SKILL.md"
+    assert os.readlink(root / "a/b-link") == "SKILL.md"
+
+
+@pytest.mark.parametrize(
+    "members",
+    [
+        # Arrives before SKILL.md, so it is staged one level deeper, where
+        # "../../secret" still points inside the target
+        [("a/A-link", "../../secret"), ("a/SKILL.md", b"---\nname: a\n---\n")],
+        [("a/SKILL.md", b"---\nname: a\n---\n"), ("a/b-link", "../../secret")],
+    ],
+    ids=["staged", "direct"],
+)
+def test_symlinks_escaping_the_target_are_skipped(
+    serve, tmp_path: Path, members: list[tuple[str, bytes | str]]
+) -> None:
+    (tmp_path / "secret").write_text("secret")
+    url = serve(make_tarball(members))
+
+    root = fetch_archive(SOURCE, tmp_path / "out", url=url)
+
+    assert (root / "a/SKILL.md").exists()
+    assert not (root / members[0][0]).is_symlink()
+    assert not (root / members[1][0]).is_symlink()
+
+
+def test_checksum_is_verified(serve, tmp_path: Path) -> None:
+    body = make_tarball([("a/SKILL.md", b"---\nname: a\n---\n")])
+    url = serve(body)
+
+    fetch_archive(
+        SOURCE,
+        tmp_path / "ok",
+        url=url,
+        expected_sha256=hashlib.sha256(body).hexdigest(),
+    )
+    with pytest.raises(ArchiveError, match="Checksum mismatch"):
+        fetch_archive(SOURCE, tmp_path / "bad", url=url, expected_sha256="0" * 64)
+
+
+def test_unsafe_paths_are_rejected(serve, tmp_path: Path) -> None:
+    url = serve(make_tarball([("a/../../escape/SKILL.md", b"x")]))
+
+    with pytest.raises(ArchiveError, match="Unsafe path"):
+        fetch_archive(SOURCE, tmp_path / "out", url=url)
+
+
+@pytest.fixture
+def raw_server() -> Iterator:
+    """Answer each connection with fixed bytes; returns the URL."""
+    server = socket.create_server(("127.0.0.1", 0))
+    reply = b""
+
+    def answer() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                conn.recv(65536)
+                conn.sendall(reply)
+
+    threading.Thread(target=answer, daemon=True).start()
+
+    def start(body: bytes) -> str:
+        nonlocal reply
+        reply = body
+        return f"http://127.0.0.1:{server.getsockname()[1]}/repo.tar.gz"
+
+    yield start
+    server.close()
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [b"garbage\r\n\r\n", b""],
+    ids=["bad-status-line", "closed-without-response"],
+)
+def test_malformed_responses_raise_archive_error(
+    raw_server, tmp_path: Path, reply: bytes
+) -> None:
+    with pytest.raises(ArchiveError):
+        fetch_archive(SOURCE, tmp_path / "out", url=raw_server(reply))
+
+
+def test_truncated_body_raises_archive_error(raw_server, tmp_path: Path) -> None:
+    body = make_tarball([("a/SKILL.md", b"---\nname: a\n---\n")])
+    reply = (
+        b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body)
+        + body[: len(body) // 2]
+    )
+
+    with pytest.raises(ArchiveError):
+        fetch_archive(SOURCE, tmp_path / "out", url=raw_server(reply))
+
+
+def test_sha256_must_be_hexadecimal(run_cli) -> None:
+    code, output = run_cli("owner/repo", "--sha256", "not-a-digest", "--list")
+
+    assert code == 1
+    assert "64 hexadecimal digits" in output
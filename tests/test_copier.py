@@ -0,0 +1,183 @@
+"""Tests for the copy engine and its fallbacks."""
+
+import errno
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from add_skills.repositories import copier
+from add_skills.repositories.copier import copy_file, copy_tree, link_or_copy_file
+
+CONTENT = os.urandom(300 * 1024)
+
+needs_linux = pytest.mark.skipif(sys.platform != "linux", reason="Linux only")
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "src.bin"
+    path.write_bytes(CONTENT)
+    os.chmod(path, 0o750)
+    return path
+
+
+@pytest.fixture
+def no_reflink(monkeypatch) -> None:
+    monkeypatch.setattr(copier, "_reflink", lambda *args: False)
+    monkeypatch.setattr(copier, "_no_copy_file_range", False)
+
+
+def failing(error: int):
+    def call(*args):
+        raise OSError(error, os.strerror(error))
+
+    return call
+
+
+def short(call, limit: int):
+    """Wrap an in-kernel copy call so it copies ``limit`` bytes, then nothing."""
+    remaining = [limit]
+
+    def wrapper(*args):
+        *head, count = args
+        count = min(count, remaining[0])
+        remaining[0] -= count
+        return call(*head, count) if count else 0
+
+    return wrapper
+
+
+def assert_copied(source: Path, target: Path) -> None:
+    assert target.read_bytes() == CONTENT
+    assert os.stat(target).st_mode == os.stat(source).st_mode
+
+
+def test_copy_file_keeps_contents_and_mode(source: Path, tmp_path: Path) -> None:
+    copy_file(source, tmp_path / "dst.bin")
+
+    assert_copied(source, tmp_path / "dst.bin")
+    assert os.stat(tmp_path / "dst.bin").st_mtime_ns == os.stat(source).st_mtime_ns
+
+
+@needs_linux
+def test_unsupported_reflink_is_not_retried_on_the_device(
+    source: Path, tmp_path: Path, monkeypatch
+) -> None:
+    import fcntl
+
+    calls = []
+
+    def ioctl(*args):
+        calls.append(args)
+        raise OSError(errno.EOPNOTSUPP, "not supported")
+
+    monkeypatch.setattr(fcntl, "ioctl", ioctl)
+    monkeypatch.setattr(copier, "_no_reflink_devices", set())
+
+    copy_file(source, tmp_path / "one.bin")
+    copy_file(source, tmp_path / "two.bin")
+
+    assert len(calls) == 1
+    assert_copied(source, tmp_path / "two.bin")
+
+
+@needs_linux
+@pytest.mark.usefixtures("no_reflink")
+def test_unsupported_copy_file_range_falls_back_to_sendfile(
+    source: Path, tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(os, "copy_file_range", failing(errno.ENOSYS))
+    sendfile = os.sendfile
+    sent = []
+    monkeypatch.setattr(os, "sendfile", lambda *a: sent.append(a) or sendfile(*a))
+
+    copy_file(source, tmp_path / "dst.bin")
+
+    assert_copied(source, tmp_path / "dst.bin")
+    assert sent
+    assert copier._no_copy_file_range
+
+
+@needs_linux
+@pytest.mark.usefixtures("no_reflink")
+@pytest.mark.parametrize("sendfile_limit", [0, 1000, len(CONTENT)])
+def test_short_in_kernel_copies_are_finished(
+    source: Path, tmp_path: Path, monkeypatch, sendfile_limit: int
+) -> None:
+    monkeypatch.setattr(os, "copy_file_range", short(os.copy_file_range, 4096))
+    monkeypatch.setattr(os, "sendfile", short(os.sendfile, sendfile_limit))
+
+    copy_file(source, tmp_path / "dst.bin")
+
+    assert_copied(source, tmp_path / "dst.bin")
+
+
+@pytest.mark.usefixtures("no_reflink")
+def test_without_in_kernel_copies_files_are_copied_in_userspace(
+    source: Path, tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(copier, "_no_copy_file_range", True)
+    monkeypatch.delattr(os, "sendfile", raising=False)
+
+    copy_file(source, tmp_path / "dst.bin")
+
+    assert_copied(source, tmp_path / "dst.bin")
+
+
+def test_empty_files_are_copied(tmp_path: Path) -> None:
+    (tmp_path / "empty").write_bytes(b"")
+
+    copy_file(tmp_path / "empty", tmp_path / "copy")
+
+    assert (tmp_path / "copy").read_bytes() == b""
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_copy_tree_copies_every_file(tmp_path: Path, workers: int) -> None:
+    src = tmp_path / "src"
+    files = {f"d{i % 3}/sub/f{i}.txt": f"file {i}\n" for i in range(40)}
+    for rel, text in files.items():
+        (src / rel).parent.mkdir(parents=True, exist_ok=True)
+        (src / rel).write_text(text)
+    (src / "empty").mkdir()
+
+    copy_tree(src, tmp_path / "dst", workers=workers)
+
+    for rel, text in files.items():
+        assert (tmp_path / "dst" / rel).read_text() == text
+    assert (tmp_path / "dst" / "empty").is_dir()
+
+
+def test_copy_tree_keeps_or_follows_symlinks(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "target.md").write_text("target\n")
+    os.symlink("target.md", src / "link.md")
+
+    copy_tree(src, tmp_path / "kept", symlinks=True)
+    copy_tree(src, tmp_path / "followed")
+
+    assert os.readlink(tmp_path / "kept" / "link.md") == "target.md"
+    assert not (tmp_path / "followed" / "link.md").is_symlink()
+    assert (tmp_path / "followed" / "link.md").read_text() == "target\n"
+
+
+def test_copy_tree_refuses_an_existing_destination(tmp_path: Path) -> None:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "dst").mkdir()
+
+    with pytest.raises(FileExistsError):
+        copy_tree(tmp_path / "src", tmp_path / "dst")
+
+
+def test_link_or_copy_file_copies_across_devices(
+    source: Path, tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(os, "link", failing(errno.EXDEV))
+
+    link_or_copy_file(source, tmp_path / "dst.bin")
+
+    assert_copied(source, tmp_path / "dst.bin")
+    assert not os.path.samefile(source, tmp_path / "dst.bin")
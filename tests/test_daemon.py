@@ -0,0 +1,174 @@
+"""Tests for running invocations in the background daemon."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import add_skills
+from add_skills import daemon
+from add_skills.daemon import forward, get_socket_path, request
+from conftest import skill_md
+
+pytestmark = pytest.mark.skipif(not daemon.is_supported(), reason="needs Unix sockets")
+
+SRC_DIR = Path(add_skills.__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def running(home: Path, monkeypatch) -> Iterator[subprocess.Popen]:
+    """Start a daemon serving the test home's cache directory."""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    log_path = home / "daemon.log"
+    with open(log_path, "wb") as log:
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "from add_skills.__main__ import main; main()",
+                "daemon",
+                "start",
+                "--foreground",
+                "--idle-timeout",
+                "60",
+            ],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+        )
+    deadline = time.monotonic() + 30
+    while request("ping") is None:
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            pytest.fail(f"daemon did not start: {log_path.read_text()}")
+        time.sleep(0.05)
+    # Forward invocations from this process to it
+    monkeypatch.delenv(daemon.DAEMON_ENV)
+    yield proc
+    if proc.poll() is None:
+        # A daemon stuck in an invocation would never answer
+        threading.Thread(target=request, args=("stop",), daemon=True).start()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def in_thread(func, timeout: float = 20):
+    """Call func on a thread; fail if it does not return within timeout."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        pytest.fail(f"{func} did not return within {timeout} s")
+    return result[0]
+
+
+def test_ping_and_stop(running: subprocess.Popen) -> None:
+    assert request("ping") == {"exit": 0, "pid": running.pid}
+
+    assert request("stop") is not None
+    assert running.wait(timeout=10) == 0
+    assert not get_socket_path().exists()
+    assert request("ping") is None
+
+
+def test_forwarded_invocation_runs_in_the_client_directory(
+    running: subprocess.Popen, tmp_path: Path, monkeypatch, capsys
+) -> None:
+    (tmp_path / "skills" / "a").mkdir(parents=True)
+    (tmp_path / "skills" / "a" / "SKILL.md").write_text(skill_md("a", "From daemon"))
+    monkeypatch.chdir(tmp_path)
+
+    assert forward(["./skills", "--list"]) == 0
+
+    assert "From daemon" in capsys.readouterr().out
+
+
+def test_exit_status_and_errors_are_forwarded(
+    running: subprocess.Popen, tmp_path: Path, monkeypatch, capsys
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    assert forward(["./missing", "--list"]) == 1
+    assert forward(["--no-such-option", "-y"]) == 2
+    assert "No such option" in capsys.readouterr().err
+
+
+def test_interactive_and_daemon_invocations_run_locally(
+    running: subprocess.Popen,
+) -> None:
+    assert forward(["owner/repo"]) is None
+    assert forward(["./skills", "-y", "--watch"]) is None
+    assert forward(["daemon", "status"]) is None
+
+
+def test_nothing_is_forwarded_without_a_daemon_or_when_disabled(
+    running: subprocess.Popen, monkeypatch
+) -> None:
+    monkeypatch.setenv(daemon.DAEMON_ENV, "0")
+    assert forward(["find"]) is None
+
+    monkeypatch.delenv(daemon.DAEMON_ENV)
+    request("stop")
+    running.wait(timeout=10)
+    assert forward(["find"]) is None
+
+
+@pytest.fixture
+def silent_server() -> Iterator[int]:
+    """A TCP server that accepts connections and never answers."""
+    server = socket.create_server(("127.0.0.1", 0))
+    connections = []
+
+    def accept() -> None:
+        while True:
+            try:
+                connections.append(server.accept()[0])
+            except OSError:
+                return
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+    for conn in connections:
+        conn.close()
+
+
+def test_disconnecting_client_interrupts_its_invocation(
+    running: subprocess.Popen, silent_server: int, tmp_path: Path
+) -> None:
+    # Clones from "owner/repo" hang on a server that never answers
+    subprocess.run(
+        [
+            "git",
+            "config",
+            "--global",
+            f"url.http://127.0.0.1:{silent_server}/.insteadOf",
+            "https://github.com/",
+        ],
+        check=True,
+    )
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(get_socket_path()))
+    message = {
+        "argv": ["owner/repo", "--list", "--no-cache"],
+        "cwd": str(tmp_path),
+        "env": dict(os.environ),
+    }
+    client.sendall(json.dumps(message).encode() + b"\n")
+    time.sleep(1)
+    client.close()
+
+    # The daemon is free again once the hung clone is interrupted
+    assert in_thread(lambda: request("ping")) is not None
@@ -0,0 +1,121 @@
+"""Tests for skill discovery: the pruned walker and the git index."""
+
+from pathlib import Path
+
+import pytest
+
+from add_skills.repositories.filesystem import (
+    _git_skill_files,
+    _walk_skill_files,
+    discover_skills,
+)
+from conftest import git, skill_md
+
+
+def write_skills(root: Path, *dirs: str) -> None:
+    for directory in dirs:
+        (root / directory).mkdir(parents=True, exist_ok=True)
+        (root / directory / "SKILL.md").write_text(skill_md(Path(directory).name))
+
+
+def walked(root: Path, **kwargs) -> set[str]:
+    return {p.parent.relative_to(root).as_posix() for p in _walk_skill_files(root, **kwargs)}
+
+
+def test_walker_prunes_vcs_and_dependency_directories(tmp_path: Path) -> None:
+    write_skills(tmp_path, "a", "node_modules/pkg/b", ".git/c", "src/.venv/d", "e/f")
+
+    assert walked(tmp_path) == {"a", "e/f"}
+
+
+def test_walker_applies_nested_gitignore_files(tmp_path: Path) -> None:
+    write_skills(tmp_path, "build/a", "keep/b", "keep/tmp-c", "sub/out/d", "sub/e")
+    (tmp_path / ".gitignore").write_text("/build\ntmp-*\n")
+    (tmp_path / "keep" / ".gitignore").write_text("!tmp-c\n")
+    (tmp_path / "sub" / ".gitignore").write_text("out/\n")
+
+    assert walked(tmp_path) == {"keep/b", "keep/tmp-c", "sub/e"}
+    assert walked(tmp_path, respect_gitignore=False) == {
+        "build/a",
+        "keep/b",
+        "keep/tmp-c",
+        "sub/out/d",
+        "sub/e",
+    }
+
+
+@pytest.mark.parametrize(
+    ("pattern", "ignored"),
+    [
+        ("**/cache/", {"x/cache/a", "cache/b"}),
+        ("x/*/", {"x/cache/a"}),
+        ("c[a-c]che", {"x/cache/a", "cache/b"}),
+    ],
+)
+def test_walker_translates_gitignore_globs(
+    tmp_path: Path, pattern: str, ignored: set[str]
+) -> None:
+    all_dirs = {"x/cache/a", "cache/b", "y/c"}
+    write_skills(tmp_path, *all_dirs)
+    (tmp_path / ".gitignore").write_text(pattern + "\n")
+
+    assert walked(tmp_path) == all_dirs - ignored
+
+
+def test_walker_stops_at_max_depth(tmp_path: Path) -> None:
+    write_skills(tmp_path, "a", "a/b", "a/b/c")
+    (tmp_path / "SKILL.md").write_text(skill_md("root"))
+
+    assert walked(tmp_path, max_depth=0) == {"."}
+    assert walked(tmp_path, max_depth=2) == {".", "a", "a/b"}
+
+
+def test_git_index_lists_tracked_and_unignored_files(tmp_path: Path) -> None:
+    git("init", "-q", str(tmp_path))
+    write_skills(tmp_path, "tracked", "untracked", "ignored/x", "node_modules/pkg")
+    (tmp_path / ".gitignore").write_text("ignored/\n")
+    git("add", "tracked", ".gitignore", cwd=tmp_path)
+
+    files = _git_skill_files(tmp_path)
+
+    assert files is not None
+    assert {p.parent.name for p in files} == {"tracked", "untracked"}
+    assert {p.parent.name for p in files} == {
+        p.parent.name for p in _walk_skill_files(tmp_path)
+    }
+
+
+def test_git_index_listing_nothing_falls_back_to_the_walker(tmp_path: Path) -> None:
+    git("init", "-q", str(tmp_path))
+    (tmp_path / ".gitignore").write_text("vendor/\n")
+    write_skills(tmp_path, "vendor/skills/a")
+    vendored = tmp_path / "vendor" / "skills"
+
+    assert _git_skill_files(vendored) is None
+    assert [s.name for s in discover_skills(vendored, use_git_index=True)] == ["a"]
+
+
+def test_local_sources_inside_ignored_directories_are_listed(
+    tmp_path: Path, monkeypatch, run_cli
+) -> None:
+    git("init", "-q", str(tmp_path))
+    (tmp_path / ".gitignore").write_text("vendor/\n")
+    write_skills(tmp_path, "vendor/skills/a", "vendor/skills/node_modules/b")
+    monkeypatch.chdir(tmp_path)
+
+    code, output = run_cli("./vendor/skills", "--list")
+
+    assert code == 0
+    assert "No skills found" not in output
+    assert " a " in output
+    assert " b " not in output
+
+
+def test_discover_skills_sorts_by_name(tmp_path: Path) -> None:
+    write_skills(tmp_path, "z/beta", "a/alpha", "m/gamma")
+
+    assert [s.name for s in discover_skills(tmp_path, workers=1)] == [
+        "alpha",
+        "beta",
+        "gamma",
+    ]
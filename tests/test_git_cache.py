@@ -0,0 +1,148 @@
+"""Tests for the persistent repository mirror cache."""
+
+from pathlib import Path
+
+import pytest
+
+from add_skills.core.source_parser import parse_source
+from add_skills.repositories import git as git_module
+from add_skills.repositories.cache import file_lock
+from add_skills.repositories.git import (
+    _mirror_key,
+    _read_mirror_state,
+    clone_repo,
+    get_head_commit,
+    get_repo_cache_dir,
+    prune_repo_cache,
+)
+from conftest import skill_md
+
+
+@pytest.fixture
+def fetches(monkeypatch) -> list[list[str]]:
+    """Record the git fetches made against remotes and mirrors."""
+    calls: list[list[str]] = []
+    run = git_module._git
+
+    def recording_git(args, cwd=None, options=None):
+        if args[0] == "fetch":
+            calls.append(args)
+        return run(args, cwd, options)
+
+    monkeypatch.setattr(git_module, "_git", recording_git)
+    return calls
+
+
+def mirror_of(source) -> Path:
+    return get_repo_cache_dir() / f"{_mirror_key(source.clone_url)}.git"
+
+
+def test_cached_clone_fetches_new_commits_into_the_mirror(
+    make_remote, tmp_path: Path
+) -> None:
+    remote = make_remote("skills")
+    first = remote.commit({"a/SKILL.md": skill_md("a")})
+    source = parse_source(remote.source)
+
+    checkout = clone_repo(source, tmp_path / "one", use_cache=True)
+    assert get_head_commit(checkout) == first
+
+    second = remote.commit({"b/SKILL.md": skill_md("b")})
+    checkout = clone_repo(source, tmp_path / "two", use_cache=True)
+
+    assert get_head_commit(checkout) == second
+    assert (checkout / "b" / "SKILL.md").exists()
+    state = _read_mirror_state(mirror_of(source))
+    assert state["url"] == source.clone_url
+    assert state["size"] > 0
+
+
+def test_pinned_commit_in_the_mirror_is_not_fetched_again(
+    make_remote, tmp_path: Path, fetches: list[list[str]]
+) -> None:
+    remote = make_remote("skills")
+    commit = remote.commit({"a/SKILL.md": skill_md("a")})
+    source = parse_source(remote.source)
+    clone_repo(source, tmp_path / "one", use_cache=True)
+    fetches.clear()
+
+    pinned = parse_source(remote.source)
+    pinned.commit = commit
+    checkout = clone_repo(pinned, tmp_path / "two", use_cache=True)
+
+    assert get_head_commit(checkout) == commit
+    # Only the checkout from the mirror, nothing from the remote
+    assert len(fetches) == 1
+    assert mirror_of(source).as_uri() in fetches[0]
+
+
+def test_fetch_made_while_waiting_on_the_lock_is_reused(
+    make_remote, tmp_path: Path, fetches: list[list[str]]
+) -> None:
+    remote = make_remote("skills")
+    remote.commit({"a/SKILL.md": skill_md("a")})
+    source = parse_source(remote.source)
+    clone_repo(source, tmp_path / "one", use_cache=True)
+    mirror = mirror_of(source)
+    fetches.clear()
+
+    # As if another process fetched HEAD after this one started waiting
+    state = _read_mirror_state(mirror)
+    state["fetched"]["HEAD"] += 3600
+    git_module._write_mirror_state(mirror, state)
+    clone_repo(source, tmp_path / "two", use_cache=True)
+
+    assert [f for f in fetches if mirror.as_uri() not in f] == []
+
+
+def test_prune_evicts_least_recently_used_mirrors(make_remote, tmp_path: Path) -> None:
+    mirrors = []
+    for name in ("old", "mid", "new"):
+        remote = make_remote(name)
+        remote.commit({"a/SKILL.md": skill_md(name)})
+        source = parse_source(remote.source)
+        clone_repo(source, tmp_path / name, use_cache=True)
+        mirrors.append(mirror_of(source))
+    old, mid, new = mirrors
+    for age, mirror in enumerate(reversed(mirrors)):
+        state = _read_mirror_state(mirror)
+        state["last_used"] = 1000 - age
+        git_module._write_mirror_state(mirror, state)
+    size = _read_mirror_state(new)["size"]
+
+    freed = prune_repo_cache(max_bytes=size, keep=new)
+
+    assert freed > 0
+    assert not old.exists()
+    assert not mid.exists()
+    assert new.exists()
+
+
+def test_prune_skips_locked_mirrors(make_remote, tmp_path: Path) -> None:
+    remote = make_remote("skills")
+    remote.commit({"a/SKILL.md": skill_md("a")})
+    source = parse_source(remote.source)
+    clone_repo(source, tmp_path / "one", use_cache=True)
+    mirror = mirror_of(source)
+
+    with file_lock(get_repo_cache_dir() / f"{mirror.stem}.lock"):
+        assert prune_repo_cache(max_bytes=0) == 0
+    assert mirror.exists()
+
+    assert prune_repo_cache(max_bytes=0) > 0
+    assert not mirror.exists()
+
+
+def test_prune_cap_comes_from_the_environment(
+    make_remote, tmp_path: Path, monkeypatch
+) -> None:
+    remote = make_remote("skills")
+    remote.commit({"a/SKILL.md": skill_md("a")})
+    source = parse_source(remote.source)
+    clone_repo(source, tmp_path / "one", use_cache=True)
+
+    monkeypatch.setenv(git_module.REPO_CACHE_MAX_BYTES_ENV, str(2**40))
+    assert prune_repo_cache() == 0
+    monkeypatch.setenv(git_module.REPO_CACHE_MAX_BYTES_ENV, "0")
+    assert prune_repo_cache() > 0
+    assert not mirror_of(source).exists()
@@ -0,0 +1,145 @@
+"""Tests for the lockfile and the sync command."""
+
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from add_skills.exceptions import LockfileError
+from add_skills.models import InstallMode, LockEntry
+from add_skills.repositories.lockfile import load_lockfile, update_lockfile
+from conftest import skill_md
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "project"
+    path.mkdir()
+    monkeypatch.chdir(path)
+    return path
+
+
+def locked(project: Path) -> dict:
+    return json.loads((project / "skills-lock.json").read_text())["skills"]
+
+
+def entry(name: str) -> LockEntry:
+    return LockEntry(
+        name=name, agent="claude-code", source="owner/repo", path=name, hash="0" * 64
+    )
+
+
+def test_add_locks_the_commit_and_hash(make_remote, project: Path, run_cli) -> None:
+    remote = make_remote("skills")
+    commit = remote.commit({"skills/a/SKILL.md": skill_md("a")})
+
+    code, output = run_cli(remote.source, "-y")
+
+    assert code == 0, output
+    lock = locked(project)["claude-code/a"]
+    assert lock["source"] == remote.source
+    assert lock["commit"] == commit
+    assert lock["path"] == "skills/a"
+    assert lock["mode"] == "copy"
+    assert len(lock["hash"]) == 64
+
+
+def test_local_sources_are_locked_relative_to_the_project(
+    project: Path, run_cli
+) -> None:
+    (project / "vendor" / "a").mkdir(parents=True)
+    (project / "vendor" / "a" / "SKILL.md").write_text(skill_md("a"))
+
+    assert run_cli("./vendor", "-y")[0] == 0
+
+    lock = locked(project)["claude-code/a"]
+    assert (lock["source"], lock["commit"], lock["path"]) == ("./vendor", None, "a")
+
+
+def test_sync_restores_skills_at_the_locked_commit(
+    make_remote, project: Path, run_cli
+) -> None:
+    remote = make_remote("skills")
+    remote.commit({"skills/a/SKILL.md": skill_md("a", "Locked")})
+    assert run_cli(remote.source, "-y")[0] == 0
+    remote.commit({"skills/a/SKILL.md": skill_md("a", "Newer")})
+    installed = project / ".claude" / "skills" / "a"
+    shutil.rmtree(installed)
+
+    code, output = run_cli("sync")
+
+    assert code == 0, output
+    assert "Installed: a" in output
+    assert "Locked" in (installed / "SKILL.md").read_text()
+    assert "1/1 skill(s) in sync" in output
+
+
+def test_sync_does_not_fetch_when_installs_match(
+    make_remote, project: Path, run_cli
+) -> None:
+    remote = make_remote("skills")
+    remote.commit({"skills/a/SKILL.md": skill_md("a")})
+    assert run_cli(remote.source, "-y")[0] == 0
+    shutil.rmtree(remote.path)
+
+    code, output = run_cli("sync")
+
+    assert code == 0, output
+    assert "Fetching" not in output
+    assert "1/1 skill(s) in sync" in output
+
+
+def test_sync_reports_skills_it_cannot_restore(project: Path, run_cli) -> None:
+    (project / "vendor" / "a").mkdir(parents=True)
+    (project / "vendor" / "a" / "SKILL.md").write_text(skill_md("a"))
+    assert run_cli("./vendor", "-y")[0] == 0
+    shutil.rmtree(project / "vendor")
+    shutil.rmtree(project / ".claude" / "skills" / "a")
+
+    code, output = run_cli("sync")
+
+    assert code == 1
+    assert "Failed: a" in output
+
+
+def test_sync_without_a_lockfile(project: Path, run_cli) -> None:
+    code, output = run_cli("sync")
+
+    assert code == 0
+    assert "No Skills locked" in output
+
+
+def test_malformed_lockfiles_are_rejected(project: Path, run_cli) -> None:
+    path = project / "skills-lock.json"
+    path.write_text(json.dumps({"version": 1, "skills": {"x": {"name": "x"}}}))
+
+    with pytest.raises(LockfileError, match="Invalid lockfile entry 'x'"):
+        load_lockfile(path)
+    assert run_cli("sync")[0] == 1
+
+    path.write_text(json.dumps({"version": 99}))
+    with pytest.raises(LockfileError, match="Unsupported"):
+        load_lockfile(path)
+
+
+def test_update_lockfile_keeps_other_entries(tmp_path: Path) -> None:
+    path = tmp_path / "skills-lock.json"
+    update_lockfile(path, [entry("a"), entry("b")])
+    update_lockfile(path, [replace(entry("b"), mode=InstallMode.SYMLINK)])
+
+    entries = load_lockfile(path)
+
+    assert sorted(entries) == ["claude-code/a", "claude-code/b"]
+    assert entries["claude-code/b"].mode == InstallMode.SYMLINK
+
+
+def test_concurrent_updates_keep_every_entry(tmp_path: Path) -> None:
+    path = tmp_path / "skills-lock.json"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: update_lockfile(path, [entry(f"s{i}")]), range(64)))
+
+    assert len(load_lockfile(path)) == 64
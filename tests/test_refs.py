@@ -0,0 +1,79 @@
+"""Tests for resolving remote refs with a cached ls-remote."""
+
+import pytest
+
+from add_skills.exceptions import GitError
+from add_skills.repositories import git as git_module
+from add_skills.repositories.refs import resolve_commit
+from conftest import git, skill_md
+
+URL = "https://github.com/owner/skills.git"
+
+
+@pytest.fixture
+def remote(make_remote):
+    remote = make_remote("skills")
+    remote.commit({"a/SKILL.md": skill_md("a")})
+    return remote
+
+
+def test_resolves_the_default_branch(remote) -> None:
+    assert resolve_commit(URL, None) == remote.head
+
+
+def test_answers_are_cached_for_the_ttl(remote) -> None:
+    first = resolve_commit(URL, "main", ttl=3600)
+    second = remote.commit({"b/SKILL.md": skill_md("b")})
+
+    assert resolve_commit(URL, "main", ttl=3600) == first
+    assert resolve_commit(URL, "main", ttl=0) == second
+    assert resolve_commit(URL, "main", ttl=3600) == second
+
+
+def test_branches_win_over_tags_and_annotated_tags_are_peeled(remote) -> None:
+    tagged = remote.head
+    git("tag", "-a", "-m", "release", "v1", cwd=remote.path)
+    git("tag", "main", cwd=remote.path)
+    branch_head = remote.commit({"b/SKILL.md": skill_md("b")})
+
+    assert resolve_commit(URL, "v1", ttl=0) == tagged
+    assert resolve_commit(URL, "main", ttl=0) == branch_head
+
+
+def test_commit_shas_are_returned_without_asking(make_remote) -> None:
+    sha = "a" * 40
+
+    assert resolve_commit("https://github.com/owner/missing.git", sha) == sha
+
+
+def test_missing_refs_and_remotes_raise(remote) -> None:
+    with pytest.raises(GitError, match="Ref not found"):
+        resolve_commit(URL, "nope", ttl=0)
+    with pytest.raises(GitError, match="Failed to resolve"):
+        resolve_commit("https://github.com/owner/missing.git", None, ttl=0)
+
+
+def test_add_skips_fetching_an_unchanged_commit(remote, monkeypatch, run_cli) -> None:
+    transfers: list[str] = []
+    run = git_module._git
+
+    def recording_git(args, cwd=None, options=None):
+        if args[0] in ("clone", "fetch"):
+            transfers.append(args[0])
+        return run(args, cwd, options)
+
+    monkeypatch.setattr(git_module, "_git", recording_git)
+
+    assert run_cli(remote.source, "--list", "--ref-max-age", "0")[0] == 0
+    assert transfers
+    transfers.clear()
+
+    code, output = run_cli(remote.source, "--list", "--ref-max-age", "0")
+    assert code == 0
+    assert " a " in output
+    assert transfers == []
+
+    remote.commit({"b/SKILL.md": skill_md("b")})
+    code, output = run_cli(remote.source, "--list", "--ref-max-age", "0")
+    assert " b " in output
+    assert transfers
@@ -0,0 +1,123 @@
+"""Tests for HTTP caching of the registry."""
+
+import json
+
+import pytest
+
+from add_skills.exceptions import RegistryFetchError, RegistryParseError
+from add_skills.repositories.cache import get_cache_dir
+from add_skills.repositories.registry import (
+    _meta_path,
+    fetch_registry,
+    get_fresh_cache_path,
+    wait_for_refresh,
+)
+
+
+def registry(*names: str) -> bytes:
+    return json.dumps([{"name": n, "repo": f"owner/{n}"} for n in names]).encode()
+
+
+def names(url: str, **kwargs) -> list[str]:
+    return [entry.name for entry in fetch_registry(url, **kwargs)]
+
+
+def expire(url: str) -> None:
+    """Age the cached copy of a registry past any TTL."""
+    meta_path = _meta_path(url, get_cache_dir())
+    meta = json.loads(meta_path.read_text())
+    meta["fetched_at"] = 0
+    meta_path.write_text(json.dumps(meta))
+
+
+def test_fresh_copy_is_used_without_a_request(site) -> None:
+    site.documents["registry.json"] = registry("a")
+    url = site.url("registry.json")
+
+    assert names(url) == ["a"]
+    site.documents["registry.json"] = registry("b")
+
+    assert names(url) == ["a"]
+    assert len(site.requests) == 1
+    assert get_fresh_cache_path(url) is not None
+
+
+def test_expired_copy_is_revalidated_with_its_etag(site) -> None:
+    site.documents["registry.json"] = registry("a")
+    url = site.url("registry.json")
+    names(url)
+    expire(url)
+
+    assert names(url) == ["a"]
+
+    assert len(site.requests) == 2
+    _, headers = site.requests[1]
+    assert headers["If-None-Match"] == site.etag("registry.json")
+    # The 304 restarts the TTL
+    assert get_fresh_cache_path(url) is not None
+
+
+def test_changed_registry_replaces_the_cached_copy(site) -> None:
+    site.documents["registry.json"] = registry("a")
+    url = site.url("registry.json")
+    names(url)
+    site.documents["registry.json"] = registry("a", "b")
+
+    assert names(url, ttl=0) == ["a", "b"]
+    assert names(url, offline=True) == ["a", "b"]
+    bodies = list(_meta_path(url, get_cache_dir()).parent.glob("*.body"))
+    assert len(bodies) == 1
+
+
+def test_network_failure_falls_back_to_the_cached_copy(site) -> None:
+    site.documents["registry.json"] = registry("a")
+    url = site.url("registry.json")
+    names(url)
+    del site.documents["registry.json"]
+
+    assert names(url, ttl=0) == ["a"]
+
+
+def test_offline_uses_only_the_cache(site) -> None:
+    site.documents["registry.json"] = registry("a")
+    url = site.url("registry.json")
+
+    with pytest.raises(RegistryFetchError, match="offline"):
+        fetch_registry(url, offline=True)
+    assert site.requests == []
+
+    names(url)
+    expire(url)
+    assert names(url, offline=True) == ["a"]
+    assert len(site.requests) == 1
+
+
+def test_stale_copy_is_served_and_refreshed_in_the_background(site) -> None:
+    site.documents["registry.json"] = registry("a")
+    url = site.url("registry.json")
+    names(url)
+    expire(url)
+    site.documents["registry.json"] = registry("b")
+
+    assert names(url, stale_while_revalidate=True) == ["a"]
+    wait_for_refresh(timeout=10)
+
+    assert names(url) == ["b"]
+    assert len(site.requests) == 2
+
+
+def test_uncached_fetch_writes_nothing(site) -> None:
+    site.documents["registry.json"] = registry("a")
+
+    assert names(site.url("registry.json"), use_cache=False) == ["a"]
+    assert not (get_cache_dir() / "registry").exists()
+
+
+def test_invalid_download_is_not_cached(site) -> None:
+    site.documents["registry.json"] = registry("a", "b")[:-10]
+    url = site.url("registry.json")
+
+    with pytest.raises(RegistryParseError):
+        names(url)
+    assert get_fresh_cache_path(url) is None
+    assert not list((get_cache_dir() / "registry").iterdir())
@@ -0,0 +1,108 @@
+"""Tests for streaming JSON array, NDJSON and sharded registries."""
+
+import json
+from itertools import islice
+
+import pytest
+
+from add_skills.exceptions import RegistryParseError
+from add_skills.repositories import registry as registry_module
+from add_skills.repositories.registry import (
+    fetch_registry,
+    get_fresh_cache_path,
+    iter_registry,
+)
+
+
+def entry(name: str, **fields) -> dict:
+    return {"name": name, "repo": f"owner/{name}", **fields}
+
+
+def ndjson(*entries: dict) -> bytes:
+    return "".join(json.dumps(e) + "\n" for e in entries).encode()
+
+
+def names(url: str) -> list[str]:
+    return [e.name for e in fetch_registry(url, use_cache=False)]
+
+
+def test_json_array(site) -> None:
+    site.documents["r.json"] = json.dumps([entry("a"), entry("b")]).encode()
+
+    assert names(site.url("r.json")) == ["a", "b"]
+
+
+def test_newline_delimited_json(site) -> None:
+    site.documents["r.ndjson"] = ndjson(entry("a"), entry("b")) + b"\n\n"
+
+    assert names(site.url("r.ndjson")) == ["a", "b"]
+
+
+def test_shards_are_read_in_order_relative_to_the_manifest(site) -> None:
+    site.documents["v1/index.json"] = json.dumps(
+        {"shards": ["part-2.ndjson", "/other/part-1.json"]}
+    ).encode()
+    site.documents["v1/part-2.ndjson"] = ndjson(entry("b"), entry("c"))
+    site.documents["other/part-1.json"] = json.dumps([entry("a")]).encode()
+
+    assert names(site.url("v1/index.json")) == ["b", "c", "a"]
+
+
+def test_shards_must_not_be_shard_manifests(site) -> None:
+    site.documents["index.json"] = json.dumps({"shards": ["nested.json"]}).encode()
+    site.documents["nested.json"] = json.dumps({"shards": []}).encode()
+
+    with pytest.raises(RegistryParseError, match="Shards"):
+        names(site.url("index.json"))
+
+
+def test_entries_spanning_read_chunks(site, monkeypatch) -> None:
+    monkeypatch.setattr(registry_module, "CHUNK_SIZE", 7)
+    entries = [entry(f"skill-{i}", description="é" * i, stars=10**i) for i in range(20)]
+    site.documents["r.json"] = json.dumps(entries).encode()
+    site.documents["r.ndjson"] = ndjson(*entries)
+
+    expected = [f"skill-{i}" for i in range(20)]
+    assert names(site.url("r.json")) == expected
+    assert names(site.url("r.ndjson")) == expected
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        (b"", "empty document"),
+        (b'"registry"', "must be a JSON array"),
+        (b"[1]", "Entry 0 must be an object"),
+        (b'[{"name": "a"}]', "Entry 0 missing required fields: repo"),
+        (b'[{"name": "a", "repo": 1}]', "Entry 0 field repo must be a string"),
+        (b'[{"name": "a", "repo": "o/a"} {}]', "expected ',' or ']'"),
+        (b'[{"name": "a", "repo": "o/a"}] []', "extra data"),
+        (b'{"name": "a", "repo": "o/a"}\n{"name": ', "Invalid JSON"),
+    ],
+)
+def test_invalid_registries(site, body: bytes, message: str) -> None:
+    site.documents["r.json"] = body
+
+    with pytest.raises(RegistryParseError, match=message):
+        names(site.url("r.json"))
+
+
+def test_sloppy_optional_fields_are_coerced(site) -> None:
+    site.documents["r.json"] = json.dumps(
+        [entry("a", description=None, tags=["x", 1, None, "y"]), entry("b", tags="x")]
+    ).encode()
+
+    a, b = fetch_registry(site.url("r.json"), use_cache=False)
+
+    assert (a.description, a.tags) == ("", ["x", "y"])
+    assert b.tags == []
+
+
+def test_download_read_in_part_is_still_cached(site) -> None:
+    site.documents["r.ndjson"] = ndjson(*(entry(f"s{i}") for i in range(100)))
+    url = site.url("r.ndjson")
+
+    assert [e.name for e in islice(iter_registry(url), 2)] == ["s0", "s1"]
+
+    assert get_fresh_cache_path(url) is not None
+    assert len(list(iter_registry(url, offline=True))) == 100
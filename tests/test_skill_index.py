@@ -0,0 +1,120 @@
+"""Tests for the persistent discovery indexes."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from add_skills.repositories import filesystem
+from add_skills.repositories.filesystem import discover_skills
+from add_skills.repositories.skill_index import (
+    get_index_path,
+    load_commit_index,
+    load_index,
+    save_commit_index,
+)
+from conftest import skill_md
+
+
+@pytest.fixture
+def parsed(monkeypatch) -> list[str]:
+    """Record the names of the skill directories that get parsed."""
+    calls: list[str] = []
+    parse = filesystem.parse_skill
+
+    def recording_parse(skill_dir: Path):
+        calls.append(skill_dir.name)
+        return parse(skill_dir)
+
+    monkeypatch.setattr(filesystem, "parse_skill", recording_parse)
+    return calls
+
+
+def write_skill(root: Path, name: str, description: str = "A test skill") -> Path:
+    skill_file = root / name / "SKILL.md"
+    skill_file.parent.mkdir(parents=True, exist_ok=True)
+    skill_file.write_text(skill_md(name, description))
+    return skill_file
+
+
+def discover(root: Path) -> dict[str, str]:
+    return {
+        s.name: s.description for s in discover_skills(root, workers=1, use_index=True)
+    }
+
+
+def test_unchanged_skills_are_served_from_the_index(
+    tmp_path: Path, parsed: list[str]
+) -> None:
+    write_skill(tmp_path, "a")
+    write_skill(tmp_path, "b")
+
+    first = discover(tmp_path)
+    assert sorted(parsed) == ["a", "b"]
+    parsed.clear()
+
+    assert discover(tmp_path) == first
+    assert parsed == []
+
+
+def test_changed_skills_are_parsed_again(tmp_path: Path, parsed: list[str]) -> None:
+    write_skill(tmp_path, "a")
+    skill_file = write_skill(tmp_path, "b")
+    discover(tmp_path)
+    parsed.clear()
+
+    skill_file.write_text(skill_md("b", "Edited"))
+    stat = skill_file.stat()
+    os.utime(skill_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert discover(tmp_path) == {"a": "A test skill", "b": "Edited"}
+    assert parsed == ["b"]
+
+
+def test_deleted_skills_are_dropped_from_the_index(tmp_path: Path) -> None:
+    write_skill(tmp_path, "a")
+    skill_file = write_skill(tmp_path, "b")
+    discover(tmp_path)
+
+    skill_file.unlink()
+
+    assert discover(tmp_path) == {"a": "A test skill"}
+    assert list(load_index(tmp_path.resolve())) == [
+        str(tmp_path.resolve() / "a" / "SKILL.md")
+    ]
+
+
+def test_invalid_skills_are_remembered(tmp_path: Path, parsed: list[str]) -> None:
+    write_skill(tmp_path, "a")
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "SKILL.md").write_text("---\nname: [unclosed\n---\n")
+    discover(tmp_path)
+    parsed.clear()
+
+    assert discover(tmp_path) == {"a": "A test skill"}
+    assert parsed == []
+
+
+def test_unreadable_index_is_rebuilt(tmp_path: Path, parsed: list[str]) -> None:
+    write_skill(tmp_path, "a")
+    discover(tmp_path)
+    get_index_path(tmp_path.resolve()).write_text("{not json")
+    parsed.clear()
+
+    assert discover(tmp_path) == {"a": "A test skill"}
+    assert parsed == ["a"]
+    assert load_index(tmp_path.resolve())
+
+
+def test_commit_index_round_trips_paths_relative_to_the_root(tmp_path: Path) -> None:
+    write_skill(tmp_path, "a")
+    skills = discover_skills(tmp_path)
+    url = "https://github.com/owner/repo.git"
+
+    save_commit_index(url, "c0ffee", "skills", None, tmp_path, skills)
+    loaded = load_commit_index(url, "c0ffee", "skills", None)
+
+    assert loaded is not None
+    assert [(s.name, s.path) for s in loaded] == [("a", Path("a"))]
+    assert load_commit_index(url, "c0ffee", None, None) is None
+    assert load_commit_index(url, "deadbeef", "skills", None) is None
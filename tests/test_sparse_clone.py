@@ -0,0 +1,93 @@
+"""Tests for sparse partial clones of a subpath or a single skill."""
+
+import os
+from pathlib import Path
+
+from add_skills.core.source_parser import parse_source
+from add_skills.repositories.git import clone_repo, get_transfer_size
+from conftest import skill_md
+
+
+def checked_out(root: Path) -> set[str]:
+    return {
+        (Path(dirpath) / name).relative_to(root).as_posix()
+        for dirpath, dirnames, filenames in os.walk(root)
+        if ".git" not in Path(dirpath).relative_to(root).parts
+        for name in filenames
+    }
+
+
+def make_skills_remote(make_remote):
+    remote = make_remote("skills")
+    remote.commit(
+        {
+            "README.md": "readme\n",
+            "skills/a/SKILL.md": skill_md("a"),
+            "skills/a/notes.md": "notes\n",
+            "skills/b/SKILL.md": skill_md("b"),
+            "skills/b/data.bin": os.urandom(256 * 1024).hex(),
+            "other/c/SKILL.md": skill_md("c"),
+        }
+    )
+    return remote
+
+
+def test_sparse_clone_of_a_subpath_checks_out_only_the_subpath(
+    make_remote, tmp_path: Path
+) -> None:
+    remote = make_skills_remote(make_remote)
+    source = parse_source(f"https://github.com/{remote.source}/tree/main/skills/a")
+
+    path = clone_repo(source, tmp_path / "clone", sparse=True)
+
+    assert path == tmp_path / "clone" / "skills" / "a"
+    assert checked_out(tmp_path / "clone") == {"skills/a/SKILL.md", "skills/a/notes.md"}
+
+
+def test_sparse_clone_of_one_skill_checks_out_its_directory(
+    make_remote, tmp_path: Path
+) -> None:
+    remote = make_skills_remote(make_remote)
+
+    clone_repo(parse_source(remote.source), tmp_path / "clone", sparse=True, skill_name="a")
+
+    assert checked_out(tmp_path / "clone") == {"skills/a/SKILL.md", "skills/a/notes.md"}
+
+
+def test_sparse_clone_of_a_missing_skill_leaves_the_skill_files(
+    make_remote, tmp_path: Path
+) -> None:
+    remote = make_skills_remote(make_remote)
+
+    clone_repo(
+        parse_source(remote.source), tmp_path / "clone", sparse=True, skill_name="zzz"
+    )
+
+    assert checked_out(tmp_path / "clone") == {
+        "skills/a/SKILL.md",
+        "skills/b/SKILL.md",
+        "other/c/SKILL.md",
+    }
+
+
+def test_sparse_clone_downloads_less_than_a_full_clone(
+    make_remote, tmp_path: Path
+) -> None:
+    remote = make_skills_remote(make_remote)
+    source = parse_source(remote.source)
+
+    clone_repo(source, tmp_path / "full")
+    clone_repo(source, tmp_path / "sparse", sparse=True, skill_name="a")
+
+    # The large blob next to skill b is never fetched
+    assert get_transfer_size(tmp_path / "sparse") * 2 < get_transfer_size(tmp_path / "full")
+
+
+def test_sparse_is_ignored_without_a_subpath_or_skill(
+    make_remote, tmp_path: Path
+) -> None:
+    remote = make_skills_remote(make_remote)
+
+    clone_repo(parse_source(remote.source), tmp_path / "clone", sparse=True)
+
+    assert "README.md" in checked_out(tmp_path / "clone")
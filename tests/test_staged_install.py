@@ -0,0 +1,132 @@
+"""Tests for staged, atomic and concurrent installs."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from add_skills.exceptions import InstallError
+from add_skills.models import InstallMode, InstallScope, Skill
+from add_skills.services import installer
+from add_skills.services.installer import install_skill
+from conftest import skill_md
+
+
+def make_skill(root: Path, name: str, files: int = 3) -> Skill:
+    path = root / name
+    path.mkdir(parents=True)
+    (path / "SKILL.md").write_text(skill_md(name))
+    for i in range(files):
+        (path / f"file-{i}.md").write_text(f"{name} {i}\n")
+    return Skill(name=name, path=path)
+
+
+def install(skill: Skill, agent, mode: InstallMode = InstallMode.COPY) -> Path:
+    return install_skill(skill, agent, InstallScope.GLOBAL, mode=mode)
+
+
+def copy_then_fail(error: BaseException):
+    """A copy_tree that copies one file, then raises ``error``."""
+
+    def copy_tree(src: Path, dst: Path, **kwargs) -> None:
+        dst.mkdir()
+        (dst / "SKILL.md").write_bytes((src / "SKILL.md").read_bytes())
+        raise error
+
+    return copy_tree
+
+
+@pytest.mark.parametrize(
+    ("error", "raised"),
+    [(OSError("disk full"), InstallError), (KeyboardInterrupt(), KeyboardInterrupt)],
+)
+def test_failed_install_leaves_nothing_behind(
+    tmp_path: Path, agent, monkeypatch, error: BaseException, raised: type
+) -> None:
+    monkeypatch.setattr(installer, "copy_tree", copy_then_fail(error))
+
+    with pytest.raises(raised):
+        install(make_skill(tmp_path, "a"), agent)
+
+    assert os.listdir(agent.global_skills_path) == []
+
+
+def test_failed_hardlink_install_leaves_nothing_behind(
+    tmp_path: Path, agent, monkeypatch
+) -> None:
+    def fail(staging_path: Path, install_path: Path) -> None:
+        raise InstallError("Failed to move skill into place")
+
+    monkeypatch.setattr(installer, "_move_into_place", fail)
+
+    with pytest.raises(InstallError):
+        install(make_skill(tmp_path, "a"), agent, InstallMode.HARDLINK)
+
+    assert os.listdir(agent.global_skills_path) == []
+
+
+def test_existing_install_is_left_alone(tmp_path: Path, agent) -> None:
+    installed = install(make_skill(tmp_path / "one", "a"), agent)
+    (installed / "local-edit.md").write_text("mine\n")
+
+    with pytest.raises(InstallError, match="already exists"):
+        install(make_skill(tmp_path / "two", "a"), agent)
+
+    assert (installed / "local-edit.md").exists()
+    assert os.listdir(agent.global_skills_path) == ["a"]
+
+
+@pytest.mark.parametrize("mode", list(InstallMode))
+def test_concurrent_installs_of_many_skills(
+    tmp_path: Path, agent, mode: InstallMode
+) -> None:
+    skills = [make_skill(tmp_path, f"skill-{i}") for i in range(16)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        paths = list(executor.map(lambda s: install(s, agent, mode), skills))
+
+    for skill, path in zip(skills, paths, strict=True):
+        assert (path / "file-2.md").read_text() == f"{skill.name} 2\n"
+    assert sorted(os.listdir(agent.global_skills_path)) == sorted(
+        s.name for s in skills
+    )
+
+
+def test_concurrent_installs_of_one_skill_have_one_winner(
+    tmp_path: Path, agent
+) -> None:
+    skills = [make_skill(tmp_path / str(i), "a", files=50) for i in range(8)]
+    barrier = threading.Barrier(len(skills))
+
+    def race(skill: Skill) -> bool:
+        barrier.wait()
+        try:
+            install(skill, agent)
+        except InstallError:
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=len(skills)) as executor:
+        results = list(executor.map(race, skills))
+
+    assert results.count(True) == 1
+    assert os.listdir(agent.global_skills_path) == ["a"]
+    assert len(os.listdir(agent.global_skills_path / "a")) == 51
+
+
+def test_add_installs_every_skill_with_parallel_jobs(
+    tmp_path: Path, monkeypatch, run_cli
+) -> None:
+    for i in range(12):
+        make_skill(tmp_path / "source", f"skill-{i}")
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+
+    code, output = run_cli(str(tmp_path / "source"), "-y", "-j", "4")
+
+    assert code == 0, output
+    installed = project / ".claude" / "skills"
+    assert sorted(os.listdir(installed)) == sorted(f"skill-{i}" for i in range(12))
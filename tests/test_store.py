@@ -0,0 +1,126 @@
+"""Tests for the content-addressed store and the link install modes."""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from add_skills.models import InstallMode, InstallScope, Skill
+from add_skills.services.installer import install_skill, sync_skill
+from add_skills.services.store import gc_store, get_store_dir, hash_tree
+from conftest import skill_md
+
+
+def make_skill(root: Path, name: str, body: str = "body\n") -> Skill:
+    path = root / name
+    (path / "docs").mkdir(parents=True, exist_ok=True)
+    (path / "SKILL.md").write_text(skill_md(name))
+    (path / "docs" / "guide.md").write_text(body)
+    return Skill(name=name, path=path)
+
+
+def store_entries() -> set[str]:
+    objects = get_store_dir() / "objects"
+    return {p.name for p in objects.iterdir()} if objects.is_dir() else set()
+
+
+def install(skill: Skill, agent, mode: InstallMode) -> Path:
+    return install_skill(skill, agent, InstallScope.GLOBAL, mode=mode)
+
+
+def test_hash_tree_covers_contents_modes_and_symlink_targets(tmp_path: Path) -> None:
+    skill = make_skill(tmp_path, "a")
+    base = hash_tree(skill.path)
+    assert hash_tree(make_skill(tmp_path / "copy", "a").path) == base
+
+    (skill.path / "docs" / "guide.md").write_text("changed\n")
+    changed = hash_tree(skill.path)
+    assert changed != base
+
+    os.chmod(skill.path / "SKILL.md", 0o755)
+    executable = hash_tree(skill.path)
+    assert executable != changed
+
+    os.symlink("docs/guide.md", skill.path / "link")
+    linked = hash_tree(skill.path)
+    os.unlink(skill.path / "link")
+    os.symlink("SKILL.md", skill.path / "link")
+    assert len({executable, linked, hash_tree(skill.path)}) == 3
+
+
+def test_symlink_install_links_to_a_read_only_store_entry(
+    tmp_path: Path, agent
+) -> None:
+    installed = install(make_skill(tmp_path, "a"), agent, InstallMode.SYMLINK)
+    install(make_skill(tmp_path, "b"), agent, InstallMode.SYMLINK)
+
+    assert installed.is_symlink()
+    assert installed.resolve().parent == get_store_dir() / "objects"
+    assert (installed / "docs" / "guide.md").read_text() == "body\n"
+    assert len(store_entries()) == 2
+    mode = os.stat(installed / "docs" / "guide.md").st_mode
+    assert not mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+def test_identical_trees_are_stored_once(tmp_path: Path, agent, home: Path) -> None:
+    skill = make_skill(tmp_path, "a")
+    first = install(skill, agent, InstallMode.SYMLINK)
+    second = install_skill(
+        skill, agent, InstallScope.LOCAL, project_dir=home, mode=InstallMode.SYMLINK
+    )
+
+    assert first.resolve() == second.resolve()
+    assert len(store_entries()) == 1
+
+
+def test_hardlink_install_shares_inodes_with_the_store(tmp_path: Path, agent) -> None:
+    installed = install(make_skill(tmp_path, "a"), agent, InstallMode.HARDLINK)
+
+    assert not installed.is_symlink()
+    (entry,) = store_entries()
+    stored = get_store_dir() / "objects" / entry / "docs" / "guide.md"
+    assert os.path.samefile(installed / "docs" / "guide.md", stored)
+
+
+def test_gc_keeps_live_entries_and_removes_unreferenced_ones(
+    tmp_path: Path, agent
+) -> None:
+    skill = make_skill(tmp_path, "a")
+    installed = install(skill, agent, InstallMode.SYMLINK)
+    install(make_skill(tmp_path, "b"), agent, InstallMode.HARDLINK)
+    assert gc_store() == (0, 0)
+    old = installed.resolve().name
+
+    (skill.path / "docs" / "guide.md").write_text("new body\n")
+    sync_skill(skill, agent, InstallScope.GLOBAL, mode=InstallMode.SYMLINK)
+    removed, freed = gc_store()
+
+    assert (removed, freed > 0) == (1, True)
+    assert old not in store_entries()
+    assert (installed / "docs" / "guide.md").read_text() == "new body\n"
+
+
+def test_gc_removes_entries_of_deleted_installs(
+    tmp_path: Path, agent, run_cli
+) -> None:
+    installed = install(make_skill(tmp_path, "a"), agent, InstallMode.HARDLINK)
+    installed.joinpath("SKILL.md").unlink()
+
+    code, output = run_cli("gc")
+
+    assert code == 0
+    assert "Removed 1 store entry" in output
+    assert store_entries() == set()
+    assert run_cli("gc") == (0, "Nothing to remove.\n")
+
+
+@pytest.mark.parametrize("mode", [InstallMode.SYMLINK, InstallMode.HARDLINK])
+def test_single_file_skills_are_copied(tmp_path: Path, agent, mode) -> None:
+    skill_file = tmp_path / "a.md"
+    skill_file.write_text(skill_md("a"))
+
+    installed = install(Skill(name="a", path=skill_file), agent, mode)
+
+    assert installed.is_file() and not installed.is_symlink()
+    assert store_entries() == set()
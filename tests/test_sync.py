@@ -0,0 +1,137 @@
+"""Tests for updating installed skills in place with --sync."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from add_skills.exceptions import InstallError
+from add_skills.models import InstallMode, InstallScope, Skill
+from add_skills.repositories.copier import sync_paths
+from add_skills.services.installer import install_skill, sync_skill
+from conftest import skill_md
+
+
+@pytest.fixture
+def skill(tmp_path: Path) -> Skill:
+    path = tmp_path / "source" / "a"
+    (path / "docs").mkdir(parents=True)
+    (path / "SKILL.md").write_text(skill_md("a"))
+    (path / "docs" / "keep.md").write_text("keep\n")
+    (path / "docs" / "edit.md").write_text("before\n")
+    (path / "old.md").write_text("old\n")
+    return Skill(name="a", path=path)
+
+
+def edit(skill: Skill) -> None:
+    (skill.path / "docs" / "edit.md").write_text("after\n")
+    (skill.path / "old.md").unlink()
+    (skill.path / "new").mkdir()
+    (skill.path / "new" / "file.md").write_text("new\n")
+
+
+def tree(root: Path) -> dict[str, str]:
+    return {
+        p.relative_to(root).as_posix(): p.read_text()
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+
+@pytest.mark.parametrize("mode", list(InstallMode))
+def test_sync_writes_only_what_changed(skill: Skill, agent, mode: InstallMode) -> None:
+    installed = install_skill(skill, agent, InstallScope.GLOBAL, mode=mode)
+    kept_inode = os.stat(installed / "docs" / "keep.md").st_ino
+    edit(skill)
+
+    path, changes = sync_skill(skill, agent, InstallScope.GLOBAL, mode=mode)
+
+    assert path == installed
+    assert changes is not None
+    assert (changes.added, changes.changed, changes.removed) == (
+        ["new/file.md"],
+        ["docs/edit.md"],
+        ["old.md"],
+    )
+    assert tree(installed) == tree(skill.path)
+    if mode == InstallMode.COPY:
+        assert os.stat(installed / "docs" / "keep.md").st_ino == kept_inode
+
+
+def test_sync_of_an_unchanged_skill_is_up_to_date(skill: Skill, agent) -> None:
+    install_skill(skill, agent, InstallScope.GLOBAL)
+
+    _, changes = sync_skill(skill, agent, InstallScope.GLOBAL)
+
+    assert changes is not None and changes.up_to_date
+
+
+def test_sync_installs_a_missing_skill(skill: Skill, agent) -> None:
+    path, changes = sync_skill(skill, agent, InstallScope.GLOBAL)
+
+    assert changes is None
+    assert tree(path) == tree(skill.path)
+
+
+def test_sync_restores_files_edited_in_the_install(skill: Skill, agent) -> None:
+    installed = install_skill(skill, agent, InstallScope.GLOBAL)
+    (installed / "docs" / "keep.md").write_text("edited\n")
+
+    _, changes = sync_skill(skill, agent, InstallScope.GLOBAL)
+
+    assert changes is not None and changes.changed == ["docs/keep.md"]
+    assert (installed / "docs" / "keep.md").read_text() == "keep\n"
+
+
+def test_sync_refuses_a_different_install_mode(skill: Skill, agent) -> None:
+    install_skill(skill, agent, InstallScope.GLOBAL, mode=InstallMode.SYMLINK)
+
+    with pytest.raises(InstallError, match="installed differently"):
+        sync_skill(skill, agent, InstallScope.GLOBAL, mode=InstallMode.COPY)
+
+
+def test_sync_replaces_a_file_with_a_directory(skill: Skill, agent) -> None:
+    installed = install_skill(skill, agent, InstallScope.GLOBAL)
+    (skill.path / "old.md").unlink()
+    (skill.path / "old.md").mkdir()
+    (skill.path / "old.md" / "inner.md").write_text("inner\n")
+
+    _, changes = sync_skill(skill, agent, InstallScope.GLOBAL)
+
+    assert changes is not None
+    assert changes.added == ["old.md/inner.md"]
+    assert changes.removed == ["old.md"]
+    assert tree(installed) == tree(skill.path)
+
+
+def test_sync_paths_compares_only_the_given_paths(skill: Skill, agent) -> None:
+    installed = install_skill(skill, agent, InstallScope.GLOBAL)
+    edit(skill)
+
+    changes = sync_paths(skill.path, installed, ["docs/edit.md", "new"])
+
+    assert (changes.added, changes.changed, changes.removed) == (
+        ["new/file.md"],
+        ["docs/edit.md"],
+        [],
+    )
+    assert (installed / "old.md").exists()
+
+
+def test_add_sync_reports_the_changes(
+    skill: Skill, tmp_path: Path, monkeypatch, run_cli
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    source = str(skill.path.parent)
+    assert run_cli(source, "-y")[0] == 0
+
+    code, output = run_cli(source, "-y", "--sync")
+    assert code == 0
+    assert "Up to date: a" in output
+
+    edit(skill)
+    code, output = run_cli(source, "-y", "--sync")
+    assert code == 0
+    assert "(1 added, 1 changed, 1 removed)" in output
+    for line in ("+ new/file.md", "~ docs/edit.md", "- old.md"):
+        assert line in output
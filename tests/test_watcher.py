@@ -0,0 +1,172 @@
+"""Tests for the directory watchers and add --watch."""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+import add_skills
+from add_skills.repositories import watcher as watcher_module
+from add_skills.repositories.watcher import (
+    InotifyWatcher,
+    PollingWatcher,
+    Watcher,
+    get_watcher,
+    iter_changes,
+)
+from conftest import skill_md
+
+SRC_DIR = Path(add_skills.__file__).resolve().parent.parent
+TIMEOUT = 10.0
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("timed out")
+        time.sleep(0.05)
+
+
+def read_until(watcher: Watcher, expected: Path) -> set[Path]:
+    """Read changes until one covers ``expected``; return them all."""
+    changed: set[Path] = set()
+    deadline = time.monotonic() + TIMEOUT
+    while not any(p == expected or p in expected.parents for p in changed):
+        if time.monotonic() > deadline:
+            pytest.fail(f"{expected} not reported, got {changed}")
+        changed |= watcher.read(0.1)
+    return changed
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def watcher(request, tmp_path: Path) -> Iterator[Watcher]:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "SKILL.md").write_text(skill_md("a"))
+    if request.param == "inotify":
+        if sys.platform != "linux":
+            pytest.skip("inotify is Linux only")
+        instance: Watcher = InotifyWatcher(tmp_path)
+    else:
+        instance = PollingWatcher(tmp_path, interval=0.05)
+    yield instance
+    instance.close()
+
+
+def test_reports_changed_created_and_deleted_files(
+    watcher: Watcher, tmp_path: Path
+) -> None:
+    (tmp_path / "a" / "SKILL.md").write_text(skill_md("a", "Edited"))
+    read_until(watcher, tmp_path / "a" / "SKILL.md")
+
+    (tmp_path / "a" / "new.md").write_text("new\n")
+    read_until(watcher, tmp_path / "a" / "new.md")
+
+    (tmp_path / "a" / "SKILL.md").unlink()
+    read_until(watcher, tmp_path / "a" / "SKILL.md")
+
+
+def test_watches_new_directories(watcher: Watcher, tmp_path: Path) -> None:
+    (tmp_path / "b" / "docs").mkdir(parents=True)
+    read_until(watcher, tmp_path / "b")
+    time.sleep(0.1)
+
+    (tmp_path / "b" / "docs" / "guide.md").write_text("guide\n")
+
+    read_until(watcher, tmp_path / "b" / "docs" / "guide.md")
+
+
+def test_environment_forces_polling(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(watcher_module.WATCHER_ENV, "poll")
+
+    instance = get_watcher(tmp_path)
+
+    assert isinstance(instance, PollingWatcher)
+
+
+def test_iter_changes_batches_a_burst_and_stops(
+    watcher: Watcher, tmp_path: Path
+) -> None:
+    stop = threading.Event()
+    batches: list[set[Path]] = []
+
+    def consume() -> None:
+        for batch in iter_changes(watcher, debounce=0.3, stop=stop):
+            batches.append(batch)
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    for i in range(5):
+        (tmp_path / "a" / f"file-{i}.md").write_text(f"{i}\n")
+    wait_until(lambda: bool(batches))
+
+    # The directory of the files covers them
+    assert all(
+        path in batches[0] or path.parent in batches[0]
+        for path in (tmp_path / "a" / f"file-{i}.md" for i in range(5))
+    )
+    stop.set()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="sends SIGINT")
+@pytest.mark.parametrize("backend", ["", "poll"])
+def test_add_watch_syncs_edits_into_the_install(tmp_path: Path, backend: str) -> None:
+    source = tmp_path / "source"
+    (source / "a").mkdir(parents=True)
+    (source / "a" / "SKILL.md").write_text(skill_md("a"))
+    project = tmp_path / "project"
+    project.mkdir()
+    installed = project / ".claude" / "skills"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(SRC_DIR),
+        "PYTHONUNBUFFERED": "1",
+        watcher_module.WATCHER_ENV: backend,
+    }
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "from add_skills.__main__ import main; main()",
+            str(source),
+            "-y",
+            "--watch",
+        ],
+        cwd=project,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if line.startswith("Watching"):
+                break
+        assert (installed / "a" / "SKILL.md").exists()
+
+        (source / "a" / "notes.md").write_text("notes\n")
+        wait_until(lambda: (installed / "a" / "notes.md").exists())
+
+        (source / "b").mkdir()
+        (source / "b" / "SKILL.md").write_text(skill_md("b"))
+        wait_until(lambda: (installed / "b" / "SKILL.md").exists())
+
+        (source / "a" / "notes.md").unlink()
+        wait_until(lambda: not (installed / "a" / "notes.md").exists())
+    finally:
+        proc.send_signal(signal.SIGINT)
+        output, _ = proc.communicate(timeout=TIMEOUT)
+
+    assert proc.returncode == 0, output
+    assert "Stopped watching." in output
+    assert '"claude-code/b"' in (project / "skills-lock.json").read_text()